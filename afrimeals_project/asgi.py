@@ -2,6 +2,8 @@
 ASGI config for afrimeals_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the meal generator's Server-Sent Events stream (``meal-generator/stream/``)
+through this entry point, e.g. ``daphne afrimeals_project.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
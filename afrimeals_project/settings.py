@@ -1,4 +1,5 @@
 import os  
+import tempfile
 from pathlib import Path  
 from dotenv import load_dotenv  
 from urllib.parse import urlparse
@@ -19,6 +20,23 @@ SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-default-key-for-dev')  # P
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 CURRENCY_API_KEY = os.getenv('CURRENCY_API_KEY')
 
+# Concurrent LLM calls allowed per provider in each process (see dashboard/services/llm_clients.py)
+LLM_CONCURRENCY = {
+    'openai': int(os.getenv('OPENAI_MAX_CONCURRENCY', 8)),
+    'gemini': int(os.getenv('GEMINI_MAX_CONCURRENCY', 8)),
+}
+# Seconds a request waits for a free slot before giving up
+LLM_ACQUIRE_TIMEOUT = float(os.getenv('LLM_ACQUIRE_TIMEOUT', 30))
+
+# Offline IP -> country lookup (DB-IP "IP to Country Lite" CSV, see build_ip_country_db)
+GEOIP_CSV_PATH = os.getenv('GEOIP_CSV_PATH', os.path.join(BASE_DIR, 'data', 'ip_country.csv'))
+GEOIP_DB_PATH = os.getenv('GEOIP_DB_PATH', os.path.join(BASE_DIR, 'data', 'ip_country.npy'))
+# Ask ipapi.co about addresses the offline table doesn't cover
+GEOIP_API_FALLBACK = os.getenv('GEOIP_API_FALLBACK', 'True').lower() == 'true'
+
+# Store directory loaded into the Store table (see import_stores)
+STORES_CSV_PATH = os.getenv('STORES_CSV_PATH', os.path.join(BASE_DIR, 'data', 'stores.csv'))
+
 # In settings.py
 STRIPE_PUBLISHABLE_KEY = os.getenv('STRIPE_PUBLIC_KEY', '')
 STRIPE_TEST_MODE = os.getenv('STRIPE_TEST_MODE', 'True').lower() == 'true'
@@ -86,6 +104,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',  
                 'django.contrib.messages.context_processors.messages',  
                 'dashboard.context_processors.subscription_status',
+                'dashboard.context_processors.streaming',
             ],  
         },  
     },  
@@ -151,6 +170,30 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Rendered exports (meal plan PDFs); kept outside MEDIA_ROOT so they are only served to their owner.
+# Workers store them and the web process serves them, so both must see the same storage: set
+# EXPORT_S3_BUCKET (AWS_* credentials) when the worker runs as its own service, or point EXPORT_ROOT
+# at a volume mounted in both. The local default only suits start.sh's embedded worker.
+EXPORT_ROOT = os.getenv('EXPORT_ROOT', os.path.join(BASE_DIR, 'data', 'exports'))
+EXPORT_S3_BUCKET = os.getenv('EXPORT_S3_BUCKET')
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'exports': {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {
+            'bucket_name': EXPORT_S3_BUCKET,
+            'location': 'exports',
+            'default_acl': 'private',
+            'file_overwrite': False,
+        },
+    } if EXPORT_S3_BUCKET else {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {'location': EXPORT_ROOT},
+    },
+}
+
 # Add media directories
 MEDIA_DIRS = {
     'recipes': os.path.join(MEDIA_ROOT, 'recipes'),
@@ -263,18 +306,47 @@ if not DEBUG:
 
 # settings.py
 
+# Two-tier cache: a small per-process LRU (TieredCache) in front of a cache
+# shared by all workers, so signal-driven invalidations reach every process.
+# The shared tier is Redis when CACHE_REDIS_URL/REDIS_URL is set, otherwise a
+# file-based stand-in that works across workers on a single host.
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', os.getenv('REDIS_URL'))
+
+if CACHE_REDIS_URL:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+    }
+else:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'afrimeals_cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_FREQUENCY': 3,
+        }
+    }
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'BACKEND': 'dashboard.utils.tiered_cache.TieredCache',
+        'LOCATION': 'shared',
         'TIMEOUT': 300,  # 5 minutes default timeout
         'OPTIONS': {
-            'MAX_ENTRIES': 1000,  # Maximum number of entries in cache
-            'CULL_FREQUENCY': 3,  # Fraction of entries to cull when max is reached
+            'LOCAL_MAX_ENTRIES': 1000,  # Per-process LRU size
+            'LOCAL_TIMEOUT': 30,  # Upper bound on local staleness
+            'SYNC_INTERVAL': 1,  # Seconds between invalidation log checks
         }
-    }
+    },
+    'shared': {
+        'TIMEOUT': 300,
+        **SHARED_CACHE,
+    },
 }
 
+# Tests swap the shared tier for an in-memory cache (see dashboard.test_runner)
+TEST_RUNNER = 'dashboard.test_runner.AfrimealsTestRunner'
+
 # Cache timeouts (in seconds)
 CACHE_TIMEOUTS = {
     'short': 300,        # 5 minutes
@@ -294,6 +366,17 @@ CELERY_TIMEZONE = TIME_ZONE
 # Celery task settings
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
+# Run tasks inline when no worker/broker is available (local development)
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'False').lower() == 'true'
+CELERY_RESULT_EXPIRES = 60 * 60  # Keep job results for polling for 1 hour
+
+# Periodic tasks (run with `celery -A afrimeals_project beat`)
+CELERY_BEAT_SCHEDULE = {
+    'refresh-exchange-rates': {
+        'task': 'dashboard.tasks.refresh_exchange_rates_async',
+        'schedule': 60 * 60,  # Hourly
+    },
+}
 
 
 ## settings.py
@@ -3,10 +3,10 @@ from django.shortcuts import redirect
 from django.urls import path, include
 from django.views.generic import RedirectView
 from dashboard.views import (
-    ExportMealPlanPDF, HomeView, DashboardView, MealGeneratorView,
+    ExportMealPlanPDF, HomeView, DashboardView, MealGeneratorView, MealGeneratorStreamView,
     PricingView, CheckoutView, RecipeDetailsView, SubscriptionManagementView, SubscriptionSuccessView, MySubscriptionView, RecipeDetailView, RecipeListView, SubscriptionUpgradeSuccessView, TermsAndPolicyView,
     UserProfileView, RecipeCreateView, RecipeUpdateView, ShoppingListView, RecipeDeleteView,
-    ExportMealPlanView, FeedbackView, check_task_status, custom_logout, detect_user_currency, export_activity_pdf, activity_detail_api, find_stores, gemini_chat, 
+    ExportMealPlanView, ExportMealPlanFormatView, ExportMealPlanArchiveView, FeedbackView, check_task_status, custom_logout, detect_user_currency, export_activity_pdf, activity_detail_api, find_stores, gemini_chat, 
     checkout_success, checkout_cancel, get_exchange_rates, mark_feedback_status, meal_plan_history, get_meal_plan_details, update_currency, google_login_redirect
 )
 from rest_framework.routers import DefaultRouter
@@ -14,7 +14,7 @@ from dashboard.api import RecipeViewSet, MealPlanViewSet, GroceryListViewSet
 # urls.py
 from django.conf import settings
 from django.conf.urls.static import static
-from dashboard.api.gemini_views import chat
+from dashboard.api.gemini_views import chat, chat_stream
 from dashboard.webhooks import stripe_webhook
 from django.views.generic import TemplateView  
 from dashboard.admin import custom_admin_site  # Your custom admin site# Add this import
@@ -48,6 +48,7 @@ urlpatterns = [
     path('accounts/', include('allauth.urls')),
 
     path('meal-generator/', MealGeneratorView.as_view(), name='meal_generator'),
+    path('meal-generator/stream/', MealGeneratorStreamView.as_view(), name='meal_generator_stream'),
 
     # Subscription routes
     path('pricing/', PricingView.as_view(), name='pricing'),
@@ -70,7 +71,10 @@ urlpatterns = [
     path('activity/<int:activity_id>/detail/', activity_detail_api, name='activity_detail_api'),
 
     # New feature routes
-    path('meal-plans/<int:pk>/export/', ExportMealPlanView.as_view(), name='export_meal_plan'),
+    path('meal-plans/<int:pk>/export/', ExportMealPlanView.as_view(), name='export_meal_plan_pdf'),
+    path('meal-plans/<int:pk>/export/<slug:fmt>/', ExportMealPlanFormatView.as_view(), name='export_meal_plan_format'),
+    path('meal-plans/export/<slug:fmt>/', ExportMealPlanFormatView.as_view(), name='export_meal_plans_format'),
+    path('meal-plans/archive/', ExportMealPlanArchiveView.as_view(), name='export_meal_plans_archive'),
     path('feedback/', FeedbackView.as_view(), name='feedback'),
 
     # Include the API router URLs - moved to a specific prefix to avoid conflicts
@@ -85,6 +89,7 @@ urlpatterns = [
         name='export_meal_plan'),
 
     path('api/gemini/chat/', chat, name='gemini_chat'),
+    path('api/gemini/chat/stream/', chat_stream, name='gemini_chat_stream'),
     path('webhooks/stripe/', stripe_webhook, name='stripe_webhook'),
 
 
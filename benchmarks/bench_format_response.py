@@ -0,0 +1,94 @@
+"""Micro-benchmark: ResponseFormatter vs the previous re.sub chain.
+
+Run from the project root:
+
+    python benchmarks/bench_format_response.py [--sections N] [--repeat N]
+
+The previous chain ran every pattern over the whole reply, so the location
+pattern could match across lines; output is compared line by line, which is
+the contract the new formatter keeps.
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.utils.response_formatter import response_formatter  # noqa: E402
+
+
+def legacy_format_response(text):
+    """The chain GeminiAssistant.format_response used before the formatter"""
+    text = re.sub(r'^(NAIJAPLATE:.+?)(?=\n|$)',
+                  r'<div class="text-2xl font-bold text-green-700 mb-4">\1</div>', text, flags=re.MULTILINE)
+    text = re.sub(r'^(I+V?\.|[IVX]+\.)\s*([^\n]+)',
+                  r'<h3 class="text-xl font-semibold text-green-600 mt-6 mb-3">\1 \2</h3>', text, flags=re.MULTILINE)
+    text = re.sub(r'Watch this video:\s*([^:]+):\s*(https?://(?:www\.)?youtube\.com/watch\?v=[a-zA-Z0-9_-]+)',
+                  r'<div class="flex items-center gap-2 my-2"><span class="text-red-600">▶</span>'
+                  r'<a href="\2" target="_blank" class="text-green-600 hover:text-green-800">\1</a></div>', text)
+    text = re.sub(r'Search on YouTube for "(.[^"]+)"',
+                  r'<div class="flex items-center gap-2 my-2"><span class="text-red-600">▶</span>'
+                  r'<a href="https://www.youtube.com/results?search_query=\1" target="_blank" '
+                  r'class="text-green-600 hover:text-green-800">Watch: \1</a></div>', text)
+    text = re.sub(r'([^:]+):\s*([^(]+)\s*\(([^)]+)\)',
+                  lambda m: f'<div class="flex items-center gap-2 my-2">📍 {m.group(1)}: '
+                  f'<a href="https://www.google.com/maps/search/?api=1&query={m.group(3)}" '
+                  f'target="_blank" class="text-green-600 hover:text-green-800">{m.group(2)} '
+                  f'({m.group(3)})</a></div>', text)
+    text = re.sub(r'^\s*\*\s*(.*?)$', r'<div class="ml-4 my-2">• \1</div>', text, flags=re.MULTILINE)
+    text = re.sub(r'^\s{4}\*\s*(.*?)$', r'<div class="ml-8 my-1">◦ \1</div>', text, flags=re.MULTILINE)
+    text = re.sub(r'^\s*(\d+)\.\s*(.*?)$', r'<div class="ml-4 my-2">\1. \2</div>', text, flags=re.MULTILINE)
+    text = re.sub(r'\*\*(.*?)\*\*', r'<strong class="font-semibold">\1</strong>', text)
+    text = re.sub(r'\*(.*?)\*', r'<em class="italic">\1</em>', text)
+    text = re.sub(r'(Note:|Important:|Tip:)\s*(.*?)(?=\n|$)',
+                  r'<div class="bg-green-50 p-3 rounded-lg my-2"><span class="font-semibold">\1</span> \2</div>',
+                  text, flags=re.MULTILINE)
+    text = f'<div class="space-y-4 text-gray-800">{text}</div>'
+    return text.replace('\n\n', '</div><div class="my-4">').replace('\n', ' ')
+
+
+def legacy_by_line(text):
+    """The previous chain applied to one line at a time"""
+    prefix, suffix = '<div class="space-y-4 text-gray-800">', '</div>'
+    lines = [legacy_format_response(line)[len(prefix):-len(suffix)] for line in text.split('\n')]
+    body = prefix + '\n'.join(lines) + suffix
+    return body.replace('\n\n', '</div><div class="my-4">').replace('\n', ' ')
+
+
+SECTION = """I. Ingredients
+* 2 cups **long grain** rice
+* 400g chopped tomatoes
+    * optional *scotch bonnet*
+1. Blend the peppers until smooth
+2. Fry the base in palm oil for 10 minutes
+Tip: Rinse the rice until the water runs clear
+Afro Foods Leeds: 12 Harehills Road (Leeds LS8 5HS)
+Watch this video: Jollof Rice Tutorial: https://www.youtube.com/watch?v=abc123XYZ
+Search on YouTube for "party jollof rice"
+Stir gently, cover and let it steam on low heat until every grain is tender and smoky.
+"""
+
+
+def sample_reply(sections):
+    return 'NAIJAPLATE: Jollof Rice Guide\n\n' + '\n'.join(SECTION for _ in range(sections))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    for sections in (1, args.sections // 4, args.sections):
+        reply = sample_reply(sections)
+        assert response_formatter.format(reply) == legacy_by_line(reply), 'output differs'
+        legacy = min(timeit.repeat(lambda: legacy_format_response(reply), number=1, repeat=args.repeat))
+        single = min(timeit.repeat(lambda: response_formatter.format(reply), number=1, repeat=args.repeat))
+        print(f"{len(reply):>7} chars  legacy {legacy * 1000:8.2f} ms  "
+              f"single-pass {single * 1000:7.2f} ms  ({legacy / single:5.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Startup benchmark: import time of a worker booting the project.
+
+Run from the project root:
+
+    python benchmarks/bench_import_time.py [--runs N] [--budget-ms MS] [--top N]
+
+Each run boots Django in a fresh interpreter under ``python -X importtime``
+and loads the URLconf, which imports every view module, as a gunicorn
+worker does before serving its first request. The median total is checked
+against the budget, and the SDKs that views import lazily must not be loaded
+at all. Exits with status 1 when either check fails, so it can gate CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT = """
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'afrimeals_project.settings')
+import django
+django.setup()
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver(settings.ROOT_URLCONF).url_patterns
+"""
+
+# Loaded by the code paths that need them, never at startup
+DEFERRED = ('stripe', 'openai', 'google.genai', 'reportlab', 'mailjet_rest', 'pandas')
+
+
+def boot_imports():
+    """Every module one boot imported, and ``{module: cumulative microseconds}`` of the top-level ones"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules, top_level = set(), {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules.add(name.strip())
+        # Nested imports are indented under the import that triggered them
+        if not name.startswith('   '):
+            top_level[name.strip()] = int(cumulative)
+    return modules, top_level
+
+
+def loaded(modules, package):
+    return any(name == package or name.startswith(f'{package}.') for name in modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=1500)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    boots = [boot_imports() for _ in range(args.runs)]
+    totals = [sum(top_level.values()) / 1000 for _, top_level in boots]
+    median = statistics.median(totals)
+
+    modules, top_level = boots[-1]
+    for name, cumulative in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:8.1f} ms  {name}")
+
+    eager = [package for package in DEFERRED if loaded(modules, package)]
+    print(f"\nstartup imports: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}), budget {args.budget_ms:.0f} ms")
+
+    failed = False
+    if median > args.budget_ms:
+        print(f"FAIL: over budget by {median - args.budget_ms:.0f} ms")
+        failed = True
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,5 +17,11 @@ python manage.py migrate
 # Create Google social application if it doesn't exist  
 python manage.py create_superuser
 
+# Offline IP geolocation table (falls back to ipapi.co if this fails)
+python manage.py build_ip_country_db --download || echo "IP country table not built"
+
+# Store directory for nearby-store search (searches fall back to Gemini without it)
+python manage.py import_stores || echo "Store directory not imported"
+
 # Create subscription tiers
 python manage.py create_subscription_tiers
\ No newline at end of file
@@ -1,7 +1,7 @@
 # admin.py
 
 from django.contrib import admin
-from .models import MealPlan, PaymentHistory, Recipe, SubscriptionTier, UserSubscription, UserActivity, UserFeedback, User
+from .models import CanonicalRecipe, ExchangeRate, MealPlan, PaymentHistory, Recipe, Store, SubscriptionTier, UserSubscription, UserActivity, UserFeedback, User
 from django.urls import path
 from django.template.response import TemplateResponse
 from django.contrib.admin import AdminSite
@@ -40,6 +40,23 @@ class RecipeAdmin(admin.ModelAdmin):
     search_fields = ('title', 'user__username')
     list_filter = ('is_ai_generated', 'created_at')
 
+@admin.register(CanonicalRecipe)
+class CanonicalRecipeAdmin(admin.ModelAdmin):
+    list_display = ('title', 'normalized_name', 'created_at')
+    search_fields = ('title', 'normalized_name')
+    list_filter = ('created_at',)
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ('currency', 'rate', 'source', 'updated_at')
+    search_fields = ('currency',)
+
+@admin.register(Store)
+class StoreAdmin(admin.ModelAdmin):
+    list_display = ('name', 'store_type', 'address', 'geohash', 'is_active')
+    list_filter = ('store_type', 'is_active')
+    search_fields = ('name', 'address')
+
 @admin.register(UserFeedback)
 class UserFeedbackAdmin(admin.ModelAdmin):
     list_display = ('subject', 'feedback_type', 'user', 'created_at', 'is_resolved')
@@ -159,6 +176,9 @@ custom_admin_site = CustomAdminSite(name='custom_admin')
 # Register your models with both admin sites
 custom_admin_site.register(MealPlan, MealPlanAdmin)
 custom_admin_site.register(Recipe, RecipeAdmin)
+custom_admin_site.register(CanonicalRecipe, CanonicalRecipeAdmin)
+custom_admin_site.register(ExchangeRate, ExchangeRateAdmin)
+custom_admin_site.register(Store, StoreAdmin)
 custom_admin_site.register(UserFeedback, UserFeedbackAdmin)
 custom_admin_site.register(UserSubscription, UserSubscriptionAdmin)
 custom_admin_site.register(UserActivity, UserActivityAdmin)
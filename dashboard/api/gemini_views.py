@@ -4,15 +4,23 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from dashboard.decorators import rate_limit
+from dashboard.services.chat_cache import chat_cache
 from dashboard.services.gemini_assistant import GeminiAssistant
-from django.core.cache import cache
+from dashboard.services.meal_plan_stream import sse_event
+from dashboard.utils.response_formatter import response_formatter
+from dashboard.utils.subscription import get_subscription_state
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
 import logging
 
 logger = logging.getLogger(__name__)
 gemini = GeminiAssistant()
 
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@rate_limit('gemini_chat', max_requests=60, timeout=3600, burst=10)
 def chat(request):
     try:
         message = request.data.get('message')
@@ -23,8 +31,7 @@ def chat(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        cache_key = f"chat_response_{hash(message)}"
-        cached_response = cache.get(cache_key)
+        cached_response = chat_cache.get(message, get_subscription_state(request).tier_type)
 
         if cached_response:
             return Response(cached_response)
@@ -37,7 +44,8 @@ def chat(request):
             'message': response
         }
 
-        cache.set(cache_key, response_data, timeout=3600)  # Cache for 1 hour
+        if response != GeminiAssistant.ERROR_MESSAGE:
+            chat_cache.set(message, response_data)
         return Response(response_data)
 
     except Exception as e:
@@ -45,4 +53,63 @@ def chat(request):
         return Response(
             {'error': 'Failed to process chat message'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@rate_limit('gemini_chat', max_requests=60, timeout=3600, burst=10)
+def chat_stream(request):
+    """Stream a chat reply over Server-Sent Events as Gemini generates it.
+
+    Like the meal generator stream, serve this through the ASGI application;
+    under WSGI the events are buffered until the reply is complete.
+    """
+    message = request.data.get('message')
+
+    if not message:
+        return Response(
+            {'error': 'Message is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    tier = get_subscription_state(request).tier_type
+    response = StreamingHttpResponse(_stream_reply(message, tier), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop proxies buffering the stream
+    return response
+
+
+async def _stream_reply(message, tier):
+    """Yield an ``html`` event per batch of completed lines, then ``complete``"""
+    cached_response = await sync_to_async(chat_cache.get)(message, tier)
+
+    if cached_response:
+        yield sse_event('html', {'html': cached_response['message']})
+        yield sse_event('complete', {'success': True})
+        return
+
+    formatter = response_formatter.stream()
+    html = ''
+
+    try:
+        async for chunk in gemini.stream_chat(message):
+            fragment = formatter.feed(chunk)
+            if fragment:
+                html += fragment
+                yield sse_event('html', {'html': fragment})
+
+        fragment = formatter.close()
+        html += fragment
+        yield sse_event('html', {'html': fragment})
+
+    except Exception as e:
+        logger.error(f"Error in chat stream: {str(e)}", exc_info=True)
+        yield sse_event('error', {
+            'success': False,
+            'error': 'Failed to process chat message'
+        })
+        return
+
+    await sync_to_async(chat_cache.set)(message, {'success': True, 'message': html})
+    yield sse_event('complete', {'success': True})
@@ -8,6 +8,7 @@ from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 from ..models import MealPlan, Recipe, GroceryList
 from ..serializers import MealPlanSerializer, RecipeSerializer, GroceryListSerializer
+from ..utils.ingredients import nigerian_ingredients
 from django.core.exceptions import ObjectDoesNotExist
 import json
 import logging
@@ -172,9 +173,13 @@ class GroceryListViewSet(viewsets.ModelViewSet):
                     items=items
                 )
 
+            lines = [line for line in grocery_list.items.splitlines() if line.strip()]
             return Response({
                 'success': True,
-                'items': grocery_list.items
+                'items': grocery_list.items,
+                'african_store_items': [
+                    item['text'] for item in nigerian_ingredients.classify_many(lines) if item['is_nigerian']
+                ]
             })
 
         except MealPlan.DoesNotExist:
@@ -1,6 +1,7 @@
 # dashboard/context_processors.py
-from django.utils import timezone
-from .models import MealPlan, UserSubscription
+from django.core.handlers.asgi import ASGIRequest
+
+from .utils.subscription import get_subscription_state
 
 
 # dashboard/context_processors.py
@@ -19,30 +20,27 @@ def subscription_status(request):
             'subscription_type': 'free'
         }
 
-    subscription = UserSubscription.get_active_subscription(request.user.id)
-    meal_plan_count = MealPlan.objects.filter(user=request.user).count()
+    state = get_subscription_state(request)
+    subscription = state.subscription
 
     context = {
         'subscription': subscription,
-        'has_subscription': subscription is not None,
-        'meal_plans_used': meal_plan_count,
-        'subscription_type': 'free'
+        'has_subscription': state.has_subscription,
+        'meal_plans_used': state.meal_plan_count,
+        'subscription_type': state.tier_type,
+        'is_premium': state.is_premium,
+        'can_use_gemini': state.is_premium,
+        'has_detailed_recipes': state.has_subscription,
+        'meal_plans_remaining': state.meal_plans_remaining,
     }
 
-    if not subscription:
-        context.update({
-            'is_premium': False,
-            'can_use_gemini': False,
-            'has_detailed_recipes': False,
-            'meal_plans_remaining': 3 - meal_plan_count
-        })
-    else:
-        context.update({
-            'is_premium': subscription.subscription_tier.tier_type == 'weekly',
-            'can_use_gemini': subscription.subscription_tier.tier_type == 'weekly',
-            'has_detailed_recipes': True,
-            'meal_plans_remaining': None if subscription.subscription_tier.tier_type == 'weekly' else 1 - meal_plan_count,
-            'subscription_type': subscription.subscription_tier.tier_type
-        })
-
-    return context
\ No newline at end of file
+    return context
+
+
+def streaming(request):
+    """Whether this request is served over ASGI, where Server-Sent Events reach the browser as they're sent.
+
+    Under WSGI, Django buffers an async stream until it ends and holds a sync
+    worker for the whole reply, so pages use their non-streaming endpoints.
+    """
+    return {'streaming_enabled': isinstance(request, ASGIRequest)}
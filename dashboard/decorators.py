@@ -1,4 +1,5 @@
 # dashboard/decorators.py
+import time
 from functools import wraps
 from django.core.cache import cache
 from django.http import JsonResponse
@@ -8,7 +9,8 @@ from django.shortcuts import redirect
 from django.contrib import messages
 
 from afrimeals_project import settings
-from .models import UserSubscription, MealPlan
+from .utils.rate_limit import SlidingWindowRateLimiter, request_identity
+from .utils.subscription import get_subscription_state
 
 from django.utils import timezone
 
@@ -17,8 +19,9 @@ from django.utils import timezone
 def check_subscription_limits(view_func):
     @wraps(view_func)
     def _wrapped_view(self, request, *args, **kwargs):
-        subscription = UserSubscription.get_active_subscription(request.user.id)
-        meal_plan_count = MealPlan.objects.filter(user=request.user).count()
+        state = get_subscription_state(request)
+        subscription = state.subscription
+        meal_plan_count = state.meal_plan_count
 
         # Free tier limit (3 meal plans)
         if not subscription and meal_plan_count >= 3:
@@ -42,44 +45,61 @@ def check_subscription_limits(view_func):
 
 
 
-def rate_limit(key_prefix, max_requests=5, timeout=3600):
+def rate_limit(key_prefix, max_requests=5, timeout=3600, burst=None, burst_window=60):
+    """
+    Limit a view to ``max_requests`` per sliding ``timeout``-second window,
+    counted per user (per client IP for anonymous users). ``burst``
+    additionally caps requests within any ``burst_window`` seconds.
+    """
+    limiters = [SlidingWindowRateLimiter(key_prefix, max_requests, timeout)]
+    if burst:
+        limiters.append(SlidingWindowRateLimiter(key_prefix, burst, burst_window))
+
     def decorator(view_func):
         @wraps(view_func)
-        def _wrapped_view(self, request, *args, **kwargs):
-            # Create a unique cache key for this user and endpoint
-            cache_key = f"{key_prefix}_{request.user.id}"
-            request_count = cache.get(cache_key, 0)
-
-            # Check if rate limit is exceeded
-            if request_count >= max_requests:
-                # Check if request is AJAX
-                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    return JsonResponse({
-                        'success': False,
-                        'error': 'Rate limit exceeded. Please try again later.'
-                    }, status=429)
-                else:
-                    messages.error(request, 'Too many attempts. Please try again later.')
-                    return redirect('home')
-
-            # Increment the request count
-            cache.set(cache_key, request_count + 1, timeout)
-
-            return view_func(self, request, *args, **kwargs)
+        def _wrapped_view(*args, **kwargs):
+            # Works for function views (request, ...) and methods (self, request, ...)
+            request = args[0] if hasattr(args[0], 'META') else args[1]
+
+            identity = request_identity(request)
+            now = time.time()
+            counted = []
+            for limiter in limiters:
+                result = limiter.hit(identity, now)
+                if not result.allowed:
+                    # A rejected request doesn't use up the other limiters' allowance
+                    for other in counted:
+                        other.release(identity, now)
+                    return _rate_limited_response(request, result.retry_after)
+                counted.append(limiter)
+
+            return view_func(*args, **kwargs)
         return _wrapped_view
     return decorator
 
 
+def _rate_limited_response(request, retry_after):
+    if (request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+            or 'application/json' in request.headers.get('Accept', '')
+            or request.content_type == 'application/json'):
+        response = JsonResponse({
+            'success': False,
+            'error': 'Rate limit exceeded. Please try again later.',
+            'retry_after': retry_after
+        }, status=429)
+    else:
+        messages.error(request, 'Too many attempts. Please try again later.')
+        response = redirect('home')
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
 def check_subscription_access(feature):
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(self, request, *args, **kwargs):
             try:
-                subscription = UserSubscription.objects.filter(
-                    user=request.user,
-                    is_active=True,
-                    end_date__gt=timezone.now()
-                ).select_related('subscription_tier').first()
+                subscription = get_subscription_state(request).subscription
 
                 # Define feature access levels
                 feature_requirements = {
@@ -0,0 +1,40 @@
+# management/commands/build_ip_country_db.py
+import gzip
+import os
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from dashboard.utils.geoip import build_ip_country_db
+from dashboard.utils.http_client import http_client
+
+DBIP_URL = 'https://download.db-ip.com/free/dbip-country-lite-{month}.csv.gz'
+
+
+class Command(BaseCommand):
+    help = 'Compile the offline IP -> country table from GEOIP_CSV_PATH (optionally downloading the DB-IP Lite CSV first)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--download', action='store_true', help="Fetch this month's DB-IP Country Lite CSV")
+
+    def handle(self, *args, **options):
+        csv_path = settings.GEOIP_CSV_PATH
+
+        if options['download']:
+            url = DBIP_URL.format(month=timezone.now().strftime('%Y-%m'))
+            self.stdout.write(f'Downloading {url}')
+            response = http_client.get(url, stream=True, timeout=(5, 120))
+            if response.status_code != 200:
+                raise CommandError(f'Download failed with status {response.status_code}')
+            os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+            response.raw.decode_content = True
+            with gzip.GzipFile(fileobj=response.raw) as source, open(csv_path, 'wb') as target:
+                shutil.copyfileobj(source, target)
+
+        if not os.path.exists(csv_path):
+            raise CommandError(f'No IP range CSV at {csv_path}')
+
+        count = build_ip_country_db(csv_path, settings.GEOIP_DB_PATH)
+        self.stdout.write(self.style.SUCCESS(f'Built IP country table: {count} ranges'))
@@ -0,0 +1,27 @@
+# management/commands/enrich_stores.py
+from django.core.management.base import BaseCommand
+from dashboard.models import Store
+from dashboard.services.store_finder import StoreFinder
+
+class Command(BaseCommand):
+    help = 'Fill in missing ingredient tags for stores using Gemini (run offline, never per request)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-tag stores that already have tags')
+
+    def handle(self, *args, **options):
+        finder = StoreFinder()
+        stores = [
+            store for store in Store.objects.filter(is_active=True)
+            if options['all'] or not store.ingredient_tags
+        ]
+
+        enriched = 0
+        for store in stores:
+            try:
+                finder.enrich_store(store)
+                enriched += 1
+            except Exception as e:
+                self.stderr.write(f'Could not enrich {store}: {str(e)}')
+
+        self.stdout.write(self.style.SUCCESS(f'Enriched {enriched} of {len(stores)} stores'))
@@ -0,0 +1,85 @@
+# management/commands/import_stores.py
+import csv
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from dashboard.models import Store
+
+STORE_TYPES = dict(Store.STORE_TYPES)
+
+
+class Command(BaseCommand):
+    help = (
+        'Load stores into the Store table from a CSV with name, store_type, address, latitude, '
+        'longitude and optional ingredient_tags (separated by ";") columns'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='CSV to import (defaults to STORES_CSV_PATH)')
+        parser.add_argument(
+            '--deactivate-missing', action='store_true', help='Deactivate stores that are not in the CSV'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.STORES_CSV_PATH
+        if not os.path.exists(path):
+            raise CommandError(f'No store CSV at {path}')
+
+        created = updated = skipped = 0
+        seen = set()
+        with open(path, newline='', encoding='utf-8') as f, transaction.atomic():
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                try:
+                    fields = self.parse_row(row)
+                except ValueError as e:
+                    self.stderr.write(f'Skipping line {line}: {str(e)}')
+                    skipped += 1
+                    continue
+
+                # Stores are matched on name and address, so re-importing updates them in place
+                store, was_created = Store.objects.update_or_create(
+                    name=fields.pop('name'), address=fields.pop('address'), defaults=fields
+                )
+                seen.add(store.pk)
+                if was_created:
+                    created += 1
+                else:
+                    updated += 1
+
+            deactivated = 0
+            if options['deactivate_missing']:
+                deactivated = Store.objects.filter(is_active=True).exclude(pk__in=seen).update(is_active=False)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported stores: {created} created, {updated} updated, {skipped} skipped, {deactivated} deactivated'
+        ))
+
+    def parse_row(self, row: dict) -> dict:
+        name = (row.get('name') or '').strip()
+        address = (row.get('address') or '').strip()
+        store_type = (row.get('store_type') or '').strip().lower()
+        if not name or not address:
+            raise ValueError('name and address are required')
+        if store_type not in STORE_TYPES:
+            raise ValueError(f'unknown store_type "{store_type}"')
+
+        latitude, longitude = float(row.get('latitude') or 'nan'), float(row.get('longitude') or 'nan')
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError('latitude/longitude out of range')
+
+        fields = {
+            'name': name,
+            'address': address,
+            'store_type': store_type,
+            'latitude': latitude,
+            'longitude': longitude,
+            'is_active': True,
+        }
+        # Leave tags filled in by enrich_stores alone unless the CSV has some
+        tags = [tag for tag in (row.get('ingredient_tags') or '').split(';') if tag.strip()]
+        if tags:
+            fields['ingredient_tags'] = tags
+        return fields
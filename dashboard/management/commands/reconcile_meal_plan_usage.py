@@ -0,0 +1,10 @@
+# management/commands/reconcile_meal_plan_usage.py
+from django.core.management.base import BaseCommand
+from dashboard.models import MealPlanUsage
+
+class Command(BaseCommand):
+    help = 'Recount per-user meal plan usage counters from the MealPlan table (run periodically, e.g. nightly)'
+
+    def handle(self, *args, **kwargs):
+        fixed = MealPlanUsage.reconcile()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled meal plan usage: {fixed} counters corrected'))
@@ -0,0 +1,13 @@
+# management/commands/refresh_exchange_rates.py
+from django.core.management.base import BaseCommand, CommandError
+from dashboard.services.exchange_rates import refresh_exchange_rates
+
+class Command(BaseCommand):
+    help = 'Fetch current exchange rates into the rates table (run on deploy; celery beat refreshes them hourly)'
+
+    def handle(self, *args, **kwargs):
+        try:
+            updated = refresh_exchange_rates()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Refreshed exchange rates: {updated} currencies stored'))
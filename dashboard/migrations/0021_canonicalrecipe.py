@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 07:03
+
+import dashboard.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0020_alter_subscriptiontier_tier_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalRecipe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('normalized_name', models.CharField(max_length=200, unique=True)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+                ('ingredients', models.TextField()),
+                ('instructions', models.TextField()),
+                ('prep_time', models.CharField(default='30 mins', max_length=200)),
+                ('cook_time', models.CharField(default='45 mins', max_length=200)),
+                ('servings', models.IntegerField(default=3)),
+                ('difficulty', models.CharField(default='Intermediate', max_length=200)),
+                ('nutrition_info', models.JSONField(blank=True, default=dict)),
+                ('tips', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            bases=(models.Model, dashboard.models.CacheModelMixin),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='canonical_recipe',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='copies', to='dashboard.canonicalrecipe'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.3 on 2026-10-18 07:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('dashboard', '0021_canonicalrecipe'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MealPlanUsage',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='meal_plan_usage', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('meal_plan_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
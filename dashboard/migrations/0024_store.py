@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-18 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0023_exchangerate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Store',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('store_type', models.CharField(choices=[('african', 'African Food Store'), ('international', 'International Food Store'), ('supermarket', 'Supermarket'), ('halal', 'Halal Shop'), ('market', 'Market')], db_index=True, max_length=20)),
+                ('address', models.CharField(max_length=255)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('geohash', models.CharField(db_index=True, editable=False, max_length=9)),
+                ('ingredient_tags', models.JSONField(blank=True, default=list)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
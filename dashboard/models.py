@@ -1,14 +1,20 @@
 import json
 import os
-from django.db import models
+import re
+import unicodedata
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-import openai
 from django.conf import settings
-import stripe
+
+from .utils.cache import get_or_set_cache
+from .utils.stripe_client import get_stripe
+from .utils.geo import geohash_encode, geohash_neighbors, haversine_km, precision_for_radius
 
 import logging
 
@@ -16,12 +22,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 # Cache configuration
-CACHE_TIMEOUTS = {
-    'short': 300,        # 5 minutes
-    'medium': 1800,      # 30 minutes
-    'long': 3600,        # 1 hour
-    'very_long': 86400,  # 24 hours
-}
+CACHE_TIMEOUTS = settings.CACHE_TIMEOUTS
 
 
 def recipe_image_path(instance, filename):
@@ -43,6 +44,11 @@ class CacheModelMixin:
         """Invalidate cache for this instance"""
         cache.delete(self.get_cache_key(self.id))
 
+    @classmethod
+    def get_cached(cls, cache_key, callback, timeout=None):
+        """Read through the shared cache, computing the value on a miss"""
+        return get_or_set_cache(cache_key, callback, timeout)
+
 class MealPlan(models.Model, CacheModelMixin):
     user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=True)
     name = models.CharField(max_length=100, db_index=True)
@@ -60,16 +66,144 @@ class MealPlan(models.Model, CacheModelMixin):
     @classmethod
     def get_user_plans(cls, user_id, limit=None):
         """Get cached meal plans for a user"""
-        cache_key = f"user_meal_plans_{user_id}"
-        plans = cache.get(cache_key)
-
-        if plans is None:
-            plans = list(cls.objects.filter(user_id=user_id).order_by('-created_at'))
-            cache.set(cache_key, plans, CACHE_TIMEOUTS['medium'])
+        plans = cls.get_cached(
+            f"user_meal_plans_{user_id}",
+            lambda: list(cls.objects.filter(user_id=user_id).order_by('-created_at')),
+            CACHE_TIMEOUTS['medium']
+        )
 
         return plans[:limit] if limit else plans
 
+class MealPlanUsage(models.Model):
+    """Per-user meal plan count, kept in step with MealPlan by signal receivers"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='meal_plan_usage')
+    meal_plan_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.meal_plan_count} meal plans"
+
+    @classmethod
+    def count_for(cls, user_id):
+        """Return the user's meal plan count with a primary-key read"""
+        usage = cls.objects.filter(user_id=user_id).values_list('meal_plan_count', flat=True).first()
+        if usage is None:
+            usage, _ = cls.objects.get_or_create(
+                user_id=user_id,
+                defaults={'meal_plan_count': MealPlan.objects.filter(user_id=user_id).count()}
+            )
+            return usage.meal_plan_count
+        return usage
+
+    @classmethod
+    def adjust(cls, user_id, delta):
+        """Apply a create (+1) or delete (-1) to the user's counter"""
+        with transaction.atomic():
+            updated = cls.objects.filter(user_id=user_id).update(
+                meal_plan_count=Greatest(F('meal_plan_count') + delta, 0),
+                updated_at=timezone.now()
+            )
+            # Missing counters are seeded from COUNT(*), which already includes a new plan.
+            # Deletes never seed one, as the user itself may be mid-cascade delete.
+            if not updated and delta > 0:
+                cls.count_for(user_id)
+
+    @classmethod
+    def reconcile(cls):
+        """Rewrite counters that drifted from the MealPlan table; returns rows fixed"""
+        actual = dict(
+            MealPlan.objects.values('user_id').annotate(total=Count('id')).values_list('user_id', 'total')
+        )
+        stored = dict(cls.objects.values_list('user_id', 'meal_plan_count'))
+
+        fixed = 0
+        for user_id in set(actual) | set(stored):
+            count = actual.get(user_id, 0)
+            if stored.get(user_id) == count:
+                continue
+            cls.objects.update_or_create(user_id=user_id, defaults={'meal_plan_count': count})
+            fixed += 1
+        return fixed
+
+
 # dashboard/models.py
+def _text_list(text):
+    """Parse a list stored as JSON or as newline-separated text"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return [item.strip() for item in text.split('\n') if item.strip()]
+
+
+class CanonicalRecipe(models.Model, CacheModelMixin):
+    """Shared recipe for a dish, generated once and copied into users' Recipe rows"""
+    normalized_name = models.CharField(max_length=200, unique=True)
+    title = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+    ingredients = models.TextField()
+    instructions = models.TextField()
+    prep_time = models.CharField(max_length=200, default='30 mins')
+    cook_time = models.CharField(max_length=200, default='45 mins')
+    servings = models.IntegerField(default=3)
+    difficulty = models.CharField(max_length=200, default='Intermediate')
+    nutrition_info = models.JSONField(default=dict, blank=True)
+    tips = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    COPY_FIELDS = (
+        'description', 'ingredients', 'instructions', 'prep_time', 'cook_time',
+        'servings', 'difficulty', 'nutrition_info', 'tips',
+    )
+
+    def __str__(self):
+        return self.title
+
+    @staticmethod
+    def normalize_name(name):
+        """Normalize a dish name so spelling/punctuation variants share a recipe"""
+        name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+        name = re.sub(r'\s*&\s*', ' and ', name.lower())
+        name = re.sub(r'[^a-z0-9]+', ' ', name)
+        return ' '.join(name.split())[:200]
+
+    @classmethod
+    def lookup(cls, meal_name):
+        """Return the shared recipe for a dish name, if one exists"""
+        return cls.objects.filter(normalized_name=cls.normalize_name(meal_name)).first()
+
+    @classmethod
+    def store(cls, meal_name, fields):
+        """Add a generated recipe to the library; the first one stored wins"""
+        defaults = {field: fields[field] for field in cls.COPY_FIELDS if field in fields}
+        defaults['title'] = meal_name[:100]
+        canonical, _ = cls.objects.get_or_create(
+            normalized_name=cls.normalize_name(meal_name),
+            defaults=defaults
+        )
+        return canonical
+
+    def recipe_fields(self):
+        """Fields to copy into a per-user Recipe linked to this one"""
+        fields = {field: getattr(self, field) for field in self.COPY_FIELDS}
+        fields['canonical_recipe'] = self
+        return fields
+
+    def to_recipe_data(self, meal_name):
+        """Recipe JSON in the shape returned by the recipe details endpoint"""
+        return {
+            'title': meal_name,
+            'description': self.description,
+            'prepTime': self.prep_time,
+            'cookTime': self.cook_time,
+            'servings': self.servings,
+            'difficulty': self.difficulty,
+            'ingredients': _text_list(self.ingredients),
+            'instructions': _text_list(self.instructions),
+            'nutrition': self.nutrition_info,
+            'tips': self.tips,
+        }
+
+
 class Recipe(models.Model, CacheModelMixin):
     user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=True)
     title = models.CharField(max_length=100, db_index=True)
@@ -88,6 +222,10 @@ class Recipe(models.Model, CacheModelMixin):
     meal_type = models.CharField(max_length=200, null=True, blank=True)
     day_index = models.IntegerField(null=True, blank=True)
     is_ai_generated = models.BooleanField(default=False)  # Add this field
+    # Set while the row is an unedited copy of a shared recipe; cleared on edit
+    canonical_recipe = models.ForeignKey(
+        CanonicalRecipe, on_delete=models.SET_NULL, null=True, blank=True, related_name='copies'
+    )
 
     class Meta:
         indexes = [
@@ -132,16 +270,13 @@ class Recipe(models.Model, CacheModelMixin):
     @classmethod
     def get_user_recipes(cls, user_id):
         """Get cached recipes for a user"""
-        cache_key = f"user_recipes_{user_id}"
-        recipes = cache.get(cache_key)
-
-        if recipes is None:
-            recipes = list(cls.objects.filter(user_id=user_id)
+        return cls.get_cached(
+            f"user_recipes_{user_id}",
+            lambda: list(cls.objects.filter(user_id=user_id)
                          .select_related('user', 'meal_plan')
-                         .order_by('-created_at'))
-            cache.set(cache_key, recipes, CACHE_TIMEOUTS['medium'])
-
-        return recipes
+                         .order_by('-created_at')),
+            CACHE_TIMEOUTS['medium']
+        )
 
     @classmethod
     def generate_recipe(cls, meal_name, user, meal_plan=None, meal_type=None, day_index=None):
@@ -158,6 +293,20 @@ class Recipe(models.Model, CacheModelMixin):
                 if existing_recipe:
                     return existing_recipe
 
+            # Copy the shared recipe for this dish when there is one
+            canonical = CanonicalRecipe.lookup(meal_name)
+            if canonical:
+                recipe = cls.objects.create(
+                    user=user,
+                    title=meal_name,
+                    meal_plan=meal_plan,
+                    meal_type=meal_type,
+                    day_index=day_index,
+                    **canonical.recipe_fields()
+                )
+                cache.delete(f"user_recipes_{user.id}")
+                return recipe
+
             # Generate new recipe using ChatGPT
             prompt = f"""
             Generate a detailed Nigerian recipe for {meal_name} including:
@@ -173,6 +322,7 @@ class Recipe(models.Model, CacheModelMixin):
             Return the response as a JSON object.
             """
 
+            import openai
             response = openai.ChatCompletion.create(
                 model="gpt-4",
                 messages=[
@@ -183,22 +333,28 @@ class Recipe(models.Model, CacheModelMixin):
 
             recipe_data = json.loads(response.choices[0].message.content)
 
+            recipe_fields = {
+                'description': recipe_data.get('description', ''),
+                'ingredients': json.dumps(recipe_data.get('ingredients', [])),
+                'instructions': json.dumps(recipe_data.get('instructions', [])),
+                'prep_time': recipe_data.get('prep_time', '30 mins'),
+                'cook_time': recipe_data.get('cook_time', '45 mins'),
+                'servings': recipe_data.get('servings', 4),
+                'difficulty': recipe_data.get('difficulty', 'Intermediate'),
+                'nutrition_info': recipe_data.get('nutrition', {}),
+                'tips': recipe_data.get('tips', []),
+            }
+            canonical = CanonicalRecipe.store(meal_name, recipe_fields)
+
             # Create new recipe
             recipe = cls.objects.create(
                 user=user,
                 title=meal_name,
-                description=recipe_data.get('description', ''),
-                ingredients=recipe_data.get('ingredients', []),
-                instructions=recipe_data.get('instructions', []),
-                prep_time=recipe_data.get('prep_time', '30 mins'),
-                cook_time=recipe_data.get('cook_time', '45 mins'),
-                servings=recipe_data.get('servings', 4),
-                difficulty=recipe_data.get('difficulty', 'Intermediate'),
-                nutrition_info=recipe_data.get('nutrition', {}),
-                tips=recipe_data.get('tips', []),
                 meal_plan=meal_plan,
                 meal_type=meal_type,
-                day_index=day_index
+                day_index=day_index,
+                canonical_recipe=canonical,
+                **recipe_fields
             )
 
             # Invalidate cache
@@ -234,15 +390,11 @@ class GroceryList(models.Model, CacheModelMixin):
     @classmethod
     def get_latest_for_user(cls, user_id):
         """Get cached latest grocery list for a user"""
-        cache_key = f"latest_grocery_list_{user_id}"
-        grocery_list = cache.get(cache_key)
-
-        if grocery_list is None:
-            grocery_list = cls.objects.filter(user_id=user_id).order_by('-created_at').first()
-            if grocery_list:
-                cache.set(cache_key, grocery_list, CACHE_TIMEOUTS['short'])
-
-        return grocery_list
+        return cls.get_cached(
+            f"latest_grocery_list_{user_id}",
+            lambda: cls.objects.filter(user_id=user_id).order_by('-created_at').first(),
+            CACHE_TIMEOUTS['short']
+        )
 
 class SubscriptionTier(models.Model, CacheModelMixin):
     TIER_CHOICES = (
@@ -275,7 +427,7 @@ class SubscriptionTier(models.Model, CacheModelMixin):
     def save(self, *args, **kwargs):
         # Create or update Stripe product/price if not in test mode
         if not settings.STRIPE_TEST_MODE and not self.stripe_product_id:
-            stripe.api_key = settings.STRIPE_SECRET_KEY
+            stripe = get_stripe()
 
             # Create or update Stripe product
             try:
@@ -314,14 +466,11 @@ class SubscriptionTier(models.Model, CacheModelMixin):
     @classmethod
     def get_active_tiers(cls):
         """Get cached active subscription tiers"""
-        cache_key = "active_subscription_tiers"
-        tiers = cache.get(cache_key)
-
-        if tiers is None:
-            tiers = list(cls.objects.filter(is_active=True).order_by('price'))
-            cache.set(cache_key, tiers, CACHE_TIMEOUTS['long'])
-
-        return tiers
+        return cls.get_cached(
+            "active_subscription_tiers",
+            lambda: list(cls.objects.filter(is_active=True).order_by('price')),
+            CACHE_TIMEOUTS['long']
+        )
 
     def clear_cache(self):
         """Clear all related caches"""
@@ -405,17 +554,19 @@ class UserSubscription(models.Model, CacheModelMixin):
     def get_active_subscription(cls, user_id):
         """Get cached active subscription for a user"""
         cache_key = f"active_subscription_{user_id}"
-        subscription = cache.get(cache_key)
-
-        if subscription is None:
-            subscription = cls.objects.filter(
+        subscription = cls.get_cached(
+            cache_key,
+            lambda: cls.objects.filter(
                 user_id=user_id,
                 is_active=True,
                 end_date__gt=timezone.now()
-            ).select_related('subscription_tier').first()
-            if subscription:
-                cache.set(cache_key, subscription, CACHE_TIMEOUTS['medium'])
-
+            ).select_related('subscription_tier').first(),
+            CACHE_TIMEOUTS['medium']
+        )
+        # The cached copy may have passed its end date since it was stored
+        if subscription and not subscription.is_valid():
+            cache.delete(cache_key)
+            return None
         return subscription
 
 
@@ -453,6 +604,80 @@ class PaymentHistory(models.Model):
         ordering = ['-payment_date']
 
 
+class ExchangeRate(models.Model):
+    """Latest GBP -> currency rate, written by the scheduled refresh task"""
+    currency = models.CharField(max_length=3, unique=True)
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+    source = models.CharField(max_length=50)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['currency']
+
+    def __str__(self):
+        return f"GBP/{self.currency}: {self.rate}"
+
+
+class Store(models.Model):
+    """A grocery store, indexed by geohash for nearby-store search"""
+    STORE_TYPES = (
+        ('african', 'African Food Store'),
+        ('international', 'International Food Store'),
+        ('supermarket', 'Supermarket'),
+        ('halal', 'Halal Shop'),
+        ('market', 'Market'),
+    )
+
+    name = models.CharField(max_length=200)
+    store_type = models.CharField(max_length=20, choices=STORE_TYPES, db_index=True)
+    address = models.CharField(max_length=255)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    geohash = models.CharField(max_length=9, db_index=True, editable=False)
+    ingredient_tags = models.JSONField(default=list, blank=True)  # Lowercase ingredient names
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.get_store_type_display()})"
+
+    def save(self, *args, **kwargs):
+        self.geohash = geohash_encode(self.latitude, self.longitude)
+        self.ingredient_tags = sorted({tag.strip().lower() for tag in self.ingredient_tags if tag.strip()})
+        if kwargs.get('update_fields') is not None:
+            # The geohash follows the coordinates, e.g. on update_or_create
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'geohash'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def nearest(cls, lat, lng, k=5, radius_km=16.0):
+        """Up to ``k`` active stores within ``radius_km``, closest first, as (store, km) pairs.
+
+        Candidates come from the geohash cell around the point and its eight
+        neighbours, at the finest precision that still covers the radius, so
+        only nearby rows are read; exact distances are then computed in one
+        vectorized haversine pass.
+        """
+        cell = geohash_encode(lat, lng, precision_for_radius(radius_km, lat))
+        in_cells = Q()
+        for neighbor in geohash_neighbors(cell):
+            in_cells |= Q(geohash__startswith=neighbor)
+
+        candidates = list(cls.objects.filter(in_cells, is_active=True))
+        if not candidates:
+            return []
+
+        import numpy as np
+
+        distances = haversine_km(
+            lat, lng, [store.latitude for store in candidates], [store.longitude for store in candidates]
+        )
+        within = np.flatnonzero(distances <= radius_km)
+        closest = within[np.argsort(distances[within], kind='stable')][:k]
+        return [(candidates[i], float(distances[i])) for i in closest]
+
+
 
 class UserActivity(models.Model, CacheModelMixin):
     ACTION_CHOICES = (
@@ -542,6 +767,11 @@ def invalidate_meal_plan_cache(sender, instance, **kwargs):
     cache.delete(f"user_meal_plans_{instance.user_id}")
     cache.delete(f"meal_plan_{instance.id}")
 
+    if kwargs['signal'] is post_delete:
+        MealPlanUsage.adjust(instance.user_id, -1)
+    elif kwargs.get('created'):
+        MealPlanUsage.adjust(instance.user_id, 1)
+
 @receiver([post_save, post_delete], sender=Recipe)
 def invalidate_recipe_cache(sender, instance, **kwargs):
     cache.delete(f"user_recipes_{instance.user_id}")
@@ -0,0 +1,144 @@
+# dashboard/services/chat_cache.py
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class ChatResponseCache:
+    """Answers to chat messages, shared by every worker.
+
+    Messages are keyed on a SHA-256 of their normalized text (case, spacing
+    and trailing punctuation ignored), so "Where can I buy egusi in Leeds?"
+    and "where can i buy  egusi in leeds" share an answer across processes
+    and restarts. Answers live in the shared cache for ``SHARED_TIMEOUT``
+    seconds, with a per-process LRU of ``LOCAL_MAX_ENTRIES`` in front of it for
+    ``LOCAL_TIMEOUT`` seconds.
+
+    How old an answer a user is served depends on their subscription tier
+    (``TIER_MAX_AGE``): an answer too old for a paid tier counts as a miss,
+    and the fresh answer then replaces it for everyone.
+
+    Lookups are counted per process and added to the shared totals at most
+    every ``STATS_FLUSH_INTERVAL`` seconds, so hits cost no shared writes.
+    """
+
+    KEY_PREFIX = 'chat_response'
+    STATS_PREFIX = 'chat_response_stats'
+    SHARED_TIMEOUT = 86400  # 24 hours
+    LOCAL_TIMEOUT = 300  # 5 minutes
+    LOCAL_MAX_ENTRIES = 256
+    STATS_FLUSH_INTERVAL = 30
+    OUTCOMES = ('local_hits', 'shared_hits', 'misses')
+
+    # Oldest answer (in seconds) served to each subscription tier; free users get up to SHARED_TIMEOUT
+    TIER_MAX_AGE = {
+        'weekly': 3600,
+        'monthly': 3600,
+        'one_time': 6 * 3600,
+        'pay_once': 6 * 3600,
+    }
+
+    def __init__(self):
+        self._local = OrderedDict()  # key -> (expires_at, stored_at, response)
+        self._lock = threading.Lock()
+        self._pending = Counter()  # Lookups not yet added to the shared totals
+        self._next_flush = time.monotonic() + self.STATS_FLUSH_INTERVAL
+
+    @property
+    def shared(self):
+        # The answers are large and never invalidated, so skip the default cache's local tier
+        return caches['shared']
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        return ' '.join(message.casefold().split()).rstrip('?!. ')
+
+    @classmethod
+    def key(cls, message: str) -> str:
+        digest = hashlib.sha256(cls.normalize(message).encode()).hexdigest()
+        return f"{cls.KEY_PREFIX}_{digest}"
+
+    def max_age(self, tier: str) -> int:
+        return self.TIER_MAX_AGE.get(tier, self.SHARED_TIMEOUT)
+
+    def get(self, message: str, tier: str = 'free') -> Optional[Dict]:
+        """The cached response to ``message`` if it is fresh enough for ``tier``, or None"""
+        key = self.key(message)
+        oldest = time.time() - self.max_age(tier)
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry and entry[0] <= time.monotonic():
+                del self._local[key]
+                entry = None
+            if entry:
+                self._local.move_to_end(key)
+        if entry and entry[1] >= oldest:
+            self._count('local_hits')
+            return entry[2]
+
+        # Another worker may have stored a fresher answer than the local copy
+        stored = self.shared.get(key)
+        if not stored or stored.get('stored_at', 0) < oldest:
+            self._count('misses')
+            return None
+
+        self._set_local(key, stored['response'], stored['stored_at'])
+        self._count('shared_hits')
+        return stored['response']
+
+    def set(self, message: str, response: Dict):
+        key = self.key(message)
+        stored_at = time.time()
+        self.shared.set(key, {'stored_at': stored_at, 'response': response}, self.SHARED_TIMEOUT)
+        self._set_local(key, response, stored_at)
+
+    def stats(self) -> Dict:
+        """Lookup counts across all workers, plus this process's LRU size"""
+        self.flush_stats()
+        counts = self.shared.get_many([f"{self.STATS_PREFIX}:{outcome}" for outcome in self.OUTCOMES])
+        stats = {outcome: counts.get(f"{self.STATS_PREFIX}:{outcome}", 0) for outcome in self.OUTCOMES}
+        stats['local_entries'] = len(self._local)
+        return stats
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _set_local(self, key: str, response: Dict, stored_at: float):
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.LOCAL_TIMEOUT, stored_at, response)
+            self._local.move_to_end(key)
+            while len(self._local) > self.LOCAL_MAX_ENTRIES:
+                self._local.popitem(last=False)
+
+    def _count(self, outcome: str):
+        with self._lock:
+            self._pending[outcome] += 1
+            due = time.monotonic() >= self._next_flush
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Add this process's pending lookup counts to the shared totals"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._next_flush = time.monotonic() + self.STATS_FLUSH_INTERVAL
+
+        for outcome, count in pending.items():
+            key = f"{self.STATS_PREFIX}:{outcome}"
+            try:
+                self.shared.add(key, 0, None)
+                self.shared.incr(key, count)
+            except Exception as e:
+                logger.warning(f"Could not count chat cache {outcome}: {str(e)}")
+
+
+chat_cache = ChatResponseCache()
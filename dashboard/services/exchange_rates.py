@@ -0,0 +1,143 @@
+# dashboard/services/exchange_rates.py
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from ..models import ExchangeRate
+from ..utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+BASE_CURRENCY = 'GBP'
+
+# Served until the first refresh has populated the rates table
+FALLBACK_RATES = {'GBP': 1.0, 'USD': 1.25, 'EUR': 1.15, 'NGN': 583.0}
+
+
+def _fetch_freecurrencyapi() -> Dict[str, float]:
+    if not settings.CURRENCY_API_KEY:
+        raise ValueError("CURRENCY_API_KEY is not configured")
+    response = http_client.get(
+        'https://api.freecurrencyapi.com/v1/latest',
+        headers={'apikey': settings.CURRENCY_API_KEY},
+        params={'base_currency': BASE_CURRENCY},
+    )
+    response.raise_for_status()
+    return response.json()['data']
+
+
+def _fetch_exchangerate_api() -> Dict[str, float]:
+    response = http_client.get(f'https://api.exchangerate-api.com/v4/latest/{BASE_CURRENCY}')
+    response.raise_for_status()
+    return response.json()['rates']
+
+
+# Tried in order; the first provider that answers wins
+PROVIDERS = (
+    ('freecurrencyapi', _fetch_freecurrencyapi),
+    ('exchangerate-api', _fetch_exchangerate_api),
+)
+
+
+def refresh_exchange_rates() -> int:
+    """Fetch current rates from the first available provider and upsert them.
+
+    Only the scheduled task and the management command call this, so no
+    request ever waits on a third-party API. Returns the number of rates stored.
+    """
+    for source, fetch in PROVIDERS:
+        try:
+            rates = fetch()
+        except Exception as e:
+            logger.warning(f"Exchange rate provider {source} failed: {str(e)}")
+            continue
+
+        now = timezone.now()
+        rows = [
+            ExchangeRate(currency=currency.upper(), rate=Decimal(str(rate)), source=source, updated_at=now)
+            for currency, rate in rates.items()
+            if len(currency) == 3 and rate
+        ]
+        ExchangeRate.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['currency'],
+            update_fields=['rate', 'source', 'updated_at'],
+        )
+        exchange_rates.reload()
+        logger.info(f"Stored {len(rows)} exchange rates from {source}")
+
+        # Imported here to avoid a circular import (price_matrix -> exchange_rates)
+        from .price_matrix import PriceMatrix
+        PriceMatrix.rebuild()
+        return len(rows)
+
+    raise RuntimeError("No exchange rate provider is available")
+
+
+class ExchangeRateSnapshot:
+    """Per-process copy of the rates table.
+
+    Lookups are dict reads; the table is re-read at most every
+    ``RELOAD_INTERVAL`` seconds, which is well inside the refresh schedule.
+    """
+
+    RELOAD_INTERVAL = 300
+
+    def __init__(self):
+        self._rates: Optional[Dict[str, float]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def reload(self) -> Dict[str, float]:
+        rates = dict(FALLBACK_RATES)
+        try:
+            rates.update(
+                (currency, float(rate))
+                for currency, rate in ExchangeRate.objects.values_list('currency', 'rate')
+            )
+        except DatabaseError as e:
+            logger.error(f"Could not load exchange rates: {str(e)}")
+        rates[BASE_CURRENCY] = 1.0
+
+        with self._lock:
+            self._rates = rates
+            self._loaded_at = time.monotonic()
+        return rates
+
+    def rates(self) -> Dict[str, float]:
+        """All known GBP -> currency rates"""
+        with self._lock:
+            rates, loaded_at = self._rates, self._loaded_at
+        if rates is None or time.monotonic() - loaded_at >= self.RELOAD_INTERVAL:
+            rates = self.reload()
+        return rates
+
+    def rate(self, currency: str, base: str = BASE_CURRENCY, default: float = 1.0) -> float:
+        """Rate from ``base`` to ``currency``, or ``default`` if either is unknown"""
+        rates = self.rates()
+        target, source = rates.get(currency.upper()), rates.get(base.upper())
+        if not target or not source:
+            return default
+        return target / source
+
+    def rates_for(self, currencies: Iterable[str], base: str = BASE_CURRENCY) -> Dict[str, float]:
+        """Rates from ``base`` to each known currency in ``currencies``"""
+        rates = self.rates()
+        source = rates.get(base.upper())
+        if not source:
+            return {}
+        return {
+            currency: rates[currency] / source
+            for currency in (c.strip().upper() for c in currencies)
+            if currency in rates
+        }
+
+
+exchange_rates = ExchangeRateSnapshot()
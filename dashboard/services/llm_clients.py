@@ -0,0 +1,179 @@
+# dashboard/services/llm_clients.py
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from google import genai
+    from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+
+# The SDKs take most of a second each to import, so each loads with its first client
+def _openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=settings.OPENAI_API_KEY)
+
+
+def _async_openai_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+
+def _gemini_client():
+    from google import genai
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
+
+
+def _async_gemini_client():
+    return _gemini_client().aio
+
+
+async def _close_async_client(client):
+    # AsyncOpenAI has close(); google-genai's async client only has aclose() in newer releases
+    close = getattr(client, 'aclose', None) or getattr(client, 'close', None)
+    if close is not None:
+        await close()
+
+
+class LLMBusyError(Exception):
+    """Raised when a provider's concurrency limit stays full for too long"""
+
+
+class LLMClientRegistry:
+    """Process-wide LLM clients, built on first use and shared by all requests.
+
+    Each client keeps its own HTTP connection pool, so reusing one instance
+    saves the client construction and TLS handshake every request used to pay.
+    ``limit``/``async_limit`` cap concurrent calls per provider from this
+    process (``settings.LLM_CONCURRENCY``); a call that can't get a slot within
+    ``settings.LLM_ACQUIRE_TIMEOUT`` seconds raises ``LLMBusyError``.
+
+    Async clients are the exception: their connections belong to the event
+    loop that opened them, and under WSGI every streamed response runs in its
+    own ``async_to_sync`` loop. ``async_client`` builds one per request
+    coroutine and closes it when the stream ends.
+    """
+
+    FACTORIES = {
+        'openai': _openai_client,
+        'gemini': _gemini_client,
+    }
+    ASYNC_FACTORIES = {
+        'openai': _async_openai_client,
+        'gemini': _async_gemini_client,
+    }
+    ACQUIRE_POLL_INTERVAL = 0.05
+
+    def __init__(self):
+        self._clients = {}
+        self._semaphores = {}
+        self._loop_semaphores = weakref.WeakKeyDictionary()  # event loop -> {provider: asyncio.Semaphore}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = self._clients[name] = self.FACTORIES[name]()
+                    logger.info(f"Created {name} client")
+        return client
+
+    def openai(self) -> 'OpenAI':
+        return self.get('openai')
+
+    def gemini(self) -> 'genai.Client':
+        return self.get('gemini')
+
+    @asynccontextmanager
+    async def async_client(self, provider: str):
+        """An async client for the current request coroutine, closed when the block exits"""
+        client = self.ASYNC_FACTORIES[provider]()
+        try:
+            yield client
+        finally:
+            try:
+                await _close_async_client(client)
+            except Exception as e:
+                logger.warning(f"Could not close async {provider} client: {str(e)}")
+
+    def _semaphore(self, provider: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if provider not in self._semaphores:
+                self._semaphores[provider] = threading.BoundedSemaphore(settings.LLM_CONCURRENCY[provider])
+            return self._semaphores[provider]
+
+    def _acquire(self, provider: str) -> threading.BoundedSemaphore:
+        semaphore = self._semaphore(provider)
+        if not semaphore.acquire(timeout=settings.LLM_ACQUIRE_TIMEOUT):
+            raise LLMBusyError(f"Too many concurrent {provider} requests")
+        return semaphore
+
+    @contextmanager
+    def limit(self, provider: str):
+        """Hold one of ``provider``'s concurrency slots for the block"""
+        semaphore = self._acquire(provider)
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def _loop_semaphore(self, provider: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._loop_semaphores.setdefault(loop, {})
+            if provider not in semaphores:
+                semaphores[provider] = asyncio.Semaphore(settings.LLM_CONCURRENCY[provider])
+            return semaphores[provider]
+
+    async def _acquire_async(self, provider: str):
+        """Take a slot on this loop's semaphore, then poll for one of the process-wide slots"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.LLM_ACQUIRE_TIMEOUT
+        loop_semaphore = self._loop_semaphore(provider)
+        try:
+            await asyncio.wait_for(loop_semaphore.acquire(), settings.LLM_ACQUIRE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise LLMBusyError(f"Too many concurrent {provider} requests")
+
+        semaphore = self._semaphore(provider)
+        try:
+            while not semaphore.acquire(blocking=False):
+                if loop.time() >= deadline:
+                    raise LLMBusyError(f"Too many concurrent {provider} requests")
+                await asyncio.sleep(self.ACQUIRE_POLL_INTERVAL)
+        except BaseException:
+            loop_semaphore.release()
+            raise
+        return loop_semaphore, semaphore
+
+    @asynccontextmanager
+    async def async_limit(self, provider: str):
+        """``limit`` for async code; waiting for a slot doesn't block the event loop or a thread.
+
+        Sync and async callers share the process-wide slots. Coroutines on the
+        same loop (under ASGI) queue on an ``asyncio.Semaphore`` for that loop
+        instead of all polling.
+        """
+        loop_semaphore, semaphore = await self._acquire_async(provider)
+        try:
+            yield
+        finally:
+            semaphore.release()
+            loop_semaphore.release()
+
+    def reset(self):
+        """Drop cached clients, e.g. after API keys change"""
+        with self._lock:
+            self._clients.clear()
+
+
+llm_clients = LLMClientRegistry()
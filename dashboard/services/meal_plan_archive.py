@@ -0,0 +1,133 @@
+# dashboard/services/meal_plan_archive.py
+import io
+import logging
+import zipfile
+from typing import Iterable, Iterator, List, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import MealPlan
+from ..tasks import generate_pdf_async
+from .meal_plan_export import meal_plan_exporter
+from .meal_plan_formats import EXPORT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable file ``zipfile`` writes into; ``take`` drains what it has written so far"""
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def take(self) -> bytes:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+
+class MealPlanArchive:
+    """A ZIP of meal plans, generated chunk by chunk as it is sent.
+
+    Each plan becomes one file, either its PDF or one of the ``EXPORT_FORMATS``
+    documents. ``zipfile`` writes to an unseekable sink, so entries carry data
+    descriptors and only one plan's file is held in memory at a time. A plan
+    that fails to render or read is logged and left out.
+
+    PDFs are never rendered while the archive streams: only stored PDFs are
+    included, the missing ones are queued with ``generate_pdf_async``, and a
+    ``PENDING_ENTRY`` lists the plans to download again later.
+    """
+
+    FORMATS = ('pdf', *EXPORT_FORMATS)
+    PENDING_ENTRY = 'PENDING.txt'
+    QUEUED_FOR = 600  # Seconds before a plan whose PDF is still missing is queued again
+
+    def __init__(self, fmt: str = 'csv'):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported archive format: {fmt}")
+        self.fmt = fmt
+
+    def filename(self) -> str:
+        return f"meal_plans_{self.fmt}.zip"
+
+    def stream(self, meal_plans: Iterable[MealPlan]) -> Iterator[bytes]:
+        sink = _ZipSink()
+        pending = []
+        with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for meal_plan in meal_plans:
+                try:
+                    contents = self._contents(meal_plan)
+                except Exception as e:
+                    logger.error(f"Leaving meal plan {meal_plan.id} out of the archive: {str(e)}", exc_info=True)
+                    continue
+                if contents is None:
+                    pending.append(meal_plan)
+                    continue
+
+                with archive.open(self._entry(meal_plan), mode='w') as entry:
+                    entry.write(contents)
+                yield from self._drain(sink)
+
+            if pending:
+                archive.writestr(self.PENDING_ENTRY, self._pending_note(pending))
+
+        # Closing the archive wrote the central directory
+        yield from self._drain(sink)
+
+    @staticmethod
+    def _drain(sink: _ZipSink) -> Iterator[bytes]:
+        chunk = sink.take()
+        if chunk:
+            yield chunk
+
+    def _entry(self, meal_plan: MealPlan) -> zipfile.ZipInfo:
+        if self.fmt == 'pdf':
+            name = meal_plan_exporter.filename(meal_plan)
+        else:
+            name = EXPORT_FORMATS[self.fmt].filename(meal_plan)
+        created = timezone.localtime(meal_plan.created_at)
+        entry = zipfile.ZipInfo(name, date_time=created.timetuple()[:6])
+        entry.compress_type = zipfile.ZIP_DEFLATED
+        return entry
+
+    def _contents(self, meal_plan: MealPlan) -> Optional[bytes]:
+        """The plan's whole file, read up front so a failing plan can be skipped; None if its PDF isn't stored yet"""
+        if self.fmt != 'pdf':
+            return ''.join(EXPORT_FORMATS[self.fmt].stream([meal_plan])).encode()
+
+        path = meal_plan_exporter.cached(meal_plan)
+        if path is None:
+            self._queue_pdf(meal_plan)
+            return None
+        with meal_plan_exporter.open(path) as file:
+            return file.read()
+
+    def _queue_pdf(self, meal_plan: MealPlan):
+        # Downloading the archive again while the PDFs render doesn't queue them twice
+        if not cache.add(f"archive_pdf_queued_{meal_plan.id}", True, self.QUEUED_FOR):
+            return
+        try:
+            generate_pdf_async.delay(meal_plan.id, meal_plan.user_id)
+        except Exception as e:
+            cache.delete(f"archive_pdf_queued_{meal_plan.id}")
+            logger.warning(f"Could not queue PDF export for meal plan {meal_plan.id}: {str(e)}")
+
+    @staticmethod
+    def _pending_note(meal_plans: List[MealPlan]) -> str:
+        lines = [
+            "These meal plans' PDFs are still being generated.",
+            "Download the archive again in a few minutes to include them:",
+            '',
+        ]
+        lines += [f"- {meal_plan.name} (plan {meal_plan.id})" for meal_plan in meal_plans]
+        return '\n'.join(lines) + '\n'
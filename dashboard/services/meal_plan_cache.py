@@ -0,0 +1,108 @@
+# dashboard/services/meal_plan_cache.py
+import copy
+import hashlib
+import json
+import logging
+import random
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class MealPlanCache:
+    """Pool of generated meal plans shared by requests with equivalent forms.
+
+    Requests are keyed on a canonical form of ``_extract_form_data`` output, so
+    e.g. a £48 and a £50 Yoruba plan for the same household land in the same
+    pool. Each pool keeps up to ``POOL_SIZE`` structured plans; once it is full
+    a random plan is served instead of calling the LLM again.
+
+    A pool is a ring of ``POOL_SIZE`` slot keys plus a counter. Each new plan
+    claims the next slot with an atomic ``incr``, so workers finishing at the
+    same time write different slots instead of overwriting each other's pool.
+    """
+
+    KEY_PREFIX = 'meal_plan_pool'
+    POOL_SIZE = 5
+    TIMEOUT = 86400  # 24 hours
+    BUDGET_BUCKET = 10  # Budgets are rounded to the nearest 10 units
+
+    @classmethod
+    def canonicalize(cls, form_data: Dict) -> Dict:
+        """Reduce form data to the fields that shape the generated plan"""
+        try:
+            amount = Decimal(str(form_data['budget']['amount']))
+        except (InvalidOperation, KeyError, TypeError):
+            amount = Decimal('0')
+
+        return {
+            'dietary_preferences': str(form_data.get('dietary_preferences', '')).strip().lower(),
+            'plan_days': cls._to_int(form_data.get('plan_days'), 7),
+            'meals_per_day': cls._to_int(form_data.get('meals_per_day'), 3),
+            'include_snacks': bool(form_data.get('include_snacks')),
+            'budget': int(round(amount / cls.BUDGET_BUCKET)) * cls.BUDGET_BUCKET,
+            'currency': str(form_data.get('budget', {}).get('currency', 'USD')).upper(),
+            'skill_level': str(form_data.get('skill_level', '')).strip().lower(),
+            'family_size': cls._to_int(form_data.get('family_size'), 4),
+            'health_goals': cls._normalize_terms(form_data.get('health_goals', '')),
+            'allergies': cls._normalize_terms(form_data.get('allergies', '')),
+        }
+
+    @classmethod
+    def key(cls, form_data: Dict) -> str:
+        canonical = json.dumps(cls.canonicalize(form_data), sort_keys=True)
+        return f"{cls.KEY_PREFIX}_{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+    @classmethod
+    def _count_key(cls, key: str) -> str:
+        return f"{key}:count"
+
+    @classmethod
+    def plans(cls, form_data: Dict) -> List[Dict]:
+        """The plans currently in the pool for ``form_data``"""
+        key = cls.key(form_data)
+        slots = cache.get_many([f"{key}:{slot}" for slot in range(cls.POOL_SIZE)])
+        return list(slots.values())
+
+    @classmethod
+    def get(cls, form_data: Dict) -> Optional[Dict]:
+        """Return a random cached plan once the pool is warm, else None"""
+        key = cls.key(form_data)
+        if (cache.get(cls._count_key(key)) or 0) < cls.POOL_SIZE:
+            return None
+        plan = cache.get(f"{key}:{random.randrange(cls.POOL_SIZE)}")
+        return copy.deepcopy(plan) if plan else None
+
+    @classmethod
+    def add(cls, form_data: Dict, meal_plan: List[Dict], grocery_list: List[str]):
+        """Store a freshly generated plan in the next slot of its pool, replacing the oldest once full"""
+        if not meal_plan:
+            return
+
+        key = cls.key(form_data)
+        count_key = cls._count_key(key)
+        cache.add(count_key, 0, cls.TIMEOUT)
+        try:
+            count = cache.incr(count_key)
+        except ValueError:  # Expired between add and incr
+            cache.add(count_key, 0, cls.TIMEOUT)
+            count = cache.incr(count_key)
+
+        slot = f"{key}:{(count - 1) % cls.POOL_SIZE}"
+        cache.set(slot, {'meal_plan': meal_plan, 'grocery_list': grocery_list}, cls.TIMEOUT)
+        logger.debug(f"Meal plan pool {key} now holds {min(count, cls.POOL_SIZE)} plans")
+
+    @staticmethod
+    def _to_int(value, default: int) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def _normalize_terms(text: str) -> List[str]:
+        return sorted({term for term in re.split(r'[\s,;/]+', str(text).lower()) if term})
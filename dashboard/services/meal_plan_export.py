@@ -0,0 +1,210 @@
+# dashboard/services/meal_plan_export.py
+import hashlib
+import json
+import logging
+from io import BytesIO
+from typing import List, Optional
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+
+from ..models import GroceryList, MealPlan
+
+logger = logging.getLogger(__name__)
+
+
+class MealPlanExporter:
+    """Meal plan PDFs, rendered once per content and kept in private storage.
+
+    Artifacts are stored as ``<plan id>/<content hash>.pdf``, the hash covering
+    everything the PDF shows, in the ``exports`` storage (see ``STORAGES``),
+    which the web process and the workers share. An unchanged plan is served
+    from the stored file; rendering happens in a worker (``generate_pdf_async``).
+    Saving or deleting a plan removes its artifacts, and a new render replaces
+    older ones.
+    """
+
+    LAYOUT_VERSION = 2  # Bump when the PDF layout changes to re-render every plan
+
+    def __init__(self, storage=None):
+        self._storage = storage
+
+    @property
+    def storage(self):
+        return self._storage or storages['exports']
+
+    @staticmethod
+    def filename(meal_plan: MealPlan) -> str:
+        return f"meal_plan_{meal_plan.id}.pdf"
+
+    @staticmethod
+    def grocery_items(meal_plan: MealPlan) -> List[str]:
+        grocery_list = GroceryList.objects.filter(user_id=meal_plan.user_id).order_by('-created_at').first()
+        if not grocery_list:
+            return []
+        return [item.strip() for item in grocery_list.items.split('\n') if item.strip()]
+
+    def artifact_path(self, meal_plan: MealPlan, grocery_items: Optional[List[str]] = None) -> str:
+        if grocery_items is None:
+            grocery_items = self.grocery_items(meal_plan)
+        content = json.dumps([
+            self.LAYOUT_VERSION,
+            meal_plan.name,
+            meal_plan.description,
+            meal_plan.created_at.isoformat(),
+            grocery_items,
+        ])
+        return f"{meal_plan.id}/{hashlib.sha256(content.encode()).hexdigest()}.pdf"
+
+    def cached(self, meal_plan: MealPlan) -> Optional[str]:
+        """Path of the stored PDF for the plan as it is now, or None"""
+        path = self.artifact_path(meal_plan)
+        return path if self.storage.exists(path) else None
+
+    def open(self, path: str):
+        return self.storage.open(path, 'rb')
+
+    def export(self, meal_plan: MealPlan) -> str:
+        """Render and store the plan's PDF unless it is already stored; returns its path"""
+        grocery_items = self.grocery_items(meal_plan)
+        path = self.artifact_path(meal_plan, grocery_items)
+        if self.storage.exists(path):
+            return path
+
+        pdf = self.render(meal_plan, grocery_items)
+        self.invalidate(meal_plan.id)
+        saved = self.storage.save(path, ContentFile(pdf))
+        if saved != path:  # Another worker stored the same render first
+            self.storage.delete(saved)
+        logger.info(f"Stored meal plan export {path}")
+        return path
+
+    def invalidate(self, meal_plan_id: int):
+        """Delete every stored PDF of a plan"""
+        directory = str(meal_plan_id)
+        try:
+            _, files = self.storage.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in files:
+            self.storage.delete(f"{directory}/{name}")
+
+    def render(self, meal_plan: MealPlan, grocery_items: List[str]) -> bytes:
+        # reportlab is only needed by the worker that renders, not at startup
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate
+
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=letter,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=72
+        )
+        doc.build(self._build_pdf_elements(meal_plan, self.table_rows(meal_plan.description), grocery_items))
+        return buffer.getvalue()
+
+    @classmethod
+    def table_rows(cls, description: str) -> List[List[str]]:
+        """``[day, meal type, meal]`` rows from a plan's JSON days, or its legacy text"""
+        try:
+            days = json.loads(description)
+        except ValueError:
+            days = None
+        if not isinstance(days, list):
+            return cls.parse_meal_plan(description)
+
+        return [
+            [day.get('day', ''), meal_type.title(), meal]
+            for day in days
+            for meal_type, meal in day.get('meals', {}).items()
+            if meal
+        ]
+
+    @staticmethod
+    def parse_meal_plan(description: str) -> List[List[str]]:
+        """Rows from a "Day N: / Meal: dish" text description"""
+        rows = []
+        current_day = None
+
+        for line in description.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+
+            if line.startswith('Day'):
+                current_day = line.split(':')[0]
+            elif ':' in line and current_day:
+                meal_type, meal = line.split(':', 1)
+                rows.append([current_day, meal_type.strip(), meal.strip()])
+
+        return rows
+
+    def _build_pdf_elements(self, meal_plan, rows, grocery_items):
+        """Build PDF elements from the meal table rows"""
+        from reportlab.lib import colors
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+        styles = getSampleStyleSheet()
+        elements = []
+
+        # Title style
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=1
+        )
+
+        # Add title
+        elements.append(Paragraph(f"Meal Plan: {meal_plan.name}", title_style))
+        elements.append(Spacer(1, 20))
+
+        # Add creation date
+        elements.append(Paragraph(
+            f"Created on: {meal_plan.created_at.strftime('%B %d, %Y')}",
+            styles['Normal']
+        ))
+        elements.append(Spacer(1, 20))
+
+        # Create meal plan table
+        table_data = [['Day', 'Meal Type', 'Meal'], *rows]
+
+        table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.green),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('PADDING', (0, 0), (-1, -1), 6),
+        ])
+
+        meal_table = Table(table_data)
+        meal_table.setStyle(table_style)
+        elements.append(meal_table)
+        elements.append(Spacer(1, 20))
+
+        # Add grocery list if available
+        if grocery_items:
+            elements.append(Paragraph("Grocery List", styles['Heading2']))
+            elements.append(Spacer(1, 10))
+
+            for item in grocery_items:
+                elements.append(Paragraph(f"• {item}", styles['Normal']))
+                elements.append(Spacer(1, 5))
+
+        return elements
+
+
+meal_plan_exporter = MealPlanExporter()
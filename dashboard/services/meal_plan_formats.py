@@ -0,0 +1,192 @@
+# dashboard/services/meal_plan_formats.py
+import csv
+import json
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, Optional
+
+from django.utils import timezone
+
+from ..models import MealPlan
+from .meal_plan_export import MealPlanExporter
+
+_DAY_NUMBER = re.compile(r'\d+')
+
+
+def normalize(meal_plan: MealPlan, start: Optional[date] = None) -> Dict:
+    """Format-independent view of a plan, with a calendar date for each day.
+
+    Day N falls N - 1 days after ``start``, which defaults to the day after
+    the plan was created. Meal types are lower-cased (``breakfast``, ``lunch``...).
+    """
+    if start is None:
+        start = timezone.localtime(meal_plan.created_at).date() + timedelta(days=1)
+
+    days = {}
+    for label, meal_type, meal in MealPlanExporter.table_rows(meal_plan.description):
+        if label not in days:
+            match = _DAY_NUMBER.search(label)
+            number = int(match.group()) if match else len(days) + 1
+            days[label] = {
+                'day': label,
+                'number': number,
+                'date': (start + timedelta(days=number - 1)).isoformat(),
+                'meals': [],
+            }
+        days[label]['meals'].append({'type': meal_type.lower(), 'meal': meal})
+
+    return {
+        'id': meal_plan.id,
+        'name': meal_plan.name,
+        'created_at': meal_plan.created_at.isoformat(),
+        'days': list(days.values()),
+    }
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line, for streaming ``csv.writer`` output"""
+
+    def write(self, value):
+        return value
+
+
+class ExportFormat:
+    """Serializes meal plans as a generator of text chunks, one or more per plan.
+
+    Plans are consumed one at a time, so a queryset ``.iterator()`` of a
+    user's whole history streams without building the document in memory.
+    """
+
+    extension = ''
+    content_type = 'text/plain'
+
+    def stream(self, meal_plans: Iterable[MealPlan], start: Optional[date] = None) -> Iterator[str]:
+        raise NotImplementedError
+
+    def filename(self, meal_plan: Optional[MealPlan] = None) -> str:
+        stem = f"meal_plan_{meal_plan.id}" if meal_plan else 'meal_plans'
+        return f"{stem}.{self.extension}"
+
+
+class CSVFormat(ExportFormat):
+    """One row per meal slot"""
+
+    extension = 'csv'
+    content_type = 'text/csv; charset=utf-8'
+    HEADER = ['plan_id', 'plan_name', 'day', 'date', 'meal_type', 'meal']
+
+    def stream(self, meal_plans, start=None):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.HEADER)
+        for meal_plan in meal_plans:
+            plan = normalize(meal_plan, start)
+            yield ''.join(
+                writer.writerow([plan['id'], plan['name'], day['day'], day['date'], meal['type'], meal['meal']])
+                for day in plan['days']
+                for meal in day['meals']
+            )
+
+
+class ICSFormat(ExportFormat):
+    """iCalendar (RFC 5545) with one event per meal slot.
+
+    Events use floating local times, so breakfast shows at 08:00 in whatever
+    timezone the calendar is in. UIDs are stable per plan, day and meal, so
+    importing a plan again updates its events instead of duplicating them.
+    """
+
+    extension = 'ics'
+    content_type = 'text/calendar; charset=utf-8'
+    MEAL_TIMES = {
+        'breakfast': time(8),
+        'lunch': time(13),
+        'snack': time(16),
+        'dinner': time(19),
+    }
+    DEFAULT_TIME = time(12)
+    DURATION = timedelta(hours=1)
+    UID_DOMAIN = 'afrimeals'
+
+    def stream(self, meal_plans, start=None):
+        stamp = timezone.now().strftime('%Y%m%dT%H%M%SZ')
+        yield self._lines([
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//Afrimeals//Meal Plans//EN',
+            'CALSCALE:GREGORIAN',
+            'X-WR-CALNAME:Afrimeals meal plans',
+        ])
+        for meal_plan in meal_plans:
+            plan = normalize(meal_plan, start)
+            yield ''.join(
+                self._event(plan, day, meal, stamp)
+                for day in plan['days']
+                for meal in day['meals']
+            )
+        yield self._lines(['END:VCALENDAR'])
+
+    def _event(self, plan, day, meal, stamp):
+        begins = datetime.combine(
+            date.fromisoformat(day['date']), self.MEAL_TIMES.get(meal['type'], self.DEFAULT_TIME)
+        )
+        return self._lines([
+            'BEGIN:VEVENT',
+            f"UID:plan-{plan['id']}-day-{day['number']}-{meal['type']}@{self.UID_DOMAIN}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{begins.strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND:{(begins + self.DURATION).strftime('%Y%m%dT%H%M%S')}",
+            f"SUMMARY:{self.escape(meal['type'].title() + ': ' + meal['meal'])}",
+            f"DESCRIPTION:{self.escape(plan['name'] + ' (' + day['day'] + ')')}",
+            'CATEGORIES:Meal plan',
+            'END:VEVENT',
+        ])
+
+    @staticmethod
+    def escape(text: str) -> str:
+        return (
+            text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n')
+        )
+
+    @classmethod
+    def _lines(cls, lines):
+        return ''.join(f"{cls.fold(line)}\r\n" for line in lines)
+
+    @staticmethod
+    def fold(line: str) -> str:
+        """Split a content line into 75-octet pieces, never inside a UTF-8 character"""
+        encoded = line.encode()
+        if len(encoded) <= 75:
+            return line
+
+        pieces, current, limit = [], b'', 75
+        for char in line:
+            char_bytes = char.encode()
+            if len(current) + len(char_bytes) > limit:
+                pieces.append(current.decode())
+                current, limit = b'', 74  # Continuation lines start with a space
+            current += char_bytes
+        pieces.append(current.decode())
+        return '\r\n '.join(pieces)
+
+
+class JSONFormat(ExportFormat):
+    """``{"meal_plans": [...]}`` of normalized plans (see ``normalize``)"""
+
+    extension = 'json'
+    content_type = 'application/json'
+
+    def stream(self, meal_plans, start=None):
+        yield '{"meal_plans": ['
+        separator = ''
+        for meal_plan in meal_plans:
+            yield separator + json.dumps(normalize(meal_plan, start))
+            separator = ', '
+        yield ']}'
+
+
+EXPORT_FORMATS = {
+    'csv': CSVFormat(),
+    'ics': ICSFormat(),
+    'json': JSONFormat(),
+}
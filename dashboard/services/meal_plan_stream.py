@@ -0,0 +1,97 @@
+# dashboard/services/meal_plan_stream.py
+import json
+from typing import Dict, List, Optional
+
+
+class MealPlanStreamParser:
+    """Incrementally parse a "MEAL PLAN: / GROCERY LIST:" completion.
+
+    Text can be fed in arbitrary chunks (e.g. tokens from a streamed chat
+    completion). Each day is returned by ``feed``/``close`` as soon as it is
+    complete, i.e. when the next ``Day N:`` line or the grocery list starts.
+    The line rules are the ones ``MealGeneratorView._structure_meal_plan`` uses.
+    """
+
+    MEAL_PLAN_MARKER = 'MEAL PLAN:'
+    GROCERY_MARKER = 'GROCERY LIST:'
+
+    def __init__(self, include_snacks: bool):
+        self.include_snacks = include_snacks
+        self.days: List[Dict] = []
+        self.grocery_list: List[str] = []
+        self.in_grocery_list = False
+        self._current_day: Optional[Dict] = None
+        self._buffer = ''
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Add streamed text and return the days completed by it"""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+
+        completed = []
+        for line in lines:
+            completed.extend(self._parse_line(line))
+        return completed
+
+    def close(self) -> List[Dict]:
+        """Flush any buffered text and return the remaining completed days"""
+        completed = self._parse_line(self._buffer)
+        self._buffer = ''
+        completed.extend(self._finish_day())
+        return completed
+
+    def _parse_line(self, line: str) -> List[Dict]:
+        if self.in_grocery_list:
+            self._add_grocery_item(line)
+            return []
+
+        completed = []
+        if self.GROCERY_MARKER in line:
+            line, grocery_text = line.split(self.GROCERY_MARKER, 1)
+            completed.extend(self._parse_meal_line(line))
+            completed.extend(self._finish_day())
+            self.in_grocery_list = True
+            self._add_grocery_item(grocery_text)
+            return completed
+
+        return self._parse_meal_line(line)
+
+    def _parse_meal_line(self, line: str) -> List[Dict]:
+        line = line.replace(self.MEAL_PLAN_MARKER, '').strip()
+        if not line:
+            return []
+
+        if line.startswith('Day'):
+            completed = self._finish_day()
+            self._current_day = {
+                'day': line.split(':')[0],
+                'meals': {
+                    'breakfast': '',
+                    'lunch': '',
+                    'snack': '' if self.include_snacks else None,
+                    'dinner': ''
+                }
+            }
+            self.days.append(self._current_day)
+            return completed
+
+        if self._current_day and ':' in line:
+            meal_type, meal = line.split(': ', 1)
+            meal_type_lower = meal_type.lower()
+            if meal_type_lower in self._current_day['meals']:
+                self._current_day['meals'][meal_type_lower] = meal
+
+        return []
+
+    def _finish_day(self) -> List[Dict]:
+        day, self._current_day = self._current_day, None
+        return [day] if day else []
+
+    def _add_grocery_item(self, line: str):
+        if line.strip():
+            self.grocery_list.append(line.strip('- ').strip())
+
+
+def sse_event(event: str, data) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,79 @@
+# dashboard/services/price_matrix.py
+import hashlib
+import json
+import logging
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import SubscriptionTier
+from ..utils.currency import CurrencyManager
+from .exchange_rates import exchange_rates
+
+logger = logging.getLogger(__name__)
+
+
+class PriceMatrix:
+    """Localized prices for every active tier and supported currency.
+
+    The matrix is rebuilt when a ``SubscriptionTier`` changes or exchange
+    rates are refreshed, and read from the cache otherwise. Each build is also
+    kept under its version for ``QUOTE_TIMEOUT`` seconds, so checkout can
+    charge exactly the price a user was shown, even if rates have moved since.
+    """
+
+    CACHE_KEY = 'price_matrix'
+    TIMEOUT = 86400  # 24 hours; rebuilt on every tier or rate change anyway
+    QUOTE_TIMEOUT = 86400  # How long a displayed price can still be checked out
+
+    @staticmethod
+    def currencies() -> List[str]:
+        return sorted(set(settings.SUPPORTED_CURRENCIES) | set(CurrencyManager.SYMBOLS))
+
+    @staticmethod
+    def tier_price(base_price, currency: str) -> Dict:
+        """Price of a GBP amount in ``currency``, in minor units and formatted"""
+        rate = Decimal(str(exchange_rates.rate(currency)))
+        amount = (Decimal(str(base_price)) * rate * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
+        symbol = CurrencyManager.SYMBOLS.get(currency) or settings.SUPPORTED_CURRENCIES.get(currency, currency)
+        return {'amount': int(amount), 'formatted': f"{symbol}{amount / 100:.2f}"}
+
+    @classmethod
+    def build(cls) -> Dict:
+        currencies = cls.currencies()
+        matrix = {
+            'tiers': {
+                str(tier.id): {currency: cls.tier_price(tier.price, currency) for currency in currencies}
+                for tier in SubscriptionTier.objects.filter(is_active=True)
+            },
+            'plans': {currency: CurrencyManager.compute_price_data(currency) for currency in currencies},
+        }
+        matrix['version'] = hashlib.sha1(json.dumps(matrix, sort_keys=True).encode()).hexdigest()[:12]
+        return matrix
+
+    @classmethod
+    def rebuild(cls) -> Dict:
+        matrix = cls.build()
+        cache.set(cls.CACHE_KEY, matrix, cls.TIMEOUT)
+        cache.set(f"{cls.CACHE_KEY}:{matrix['version']}", matrix, cls.QUOTE_TIMEOUT)
+        logger.info(f"Rebuilt price matrix {matrix['version']}")
+        return matrix
+
+    @classmethod
+    def get(cls, version: Optional[str] = None) -> Dict:
+        """The matrix a user was quoted (by ``version``), else the current one"""
+        if version:
+            matrix = cache.get(f"{cls.CACHE_KEY}:{version}")
+            if matrix is not None:
+                return matrix
+        matrix = cache.get(cls.CACHE_KEY)
+        if matrix is None:
+            matrix = cls.rebuild()
+        return matrix
+
+    @classmethod
+    def price(cls, tier_id, currency: str, version: Optional[str] = None) -> Optional[Dict]:
+        """``{'amount', 'formatted'}`` for a tier in ``currency``, or None if not offered"""
+        return cls.get(version)['tiers'].get(str(tier_id), {}).get(currency)
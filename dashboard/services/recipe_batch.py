@@ -0,0 +1,168 @@
+# dashboard/services/recipe_batch.py
+import json
+import logging
+import re
+from typing import Dict, List
+
+from django.core.cache import cache
+
+from ..models import CanonicalRecipe, Recipe
+from .llm_clients import llm_clients
+
+logger = logging.getLogger(__name__)
+
+
+def recipe_fields(recipe_data: Dict) -> Dict:
+    """Map a generated recipe JSON object onto ``Recipe`` model fields"""
+    servings = re.search(r'\d+', str(recipe_data.get('servings', '')))
+    return {
+        'title': recipe_data['title'][:100],
+        'description': recipe_data.get('description', ''),
+        'prep_time': recipe_data.get('prepTime', '30 mins'),
+        'cook_time': recipe_data.get('cookTime', '45 mins'),
+        'servings': int(servings.group()) if servings else 4,
+        'difficulty': recipe_data.get('difficulty', 'Medium'),
+        'ingredients': '\n'.join(recipe_data.get('ingredients', [])),
+        'instructions': '\n'.join(recipe_data.get('instructions', [])),
+        'nutrition_info': recipe_data.get('nutrition', {}),
+        'tips': recipe_data.get('tips', []),
+    }
+
+
+class RecipeBatchGenerator:
+    """Generate every recipe of a meal plan in a few batched Gemini calls.
+
+    Meal names are deduplicated across the plan and looked up in the shared
+    ``CanonicalRecipe`` library first, so only unseen dishes reach the LLM.
+    """
+
+    BATCH_SIZE = 6
+    MODEL = 'gemini-pro'
+
+    def __init__(self, client=None):
+        self.client = client or llm_clients.gemini()
+
+    def build_prompt(self, meal_names: List[str]) -> str:
+        dishes = '\n'.join(f'- {name}' for name in meal_names)
+        return f"""Generate a detailed recipe for each of these Nigerian dishes:
+{dishes}
+Return ONLY a JSON object with NO additional text or formatting.
+The JSON must follow this EXACT structure, with one entry per dish and
+"title" set to the dish name exactly as listed:
+{{
+    "recipes": [
+        {{
+            "title": "Dish name",
+            "description": "A detailed description of the dish and its cultural significance",
+            "prepTime": "Preparation time in minutes",
+            "cookTime": "Cooking time in minutes",
+            "servings": "Number of people it serves",
+            "difficulty": "Easy/Medium/Hard",
+            "ingredients": ["List each ingredient with exact measurements"],
+            "instructions": ["Numbered step-by-step cooking instructions"],
+            "nutrition": {{
+                "calories": "Calories per serving",
+                "protein": "Protein in grams",
+                "carbs": "Carbohydrates in grams",
+                "fat": "Fat in grams"
+            }},
+            "tips": ["Cooking tips and variations"]
+        }}
+    ]
+}}"""
+
+    def generate(self, meal_names: List[str]) -> Dict[str, Dict]:
+        """Return recipe data keyed by meal name; failed batches are skipped"""
+        recipes = {}
+        for start in range(0, len(meal_names), self.BATCH_SIZE):
+            batch = meal_names[start:start + self.BATCH_SIZE]
+            try:
+                recipes.update(self._generate_batch(batch))
+            except Exception as e:
+                logger.error(f"Batch recipe generation failed for {batch}: {str(e)}")
+        return recipes
+
+    def _generate_batch(self, meal_names: List[str]) -> Dict[str, Dict]:
+        with llm_clients.limit('gemini'):
+            response = self.client.models.generate_content(
+                model=self.MODEL,
+                contents=self.build_prompt(meal_names)
+            )
+
+        response_text = response.text.strip()
+        if response_text.startswith('```json'):
+            response_text = response_text[7:].strip()
+            if response_text.endswith('```'):
+                response_text = response_text[:-3].strip()
+
+        by_title = {
+            recipe['title'].strip().lower(): recipe
+            for recipe in json.loads(response_text).get('recipes', [])
+            if recipe.get('title')
+        }
+        return {
+            name: {**by_title[name.strip().lower()], 'title': name}
+            for name in meal_names
+            if name.strip().lower() in by_title
+        }
+
+    def pregenerate_for_meal_plan(self, meal_plan) -> int:
+        """Create ``Recipe`` rows for every meal slot that doesn't have one yet"""
+        try:
+            days = json.loads(meal_plan.description)
+        except json.JSONDecodeError:
+            logger.warning(f"Meal plan {meal_plan.id} has no structured days to pre-generate")
+            return 0
+
+        existing = set(
+            Recipe.objects.filter(meal_plan=meal_plan).values_list('day_index', 'meal_type')
+        )
+        slots = [
+            (day_index, meal_type, meal_name)
+            for day_index, day in enumerate(days)
+            for meal_type, meal_name in day.get('meals', {}).items()
+            if meal_name and (day_index, meal_type) not in existing
+        ]
+        if not slots:
+            return 0
+
+        meal_names = list(dict.fromkeys(meal_name for _, _, meal_name in slots))
+        library = self._library_recipes(meal_names)
+
+        missing = [name for name in meal_names if name not in library]
+        for meal_name, recipe_data in self.generate(missing).items():
+            library[meal_name] = CanonicalRecipe.store(meal_name, recipe_fields(recipe_data))
+
+        created = Recipe.objects.bulk_create([
+            Recipe(
+                user_id=meal_plan.user_id,
+                meal_plan=meal_plan,
+                day_index=day_index,
+                meal_type=meal_type,
+                title=meal_name[:100],
+                is_ai_generated=True,
+                **library[meal_name].recipe_fields()
+            )
+            for day_index, meal_type, meal_name in slots
+            if meal_name in library
+        ], ignore_conflicts=True)
+
+        # bulk_create skips post_save, so clear the per-user cache here
+        cache.delete(f"user_recipes_{meal_plan.user_id}")
+        logger.info(
+            f"Pre-generated {len(created)} recipes for meal plan {meal_plan.id} "
+            f"from {len(meal_names)} dishes ({len(missing)} sent to the LLM)"
+        )
+        return len(created)
+
+    def _library_recipes(self, meal_names: List[str]) -> Dict:
+        """Map meal names to existing shared recipes in one query"""
+        names_by_key = {}
+        for name in meal_names:
+            names_by_key.setdefault(CanonicalRecipe.normalize_name(name), []).append(name)
+
+        library = {}
+        for canonical in CanonicalRecipe.objects.filter(normalized_name__in=names_by_key):
+            for name in names_by_key[canonical.normalized_name]:
+                library[name] = canonical
+        return library
@@ -1,13 +1,40 @@
 # dashboard/services/store_finder.py
-from google import genai
-from django.conf import settings
+from django.core.cache import cache
+import hashlib
 import json
-import re
+import logging
+import time
+
+from ..models import Store
+from ..tasks import refresh_store_search_async
+from .llm_clients import llm_clients
+from ..utils.ingredients import nigerian_ingredients
+from ..utils.geo import KM_PER_MILE, geohash_bounds, geohash_encode, haversine_km
+
+logger = logging.getLogger(__name__)
+
 
 class StoreFinder:
-    def __init__(self):
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    """Nearby-store search over the local ``Store`` table.
+
+    Gemini fills in the ingredients a store is likely to stock offline (see
+    ``enrich_store``). Searches only ask it directly for a cell the table has
+    no store near, e.g. before ``import_stores`` has been run for an area, and
+    its answer is cached for the cell like directory results.
+    """
+
+    MAX_RESULTS = 5
+    CANDIDATES = 30  # Nearest stores considered before ranking by stock likelihood
+
+    # Results are cached per ingredient and precision-5 geohash cell (~5 x 3 km in the UK)
+    CACHE_PREFIX = 'store_search'
+    CACHE_PRECISION = 5
+    FRESH_FOR = 3600  # 1 hour
+    STALE_FOR = 86400  # Stale entries are served for up to a day while they refresh
+    FAILURE_TTL = 60  # Failed searches aren't retried for a minute
+    AFRICAN_STORE_TYPES = {'african', 'international', 'halal', 'market'}
 
+    def __init__(self):
         # Common Nigerian/African store keywords
         self.african_store_types = [
             "African Food Store",
@@ -21,75 +48,136 @@ class StoreFinder:
 
     def clean_ingredient(self, text: str) -> dict:
         """Extract ingredient details and identify if it's a Nigerian/African specific item"""
-        # Remove store suggestions in parentheses
-        clean_text = re.sub(r'\s*\([^)]*\)', '', text).strip()
-
-        # Common Nigerian/African ingredients keywords
-        nigerian_ingredients = [
-            "egusi", "ogbono", "uda", "uziza", "ehuru", "utazi", "ukazi",
-            "stockfish", "crayfish", "palm oil", "red oil", "locust beans", "iru",
-            "bitter leaf", "pounded yam", "garri", "fufu", "semolina", "efo",
-            "okra", "okro", "melon seeds", "pepper soup", "suya", "yam flour",
-            "plantain flour", "cassava flour", "ground melon", "dried fish",
-            "dried prawns", "periwinkle", "snail", "goat meat", "cow foot",
-            "cow skin", "kpomo", "dawadawa"
+        return nigerian_ingredients.classify(text)
+
+    @property
+    def client(self):
+        return llm_clients.gemini()
+
+    def likely_in_stock(self, store: Store, ingredient_info: dict) -> bool:
+        """Whether a store probably sells the ingredient, from its tags or its type"""
+        name = ingredient_info['name'].lower()
+        if any(tag in name or name in tag for tag in store.ingredient_tags):
+            return True
+        if ingredient_info['is_nigerian']:
+            return store.store_type in self.AFRICAN_STORE_TYPES
+        return store.store_type == 'supermarket'
+
+    def search_radius_km(self, ingredient_info: dict) -> float:
+        # Nigerian items are worth a longer trip to a specialist store
+        return (10 if ingredient_info['is_nigerian'] else 5) * KM_PER_MILE
+
+    def cache_key(self, cell: str, ingredient_info: dict) -> str:
+        name = ' '.join(ingredient_info['name'].lower().split())
+        return f"{self.CACHE_PREFIX}:{cell}:{hashlib.md5(name.encode()).hexdigest()}"
+
+    @staticmethod
+    def cell_center(cell: str):
+        min_lat, max_lat, min_lng, max_lng = geohash_bounds(cell)
+        return (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+    def search_cell(self, cell: str, ingredient_info: dict) -> list:
+        """Candidate stores for everyone in a geohash cell, as plain dicts.
+
+        The search is centred on the cell and widened by its half-diagonal,
+        so it covers the search radius from any point inside the cell.
+        """
+        center_lat, center_lng = self.cell_center(cell)
+        _, max_lat, _, max_lng = geohash_bounds(cell)
+        half_diagonal = float(haversine_km(center_lat, center_lng, [max_lat], [max_lng])[0])
+
+        nearby = Store.nearest(
+            center_lat, center_lng, k=self.CANDIDATES,
+            radius_km=self.search_radius_km(ingredient_info) + half_diagonal
+        )
+        return [
+            {
+                'name': store.name,
+                'type': store.get_store_type_display(),
+                'address': store.address,
+                'latitude': store.latitude,
+                'longitude': store.longitude,
+                'likely_in_stock': self.likely_in_stock(store, ingredient_info),
+            }
+            for store, _ in nearby
         ]
 
-        # Check if ingredient is Nigerian/African specific
-        is_nigerian = any(keyword in clean_text.lower() for keyword in nigerian_ingredients)
+    def refresh(self, cell: str, ingredient: str) -> dict:
+        """Recompute and cache a cell's candidates; failures are cached briefly"""
+        ingredient_info = self.clean_ingredient(ingredient)
+        key = self.cache_key(cell, ingredient_info)
+        try:
+            entry = {
+                'stores': self.search_cell(cell, ingredient_info),
+                'fresh_until': time.time() + self.FRESH_FOR,
+            }
+            if not entry['stores']:
+                # The directory doesn't cover this area, so cache Gemini's answer for the cell instead
+                lat, lng = self.cell_center(cell)
+                entry['gemini'] = self.search_with_gemini(lat, lng, ingredient_info)
+            cache.set(key, entry, self.FRESH_FOR + self.STALE_FOR)
+        except Exception as e:
+            logger.error(f"Store search failed for {cell}: {str(e)}")
+            entry = {'failed': True}
+            cache.set(key, entry, self.FAILURE_TTL)
+        cache.delete(f"{key}:refreshing")
+        return entry
 
-        return {
-            "name": clean_text,
-            "is_nigerian": is_nigerian
-        }
+    def _revalidate(self, cell: str, ingredient: str, key: str):
+        """Refresh a stale entry in the background, once per key"""
+        if not cache.add(f"{key}:refreshing", True, 60):
+            return
+        try:
+            refresh_store_search_async.delay(cell, ingredient)
+        except Exception as e:
+            cache.delete(f"{key}:refreshing")
+            logger.warning(f"Could not queue store search refresh: {str(e)}")
 
     def find_stores_for_ingredient(self, lat: float, lng: float, ingredient: str) -> dict:
         """Find stores that sell the ingredient with special handling for Nigerian items"""
+        ingredient_info = self.clean_ingredient(ingredient)
         try:
-            # Clean and analyze ingredient
-            ingredient_info = self.clean_ingredient(ingredient)
-
-            # Create location-aware prompt
-            prompt = {
-                "role": "user",
-                "parts": [{
-                    "text": f"""As a store finder specializing in African and international foods in the UK:
-                    Find stores near coordinates ({lat}, {lng}) that sell {ingredient_info['name']}.
-
-                    Requirements:
-                    {self.get_search_requirements(ingredient_info)}
-
-                    Return exactly this JSON format:
-                    {{
-                        "stores": [
-                            {{
-                                "name": "Store name",
-                                "type": "Store type (e.g. African Store, Supermarket)",
-                                "address": "Full store address",
-                                "distance": "X.X miles",
-                                "likely_in_stock": true/false
-                            }}
-                        ]
-                    }}
-
-                    Sort by:
-                    1. Likelihood of having the item
-                    2. Distance from coordinates
-                    Limit to 5 closest relevant stores."""
-                }]
-            }
+            # Requests for the same ingredient from the same area share one cache entry
+            cell = geohash_encode(lat, lng, self.CACHE_PRECISION)
+            key = self.cache_key(cell, ingredient_info)
+            entry = cache.get(key)
+            if entry is None:
+                entry = self.refresh(cell, ingredient)
+            elif not entry.get('failed') and time.time() > entry['fresh_until']:
+                self._revalidate(cell, ingredient, key)
 
-            # Get store suggestions
-            response = self.client.models.generate_content(
-                model='gemini-2.0-pro',
-                contents=prompt
+            if entry.get('failed'):
+                return self.get_fallback_data(ingredient_info['is_nigerian'])
+            if 'gemini' in entry:
+                return entry['gemini']
+
+            # Distances are always exact for this user, even on a cache hit
+            candidates = entry['stores']
+            distances = haversine_km(
+                lat, lng, [store['latitude'] for store in candidates], [store['longitude'] for store in candidates]
             )
+            radius_km = self.search_radius_km(ingredient_info)
+            ranked = sorted(
+                (
+                    (store, float(distance))
+                    for store, distance in zip(candidates, distances)
+                    if distance <= radius_km
+                ),
+                key=lambda item: (not item[0]['likely_in_stock'], item[1])
+            )[:self.MAX_RESULTS]
 
-            # Parse JSON from response
-            content = response.text
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            stores_data = json.loads(content[start:end])
+            stores_data = {
+                'stores': [
+                    {
+                        'name': store['name'],
+                        'type': store['type'],
+                        'address': store['address'],
+                        'distance': f"{distance / KM_PER_MILE:.1f} miles",
+                        'likely_in_stock': store['likely_in_stock'],
+                    }
+                    for store, distance in ranked
+                ]
+            }
 
             # Add store recommendations if needed
             if ingredient_info['is_nigerian']:
@@ -98,9 +186,52 @@ class StoreFinder:
             return stores_data
 
         except Exception as e:
-            print(f"Store finder error: {e}")
+            logger.error(f"Store finder error: {str(e)}")
             return self.get_fallback_data(ingredient_info['is_nigerian'])
 
+    def search_with_gemini(self, lat: float, lng: float, ingredient_info: dict) -> dict:
+        """Ask Gemini for stores near a point, for areas the Store table doesn't cover yet"""
+        prompt = {
+            "role": "user",
+            "parts": [{
+                "text": f"""As a store finder specializing in African and international foods in the UK:
+                Find stores near coordinates ({lat}, {lng}) that sell {ingredient_info['name']}.
+
+                Requirements:
+                {self.get_search_requirements(ingredient_info)}
+
+                Return exactly this JSON format:
+                {{
+                    "stores": [
+                        {{
+                            "name": "Store name",
+                            "type": "Store type (e.g. African Store, Supermarket)",
+                            "address": "Full store address",
+                            "distance": "X.X miles",
+                            "likely_in_stock": true/false
+                        }}
+                    ]
+                }}
+
+                Sort by:
+                1. Likelihood of having the item
+                2. Distance from coordinates
+                Limit to 5 closest relevant stores."""
+            }]
+        }
+
+        with llm_clients.limit('gemini'):
+            response = self.client.models.generate_content(
+                model='gemini-2.0-pro',
+                contents=prompt
+            )
+        content = response.text
+        stores_data = json.loads(content[content.find('{'):content.rfind('}') + 1])
+
+        if ingredient_info['is_nigerian']:
+            stores_data = self.add_store_recommendations(stores_data, lat, lng)
+        return stores_data
+
     def get_search_requirements(self, ingredient_info: dict) -> str:
         """Get search requirements based on ingredient type"""
         if ingredient_info['is_nigerian']:
@@ -120,6 +251,28 @@ class StoreFinder:
             - Note if store is likely to have the item in stock
             """
 
+    def enrich_store(self, store: Store) -> Store:
+        """Ask Gemini which ingredients a store typically stocks and save them as tags"""
+        prompt = f"""List the groceries and ingredients a UK shopper can typically buy at this store:
+        Name: {store.name}
+        Type: {store.get_store_type_display()}
+        Address: {store.address}
+
+        Focus on Nigerian and West African ingredients where relevant.
+        Return only a JSON array of lowercase ingredient names, e.g. ["palm oil", "egusi", "garri"]."""
+
+        with llm_clients.limit('gemini'):
+            response = self.client.models.generate_content(
+                model='gemini-2.0-pro',
+                contents=prompt
+            )
+        content = response.text
+        tags = json.loads(content[content.find('['):content.rfind(']') + 1])
+
+        store.ingredient_tags = [str(tag) for tag in tags]
+        store.save()
+        return store
+
     def add_store_recommendations(self, data: dict, lat: float, lng: float) -> dict:
         """Add helpful recommendations for Nigerian ingredients"""
         if not data.get('stores'):
@@ -1,7 +1,10 @@
 # dashboard/signals.py
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import UserActivity
+from .models import MealPlan, SubscriptionTier, UserActivity
+from .services.meal_plan_export import meal_plan_exporter
+from .services.price_matrix import PriceMatrix
 
 @receiver(user_logged_in)
 def user_logged_in_callback(sender, request, user, **kwargs):
@@ -19,4 +22,12 @@ def user_logged_out_callback(sender, request, user, **kwargs):
             user=user,
             action='logout',
             details={'ip': request.META.get('REMOTE_ADDR', '')}
-        )
\ No newline at end of file
+        )
+
+@receiver([post_save, post_delete], sender=SubscriptionTier)
+def rebuild_price_matrix(sender, instance, **kwargs):
+    PriceMatrix.rebuild()
+
+@receiver([post_save, post_delete], sender=MealPlan)
+def invalidate_meal_plan_exports(sender, instance, **kwargs):
+    meal_plan_exporter.invalidate(instance.id)
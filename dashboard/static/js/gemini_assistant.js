@@ -2,6 +2,11 @@
 class GeminiAssistant {
     constructor() {
         this.baseUrl = '/api/gemini';
+        // Replies only stream when the page is served over ASGI; under WSGI use the plain JSON endpoint
+        const widget = document.getElementById('gemini-chat-widget');
+        this.streaming = Boolean(
+            widget && widget.dataset.streaming === 'true' && window.ReadableStream && window.TextDecoder
+        );
         this.setupEventListeners();
     }
 
@@ -24,6 +29,49 @@ class GeminiAssistant {
         }
     }
 
+    // Stream the reply over Server-Sent Events; onHtml gets the formatted reply so far
+    async streamChat(message, onHtml) {
+        const response = await fetch(`${this.baseUrl}/chat/stream/`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': this.getCsrfToken()
+            },
+            body: JSON.stringify({ message })
+        });
+
+        if (!response.ok) throw new Error('Failed to get response');
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let html = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+
+            for (const rawEvent of events) {
+                const eventName = rawEvent.match(/^event: (.*)$/m);
+                const eventData = rawEvent.match(/^data: (.*)$/m);
+                if (!eventName || !eventData) continue;
+
+                const payload = JSON.parse(eventData[1]);
+                if (eventName[1] === 'html') {
+                    html += payload.html;
+                    onHtml(html);
+                } else if (eventName[1] === 'error') {
+                    throw new Error(payload.error);
+                }
+            }
+        }
+        return html;
+    }
+
     setupEventListeners() {
         const chatToggle = document.getElementById('chat-toggle');
         const closeChat = document.getElementById('close-chat');
@@ -60,11 +108,24 @@ class GeminiAssistant {
                 chatInput.value = '';
                 chatInput.focus();
 
+                let messageBody = null;
                 try {
                     this.showTypingIndicator();
-                    const response = await this.chat(message);
+                    if (!this.streaming) {
+                        const response = await this.chat(message);
+                        this.removeTypingIndicator();
+                        this.addMessage('assistant', response.message);
+                        return;
+                    }
+                    await this.streamChat(message, (html) => {
+                        if (!messageBody) {
+                            this.removeTypingIndicator();
+                            messageBody = this.addStreamingMessage();
+                        }
+                        messageBody.innerHTML = html;
+                        this.scrollToBottom();
+                    });
                     this.removeTypingIndicator();
-                    this.addMessage('assistant', response.message);
                 } catch (error) {
                     console.error('Chat error:', error);
                     this.removeTypingIndicator();
@@ -173,6 +234,25 @@ class GeminiAssistant {
         this.scrollToBottom();
     }
 
+    // Empty assistant bubble whose body is filled in as the reply streams
+    addStreamingMessage() {
+        const chatMessages = document.getElementById('chat-messages');
+        const messageDiv = document.createElement('div');
+        messageDiv.className = 'flex items-start mb-4';
+        messageDiv.innerHTML = `
+            <div class="flex items-start space-x-2 max-w-[80%]">
+                <div class="flex-shrink-0">
+                    <div class="h-8 w-8 rounded-full bg-green-100 flex items-center justify-center">
+                        <i class="fas fa-robot text-green-600"></i>
+                    </div>
+                </div>
+                <div class="message-body bg-white border border-gray-200 rounded-2xl rounded-tl-none px-4 py-2 shadow-sm text-sm"></div>
+            </div>
+        `;
+        chatMessages.appendChild(messageDiv);
+        return messageDiv.querySelector('.message-body');
+    }
+
     formatAssistantMessage(content) {
         // First, clean up any malformed HTML
         content = content.replace(/(<\/?div[^>]*>|<\/?em>|<\/?a[^>]*>)/g, '');
@@ -329,6 +329,12 @@ class PDFExportHandler {
             if (!response.ok) {
                 throw new Error(`Server returned ${response.status}: ${response.statusText}`);
             }
+
+            // Plans exported before come straight back as the stored PDF
+            if ((response.headers.get('Content-Type') || '').startsWith('application/pdf')) {
+                this.handlePDFSuccess({ blob: await response.blob(), filename: `meal_plan_${mealPlanId}.pdf` }, button, originalText);
+                return;
+            }
             
             const data = await response.json();
 
@@ -338,8 +344,6 @@ class PDFExportHandler {
                     (result) => this.handlePDFSuccess(result, button, originalText),
                     (error) => this.handlePDFError(error, button, originalText)
                 ).start();
-            } else if (data.pdf_data) {
-                this.handlePDFSuccess(data, button, originalText);
             } else {
                 throw new Error('Invalid response from server');
             }
@@ -356,9 +360,14 @@ class PDFExportHandler {
             button.setAttribute('aria-busy', 'false');
         }
         
-        // Create a blob from the PDF data
-        const blob = new Blob([this.base64ToArrayBuffer(result.pdf_data)], { type: 'application/pdf' });
-        const url = window.URL.createObjectURL(blob);
+        // Rendered in the background: the export URL now serves the stored file
+        if (result.download_url) {
+            window.location.href = result.download_url;
+            this.toast.success('PDF successfully generated and downloaded!');
+            return;
+        }
+
+        const url = window.URL.createObjectURL(result.blob);
         
         // Create and click a temporary download link
         const link = document.createElement('a');
@@ -381,15 +390,6 @@ class PDFExportHandler {
         }
         this.toast.error(error);
     }
-
-    base64ToArrayBuffer(base64) {
-        const binaryString = window.atob(base64);
-        const bytes = new Uint8Array(binaryString.length);
-        for (let i = 0; i < binaryString.length; i++) {
-            bytes[i] = binaryString.charCodeAt(i);
-        }
-        return bytes.buffer;
-    }
 }
 
 // Recipe Processing Handler
@@ -0,0 +1,24 @@
+# dashboard/test_runner.py
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class AfrimealsTestRunner(DiscoverRunner):
+    """Runs the tests with an in-memory shared cache tier instead of Redis or the on-disk cache"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_override = override_settings(CACHES={
+            **settings.CACHES,
+            'shared': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'afrimeals-test',
+                'TIMEOUT': 300,
+            },
+        })
+        self._cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_override.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,109 @@
+# dashboard/tests/test_chat_cache.py
+import json
+import time
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.test import TestCase
+from django.urls import reverse
+from unittest.mock import patch
+
+from dashboard.services.chat_cache import ChatResponseCache, chat_cache
+from dashboard.services.gemini_assistant import GeminiAssistant
+
+
+class ChatResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache = ChatResponseCache()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_key_is_stable_and_normalized(self):
+        """Test casing, spacing and trailing punctuation variants share a key"""
+        key = ChatResponseCache.key('Where can I buy egusi in Leeds?')
+
+        self.assertEqual(key, ChatResponseCache.key('  where can i buy   egusi in leeds'))
+        self.assertNotEqual(key, ChatResponseCache.key('Where can I buy egusi in York?'))
+        self.assertRegex(key, r'^chat_response_[0-9a-f]{64}$')
+
+    def test_answers_are_shared_between_workers(self):
+        """Test another process's cache finds an answer in the shared tier"""
+        self.cache.set('egusi?', {'success': True, 'message': 'Try Afro Foods'})
+
+        other_worker = ChatResponseCache()
+        self.assertEqual(other_worker.get('Egusi'), {'success': True, 'message': 'Try Afro Foods'})
+        self.assertIsNone(other_worker.get('ogbono'))
+        other_worker.get('egusi')
+
+        self.assertEqual(other_worker.stats(), {
+            'local_hits': 1, 'shared_hits': 1, 'misses': 1, 'local_entries': 1
+        })
+
+    def test_lookups_are_counted_in_batches(self):
+        """Test hits don't write to the shared tier until the counts are flushed"""
+        self.cache.set('egusi', {'message': 'Try Afro Foods'})
+
+        with patch.object(caches['shared'], 'incr') as mock_incr:
+            for _ in range(5):
+                self.cache.get('egusi')
+            mock_incr.assert_not_called()
+
+        self.assertEqual(self.cache.stats()['local_hits'], 5)
+
+    def test_paid_tiers_get_fresher_answers(self):
+        """Test an answer too old for a subscriber's tier is a miss for them only"""
+        self.cache.set('egusi', {'message': 'Try Afro Foods'})
+        two_hours_later = time.time() + 2 * 3600
+
+        with patch('dashboard.services.chat_cache.time.time', return_value=two_hours_later):
+            self.assertEqual(self.cache.get('egusi'), {'message': 'Try Afro Foods'})
+            self.assertEqual(ChatResponseCache().get('egusi', 'one_time'), {'message': 'Try Afro Foods'})
+            self.assertIsNone(self.cache.get('egusi', 'weekly'))
+
+    def test_local_tier_evicts_least_recently_used(self):
+        """Test the in-process tier stays within its size bound"""
+        with patch.object(ChatResponseCache, 'LOCAL_MAX_ENTRIES', 2):
+            self.cache.set('one', {'message': '1'})
+            self.cache.set('two', {'message': '2'})
+            self.cache.get('one')
+            self.cache.set('three', {'message': '3'})
+
+        self.assertEqual(len(self.cache._local), 2)
+        self.assertNotIn(ChatResponseCache.key('two'), self.cache._local)
+        self.assertEqual(self.cache.get('two'), {'message': '2'})  # Still in the shared tier
+
+
+class ChatEndpointCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        chat_cache.clear_local()
+        User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+
+    def tearDown(self):
+        cache.clear()
+        chat_cache.clear_local()
+
+    def _post(self, message):
+        response = self.client.post(
+            reverse('gemini_chat'), json.dumps({'message': message}), content_type='application/json'
+        )
+        return json.loads(response.content)
+
+    @patch('dashboard.api.gemini_views.gemini.chat', return_value='Try Afro Foods on Harehills Road')
+    def test_common_question_served_without_gemini(self, mock_chat):
+        """Test a rephrased repeat of a question doesn't call Gemini again"""
+        first = self._post('Where can I buy egusi in Leeds?')
+        second = self._post('where can i buy egusi in leeds')
+
+        self.assertEqual(first, second)
+        mock_chat.assert_called_once()
+
+    @patch('dashboard.api.gemini_views.gemini.chat', return_value=GeminiAssistant.ERROR_MESSAGE)
+    def test_errors_are_not_cached(self, mock_chat):
+        """Test a failed answer is retried on the next request"""
+        self._post('egusi')
+        self._post('egusi')
+
+        self.assertEqual(mock_chat.call_count, 2)
@@ -0,0 +1,83 @@
+# dashboard/tests/test_exchange_rates.py
+import json
+from decimal import Decimal
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import MagicMock, patch
+
+from dashboard.models import ExchangeRate
+from dashboard.services.exchange_rates import exchange_rates, refresh_exchange_rates
+from dashboard.utils.currency import CurrencyManager
+from dashboard.services.price_matrix import PriceMatrix
+
+
+def api_response(payload):
+    response = MagicMock(status_code=200)
+    response.json.return_value = payload
+    return response
+
+
+@override_settings(CURRENCY_API_KEY='test-key')
+class ExchangeRateRefreshTest(TestCase):
+    def tearDown(self):
+        exchange_rates.reload()
+
+    @patch('dashboard.services.exchange_rates.http_client.get')
+    def test_refresh_upserts_rates(self, mock_get):
+        """Test a refresh stores every rate and overwrites old ones"""
+        ExchangeRate.objects.create(currency='USD', rate=Decimal('1.10'), source='old')
+        mock_get.return_value = api_response({'data': {'USD': 1.27, 'NGN': 2050.5}})
+
+        self.assertEqual(refresh_exchange_rates(), 2)
+
+        usd = ExchangeRate.objects.get(currency='USD')
+        self.assertEqual(usd.rate, Decimal('1.27'))
+        self.assertEqual(usd.source, 'freecurrencyapi')
+        self.assertEqual(exchange_rates.rate('NGN'), 2050.5)
+
+    @patch('dashboard.services.exchange_rates.http_client.get')
+    def test_refresh_falls_back_to_next_provider(self, mock_get):
+        """Test a failing provider doesn't stop the refresh"""
+        mock_get.side_effect = [Exception('down'), api_response({'rates': {'EUR': 1.19}})]
+
+        refresh_exchange_rates()
+
+        self.assertEqual(ExchangeRate.objects.get(currency='EUR').source, 'exchangerate-api')
+
+
+class ExchangeRateSnapshotTest(TestCase):
+    def setUp(self):
+        ExchangeRate.objects.create(currency='USD', rate=Decimal('1.25'), source='test')
+        ExchangeRate.objects.create(currency='EUR', rate=Decimal('1.20'), source='test')
+        exchange_rates.reload()
+
+    def tearDown(self):
+        ExchangeRate.objects.all().delete()
+        exchange_rates.reload()
+
+    def test_lookups_are_served_from_memory(self):
+        """Test rate lookups don't touch the database once loaded"""
+        with self.assertNumQueries(0):
+            self.assertEqual(exchange_rates.rate('usd'), 1.25)
+            self.assertAlmostEqual(exchange_rates.rate('USD', base='EUR'), 1.25 / 1.20)
+            self.assertEqual(exchange_rates.rate('XYZ'), 1.0)
+
+    def test_fallback_rates_fill_gaps(self):
+        """Test currencies missing from the table use the fallback rates"""
+        self.assertEqual(exchange_rates.rate('NGN'), 583.0)
+
+    @patch('dashboard.utils.http_client.OutboundHTTPClient.request')
+    def test_all_rate_paths_agree_without_upstream_calls(self, mock_request):
+        """Test the API, CurrencyManager and checkout prices use the same rates"""
+        response = self.client.get(reverse('exchange_rates'), {'currencies': 'USD,EUR'})
+
+        self.assertEqual(json.loads(response.content), {'data': {'USD': 1.25, 'EUR': 1.2}})
+        self.assertEqual(CurrencyManager.get_exchange_rates()['USD'], 1.25)
+        self.assertEqual(PriceMatrix.tier_price(Decimal('10.00'), 'USD')['amount'], 1250)
+        mock_request.assert_not_called()
+
+    def test_unknown_base_currency(self):
+        """Test an unknown base currency is rejected"""
+        response = self.client.get(reverse('exchange_rates'), {'base_currency': 'XYZ'})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,126 @@
+# dashboard/tests/test_gemini_chat_stream.py
+import asyncio
+import json
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from unittest.mock import MagicMock, patch
+
+from dashboard.services.chat_cache import chat_cache
+from dashboard.services.llm_clients import LLMClientRegistry
+from dashboard.utils.response_formatter import response_formatter
+
+REPLY = 'NAIJAPLATE: Egusi Soup\n\nI. Ingredients\n* Ground egusi\n* Palm oil\n'
+
+
+class LoopBoundGeminiClient:
+    """Stand-in for an async SDK client whose connections belong to the loop it was built on"""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        self.models = MagicMock(generate_content_stream=self.generate_content_stream)
+
+    async def generate_content_stream(self, model, contents):
+        if self.closed or asyncio.get_running_loop() is not self.loop or self.loop.is_closed():
+            raise RuntimeError('Event loop is closed')
+
+        async def chunks():
+            yield MagicMock(text=REPLY)
+        return chunks()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class GeminiChatStreamTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        chat_cache.clear_local()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+
+    def tearDown(self):
+        cache.clear()
+        chat_cache.clear_local()
+
+    def _read_events(self, response):
+        body = b''.join(response).decode()
+        events = []
+        for raw_event in body.strip().split('\n\n'):
+            name, data = raw_event.split('\n')
+            events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+        return events
+
+    def _post(self, message='How do I make egusi?'):
+        return self.client.post(
+            reverse('gemini_chat_stream'), json.dumps({'message': message}), content_type='application/json'
+        )
+
+    @patch('dashboard.api.gemini_views.gemini.stream_chat')
+    def test_streams_formatted_lines_then_complete(self, mock_stream):
+        """Test lines are sent as they complete and add up to the formatted reply"""
+        async def fake_stream(message):
+            for i in range(0, len(REPLY), 7):
+                yield REPLY[i:i + 7]
+        mock_stream.side_effect = fake_stream
+
+        response = self._post()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self._read_events(response)
+
+        self.assertEqual(events[-1], ('complete', {'success': True}))
+        fragments = [data['html'] for name, data in events if name == 'html']
+        self.assertGreater(len(fragments), 2)
+        self.assertEqual(''.join(fragments), response_formatter.format(REPLY))
+
+    @patch('dashboard.api.gemini_views.gemini.stream_chat')
+    def test_reply_is_cached(self, mock_stream):
+        """Test a repeated question is answered from cache in one event"""
+        async def fake_stream(message):
+            yield REPLY
+        mock_stream.side_effect = fake_stream
+
+        self._read_events(self._post())
+        events = self._read_events(self._post())
+
+        self.assertEqual([name for name, _ in events], ['html', 'complete'])
+        self.assertEqual(events[0][1]['html'], response_formatter.format(REPLY))
+        mock_stream.assert_called_once()
+
+    @patch('dashboard.api.gemini_views.gemini.stream_chat')
+    def test_error_event_on_failure(self, mock_stream):
+        """Test a failing stream ends with an error event"""
+        async def failing_stream(message):
+            raise Exception('API down')
+            yield
+        mock_stream.side_effect = failing_stream
+
+        events = self._read_events(self._post())
+
+        self.assertEqual(events[-1][0], 'error')
+        self.assertFalse(events[-1][1]['success'])
+
+    def test_consecutive_streams_in_separate_event_loops(self):
+        """Test each streamed request gets a client for its own async_to_sync loop"""
+        clients = []
+
+        def factory():
+            clients.append(LoopBoundGeminiClient())
+            return clients[-1]
+
+        with patch.dict(LLMClientRegistry.ASYNC_FACTORIES, {'gemini': factory}):
+            first = self._read_events(self._post('How do I make egusi?'))
+            second = self._read_events(self._post('How do I make ogbono?'))
+
+        self.assertEqual(first[-1], ('complete', {'success': True}))
+        self.assertEqual(second[-1], ('complete', {'success': True}))
+        self.assertEqual(len(clients), 2)
+        self.assertIsNot(clients[0].loop, clients[1].loop)
+        self.assertTrue(all(client.closed for client in clients))
+
+    def test_message_required(self):
+        """Test an empty message is rejected"""
+        self.assertEqual(self._post('').status_code, 400)
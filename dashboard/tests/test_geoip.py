@@ -0,0 +1,83 @@
+# dashboard/tests/test_geoip.py
+import os
+import tempfile
+from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from unittest.mock import MagicMock, patch
+
+from dashboard.utils.currency import CurrencyManager
+from dashboard.utils.geoip import IPCountryDatabase, IPCurrencyResolver, build_ip_country_db
+
+RANGES_CSV = '''start_ip,end_ip,country
+81.2.69.0,81.2.69.255,GB
+41.58.0.0,41.58.127.255,NG
+41.58.128.0,41.58.255.255,NG
+8.8.8.0,8.8.8.255,US
+2001:4860::,2001:4860:ffff:ffff:ffff:ffff:ffff:ffff,US
+'''
+
+
+class IPCurrencyResolverTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmpdir.name, 'ip_country.csv')
+        self.db_path = os.path.join(self.tmpdir.name, 'ip_country.npy')
+        with open(self.csv_path, 'w') as f:
+            f.write(RANGES_CSV)
+        build_ip_country_db(self.csv_path, self.db_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        cache.clear()
+
+    def resolver(self, api_fallback=False):
+        return IPCurrencyResolver(self.db_path, api_fallback=api_fallback)
+
+    def test_build_merges_adjacent_ranges(self):
+        """Test IPv6 rows are skipped and contiguous same-country ranges merged"""
+        self.assertEqual(build_ip_country_db(self.csv_path, self.db_path), 3)
+
+        db = IPCountryDatabase(self.db_path)
+        self.assertEqual(db.lookup(int.from_bytes(bytes([41, 58, 200, 1]), 'big')), 'NG')
+        self.assertIsNone(db.lookup(int.from_bytes(bytes([81, 2, 70, 1]), 'big')))
+
+    def test_offline_lookup(self):
+        """Test addresses in the table resolve without a network call"""
+        resolver = self.resolver(api_fallback=True)
+
+        with patch('dashboard.utils.geoip.http_client.get') as mock_get:
+            self.assertEqual(resolver.currency_for_ip('41.58.3.4'), 'NGN')
+            self.assertEqual(resolver.currency_for_ip('81.2.69.160'), 'GBP')
+            self.assertEqual(resolver.currency_for_ip('::ffff:8.8.8.8'), 'USD')
+            self.assertEqual(resolver.currency_for_ip('127.0.0.1', default='GBP'), 'GBP')
+            mock_get.assert_not_called()
+
+    @patch('dashboard.utils.geoip.http_client.get')
+    def test_api_fallback_for_uncovered_addresses(self, mock_get):
+        """Test the API is only asked about addresses the table misses, once each"""
+        mock_get.return_value = MagicMock(status_code=200, text='CA\n')
+        resolver = self.resolver(api_fallback=True)
+
+        self.assertEqual(resolver.currency_for_ip('24.48.0.1'), 'CAD')
+        self.assertEqual(resolver.currency_for_ip('24.48.0.1'), 'CAD')
+        mock_get.assert_called_once_with('https://ipapi.co/24.48.0.1/country/')
+
+        self.assertIsNone(self.resolver(api_fallback=False).currency_for_ip('24.48.0.2'))
+
+    def test_missing_database_disables_offline_lookup(self):
+        """Test a missing table leaves only the fallback and isn't compiled at runtime"""
+        os.remove(self.db_path)
+
+        with self.settings(GEOIP_CSV_PATH=self.csv_path):
+            self.assertEqual(self.resolver().currency_for_ip('41.58.3.4', default='GBP'), 'GBP')
+        self.assertFalse(os.path.exists(self.db_path))
+
+    def test_currency_manager_uses_client_ip(self):
+        """Test CurrencyManager resolves the visitor's IP, not the server's"""
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='41.58.3.4, 10.0.0.1')
+        request.session = {}
+
+        with patch('dashboard.utils.currency.ip_currency', self.resolver()):
+            self.assertEqual(CurrencyManager.get_user_currency(request), 'NGN')
+        self.assertEqual(request.session['user_currency'], 'NGN')
@@ -0,0 +1,72 @@
+# dashboard/tests/test_http_client.py
+import requests
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock, patch
+
+from dashboard.utils.http_client import CircuitOpenError, OutboundHTTPClient
+
+
+def response(status_code):
+    return MagicMock(status_code=status_code)
+
+
+@patch('dashboard.utils.http_client.time.sleep')
+class OutboundHTTPClientTest(SimpleTestCase):
+    def setUp(self):
+        self.client = OutboundHTTPClient()
+        self.session_request = patch.object(self.client.session, 'request').start()
+        self.addCleanup(patch.stopall)
+
+    def test_host_timeout_is_applied(self, mock_sleep):
+        """Test every call gets the host's timeout unless one is given"""
+        self.session_request.return_value = response(200)
+
+        self.client.get('https://ipapi.co/json/')
+        self.client.get('https://example.com/', timeout=9)
+
+        self.assertEqual(self.session_request.call_args_list[0].kwargs['timeout'], (2, 3))
+        self.assertEqual(self.session_request.call_args_list[1].kwargs['timeout'], 9)
+
+    def test_retries_server_errors_with_backoff(self, mock_sleep):
+        """Test idempotent requests are retried after 5xx responses"""
+        self.session_request.side_effect = [response(503), response(200)]
+
+        result = self.client.get('https://api.freecurrencyapi.com/v1/latest')
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(self.session_request.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    def test_post_is_not_retried(self, mock_sleep):
+        """Test non-idempotent requests are sent once"""
+        self.session_request.return_value = response(503)
+
+        self.assertEqual(self.client.post('https://example.com/').status_code, 503)
+        self.assertEqual(self.session_request.call_count, 1)
+
+    def test_connection_errors_raise_after_retries(self, mock_sleep):
+        """Test connection errors are retried, then raised to the caller"""
+        self.session_request.side_effect = requests.ConnectionError('down')
+
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get('https://ipapi.co/json/')
+        self.assertEqual(self.session_request.call_count, 1 + OutboundHTTPClient.MAX_RETRIES)
+
+    def test_circuit_opens_after_repeated_failures(self, mock_sleep):
+        """Test a failing host is short-circuited without network calls"""
+        self.session_request.side_effect = requests.Timeout('slow')
+        with self.assertRaises(requests.Timeout):
+            self.client.get('https://ipapi.co/json/')
+        # The breaker trips partway through the second call's retries
+        with self.assertRaises(CircuitOpenError):
+            self.client.get('https://ipapi.co/json/')
+        self.assertEqual(self.session_request.call_count, 5)
+
+        with self.assertRaises(CircuitOpenError):
+            self.client.get('https://ipapi.co/json/')
+        self.assertEqual(self.session_request.call_count, 5)
+
+        # Other hosts are unaffected
+        self.session_request.side_effect = None
+        self.session_request.return_value = response(200)
+        self.assertEqual(self.client.get('https://example.com/').status_code, 200)
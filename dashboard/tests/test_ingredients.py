@@ -0,0 +1,55 @@
+# dashboard/tests/test_ingredients.py
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+
+from dashboard.models import GroceryList
+from dashboard.services.store_finder import StoreFinder
+from dashboard.utils.ingredients import nigerian_ingredients
+
+
+class IngredientMatcherTest(TestCase):
+    def test_classify_matches_whole_words(self):
+        """Test keywords match words and plurals, not fragments of other words"""
+        self.assertTrue(nigerian_ingredients.classify('2 bunches of OKRAS')['is_nigerian'])
+        self.assertTrue(nigerian_ingredients.classify('Red  oil (African store)')['is_nigerian'])
+        self.assertFalse(nigerian_ingredients.classify('Pseudo-grain rice')['is_nigerian'])
+
+    def test_classify_many_maps_matches_to_items(self):
+        """Test a batch is classified in one pass with matches on the right items"""
+        items = ['500g Egusi (ground)', 'Basmati rice', 'Palm', 'oil', 'Stockfish', 'Onions'] * 10
+
+        results = nigerian_ingredients.classify_many(items)
+
+        self.assertEqual(len(results), 60)
+        self.assertEqual(
+            [r['is_nigerian'] for r in results[:6]],
+            [True, False, False, False, True, False]
+        )
+        self.assertEqual(results[0]['name'], '500g Egusi')
+        self.assertEqual(results[0]['text'], '500g Egusi (ground)')
+        self.assertEqual(results, [dict(nigerian_ingredients.classify(i), text=i) for i in items])
+
+    def test_store_finder_uses_matcher(self):
+        """Test StoreFinder.clean_ingredient keeps its result shape"""
+        self.assertEqual(
+            StoreFinder().clean_ingredient('Ogbono seeds (Afro shop)'),
+            {'name': 'Ogbono seeds', 'is_nigerian': True}
+        )
+
+
+class ShoppingListTaggingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+        GroceryList.objects.create(user=self.user, items='Garri (2kg)\nTomatoes')
+
+    def test_shopping_list_tags_african_store_items(self):
+        """Test the shopping list marks items needing an African store"""
+        response = self.client.get(reverse('shopping_list'))
+
+        self.assertEqual(
+            [(item['text'], item['is_nigerian']) for item in response.context['items']],
+            [('Garri (2kg)', True), ('Tomatoes', False)]
+        )
+        self.assertContains(response, 'African store', count=1)
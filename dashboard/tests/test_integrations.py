@@ -17,13 +17,11 @@ class OpenAIIntegrationTest(TestCase):
             password='testpassword'
         )
 
-    @patch('dashboard.tasks.client.completions.create')
+    @patch('dashboard.views.MealGeneratorView._generate_with_openai')
     def test_meal_plan_generation(self, mock_openai):
         """Test meal plan generation with OpenAI"""
         # Setup mock OpenAI response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].text = """MEAL PLAN:
+        mock_openai.return_value = """MEAL PLAN:
         Day 1:
         Breakfast: Jollof rice with fried eggs
         Lunch: Egusi soup with pounded yam
@@ -36,16 +34,14 @@ class OpenAIIntegrationTest(TestCase):
         - Egusi seeds
         - Beef
         - Plantains"""
-        mock_openai.return_value = mock_response
 
-        # Test form data
+        # Test form data (raw meal generator form fields)
         form_data = {
-            'dietary_preferences': 'Nigerian',
-            'preferred_cuisine': 'West African',
+            'dietary_preferences': 'yoruba_traditional',
             'meals_per_day': '3',
-            'include_snacks': False,
             'plan_days': '1',
-            'budget': 'moderate',
+            'budget': '50',
+            'currency': 'GBP',
             'skill_level': 'Intermediate',
             'family_size': '4'
         }
@@ -53,21 +49,36 @@ class OpenAIIntegrationTest(TestCase):
         # Call the task directly
         result = generate_meal_plan_async(self.user.id, form_data)
 
-        # Verify result
+        # Verify result matches the structured MealGeneratorView payload
         self.assertTrue(result['success'])
-        self.assertIn('meal_plan_id', result)
-        self.assertIn('grocery_list', result)
+        self.assertEqual(result['generated_by'], 'openai')
+        self.assertEqual(result['user_id'], self.user.id)
+        self.assertEqual(len(result['meal_plan']), 1)
+        self.assertEqual(result['meal_plan'][0]['day'], 'Day 1')
+        self.assertEqual(len(result['grocery_list']), 6)
 
         # Verify database objects
-        self.assertTrue(MealPlan.objects.filter(user=self.user).exists())
+        meal_plan = MealPlan.objects.get(id=result['meal_plan_id'], user=self.user)
+        self.assertEqual(len(json.loads(meal_plan.description)), 1)
         self.assertTrue(GroceryList.objects.filter(user=self.user).exists())
 
-        # Verify OpenAI was called with expected parameters
+        # Verify OpenAI was called with the view's prompt
         mock_openai.assert_called_once()
-        call_args = mock_openai.call_args[1]
-        self.assertEqual(call_args['model'], 'gpt-3.5-turbo-instruct')
-        self.assertIn('Nigerian', call_args['prompt'])
-        self.assertIn('West African', call_args['prompt'])
+        prompt = mock_openai.call_args[0][0]
+        self.assertIn('yoruba_traditional', prompt)
+        self.assertIn('Yoruba', prompt)
+        self.assertIn('£50', prompt)
+
+    @patch('dashboard.views.MealGeneratorView._generate_with_openai')
+    def test_meal_plan_generation_falls_back(self, mock_openai):
+        """Test the task returns the fallback plan when OpenAI fails"""
+        mock_openai.side_effect = Exception('API down')
+
+        result = generate_meal_plan_async(self.user.id, {'plan_days': '2', 'meals_per_day': '3'})
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['generated_by'], 'fallback')
+        self.assertEqual(len(result['meal_plan']), 2)
 
 class StripeIntegrationTest(TestCase):
     @classmethod
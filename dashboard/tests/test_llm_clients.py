@@ -0,0 +1,74 @@
+# dashboard/tests/test_llm_clients.py
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import MagicMock, patch
+
+from dashboard.services.llm_clients import LLMBusyError, LLMClientRegistry
+
+
+@override_settings(LLM_CONCURRENCY={'openai': 1, 'gemini': 2}, LLM_ACQUIRE_TIMEOUT=0.01)
+class LLMClientRegistryTest(SimpleTestCase):
+    def setUp(self):
+        self.registry = LLMClientRegistry()
+
+    def test_clients_are_built_lazily_and_reused(self):
+        """Test each client is constructed once, on first use"""
+        factory = MagicMock()
+        with patch.dict(LLMClientRegistry.FACTORIES, {'gemini': factory}):
+            factory.assert_not_called()
+            first = self.registry.gemini()
+            second = self.registry.gemini()
+
+        self.assertIs(first, second)
+        factory.assert_called_once()
+
+    def test_limit_rejects_calls_beyond_concurrency(self):
+        """Test a provider's calls wait for a free slot and give up when none frees"""
+        with self.registry.limit('openai'):
+            with self.assertRaises(LLMBusyError):
+                with self.registry.limit('openai'):
+                    pass
+
+        with self.registry.limit('openai'):
+            pass  # The slot was released
+
+    def test_providers_have_separate_limits(self):
+        """Test a busy provider doesn't block another"""
+        with self.registry.limit('openai'), self.registry.limit('gemini'), self.registry.limit('gemini'):
+            with self.assertRaises(LLMBusyError):
+                with self.registry.limit('gemini'):
+                    pass
+
+    def test_async_limit_shares_slots(self):
+        """Test async callers count against the same limit"""
+        async def call():
+            async with self.registry.async_limit('openai'):
+                with self.assertRaises(LLMBusyError):
+                    with self.registry.limit('openai'):
+                        pass
+
+        async_to_sync(call)()
+
+    def test_async_limit_in_separate_event_loops(self):
+        """Test slots taken in one async_to_sync loop are usable from the next one"""
+        async def call():
+            async with self.registry.async_limit('openai'):
+                pass
+
+        async_to_sync(call)()
+        async_to_sync(call)()
+
+        with self.registry.limit('openai'):
+            pass
+
+    def test_async_limit_rejects_calls_beyond_concurrency(self):
+        """Test a coroutine waiting on a busy provider gives up with LLMBusyError"""
+        async def call():
+            async with self.registry.async_limit('openai'):
+                with self.assertRaises(LLMBusyError):
+                    async with self.registry.async_limit('openai'):
+                        pass
+            async with self.registry.async_limit('openai'):
+                pass  # Both slots were released
+
+        async_to_sync(call)()
@@ -0,0 +1,118 @@
+# dashboard/tests/test_meal_plan_archive.py
+import io
+import json
+import tempfile
+import zipfile
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import patch
+
+from dashboard.models import MealPlan
+from dashboard.services.meal_plan_archive import MealPlanArchive
+from dashboard.services.meal_plan_export import MealPlanExporter, meal_plan_exporter
+
+DAYS = [{'day': 'Day 1', 'meals': {'breakfast': 'Akara', 'lunch': 'Jollof Rice', 'dinner': 'Egusi Soup'}}]
+
+
+class MealPlanArchiveTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(STORAGES={
+            **settings.STORAGES,
+            'exports': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.tmpdir.name}},
+        })
+        self.settings_override.enable()
+
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+        self.meal_plans = [
+            MealPlan.objects.create(user=self.user, name=f'Week {index}', description=json.dumps(DAYS))
+            for index in range(3)
+        ]
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmpdir.cleanup()
+        cache.clear()
+
+    def test_archive_is_streamed_in_chunks(self):
+        """Test the ZIP arrives as several chunks that together form a valid archive"""
+        chunks = list(MealPlanArchive('csv').stream(self.meal_plans))
+
+        self.assertGreater(len(chunks), len(self.meal_plans))
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), [f'meal_plan_{plan.id}.csv' for plan in self.meal_plans])
+            self.assertIn('Jollof Rice', archive.read(f'meal_plan_{self.meal_plans[0].id}.csv').decode())
+
+    @patch('dashboard.services.meal_plan_archive.generate_pdf_async.delay')
+    def test_pdfs_are_queued_not_rendered(self, mock_delay):
+        """Test PDF archives include stored PDFs only and queue the missing ones once"""
+        stored = self.meal_plans[0]
+        with patch.object(MealPlanExporter, 'render', return_value=b'%PDF-1.4 test') as mock_render:
+            meal_plan_exporter.export(stored)
+            data = b''.join(MealPlanArchive('pdf').stream(self.meal_plans))
+            list(MealPlanArchive('pdf').stream(self.meal_plans))
+
+        self.assertEqual(mock_render.call_count, 1)
+        self.assertEqual(
+            sorted(call.args for call in mock_delay.call_args_list),
+            [(plan.id, self.user.id) for plan in self.meal_plans[1:]]
+        )
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), [f'meal_plan_{stored.id}.pdf', MealPlanArchive.PENDING_ENTRY])
+            self.assertEqual(archive.read(f'meal_plan_{stored.id}.pdf'), b'%PDF-1.4 test')
+            self.assertIn('Week 2', archive.read(MealPlanArchive.PENDING_ENTRY).decode())
+
+    def test_unreadable_plan_is_left_out(self):
+        """Test a stored PDF that can't be read is skipped without breaking the archive"""
+        failing = self.meal_plans[1]
+        with patch.object(MealPlanExporter, 'render', return_value=b'%PDF-1.4 test'):
+            for plan in self.meal_plans:
+                meal_plan_exporter.export(plan)
+
+        real_open = meal_plan_exporter.open
+
+        def open_file(path):
+            if path.startswith(f'{failing.id}/'):
+                raise OSError('disk error')
+            return real_open(path)
+
+        with patch.object(meal_plan_exporter, 'open', side_effect=open_file):
+            data = b''.join(MealPlanArchive('pdf').stream(self.meal_plans))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertNotIn(f'meal_plan_{failing.id}.pdf', archive.namelist())
+            self.assertEqual(len(archive.namelist()), 2)
+
+    def test_view_streams_users_plans(self):
+        """Test the archive endpoint streams only the user's plans"""
+        other = User.objects.create_user(username='other', password='testpassword')
+        MealPlan.objects.create(user=other, name='Not mine', description=json.dumps(DAYS))
+
+        response = self.client.get(reverse('export_meal_plans_archive'), {'format': 'ics'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('filename="meal_plans_ics.zip"', response['Content-Disposition'])
+        with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as archive:
+            self.assertEqual(len(archive.namelist()), 3)
+
+    def test_view_defaults_to_csv(self):
+        """Test the archive is CSV unless another format is asked for"""
+        response = self.client.get(reverse('export_meal_plans_archive'))
+
+        self.assertIn('filename="meal_plans_csv.zip"', response['Content-Disposition'])
+
+    def test_view_rejects_unknown_format(self):
+        """Test unsupported formats are rejected before streaming"""
+        response = self.client.get(reverse('export_meal_plans_archive'), {'format': 'xlsx'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
@@ -0,0 +1,110 @@
+# dashboard/tests/test_meal_plan_cache.py
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import QueryDict
+from unittest.mock import patch
+
+from dashboard.models import MealPlan
+from dashboard.services.meal_plan_cache import MealPlanCache
+from dashboard.views import MealGeneratorView
+
+RESPONSE_TEXT = """MEAL PLAN:
+Day 1:
+Breakfast: Akara and Pap
+Lunch: Jollof Rice with Chicken
+Dinner: Amala with Ewedu Soup
+
+Day 2:
+Breakfast: Yam and Egg Sauce
+Lunch: Egusi Soup with Pounded Yam
+Dinner: Eba with Okra Soup
+
+GROCERY LIST:
+- Rice
+- Yam"""
+
+
+def form_data(**overrides):
+    post_data = QueryDict(mutable=True)
+    post_data.update({
+        'dietary_preferences': 'yoruba_traditional',
+        'plan_days': '2',
+        'meals_per_day': '3',
+        'budget': '50',
+        'currency': 'GBP',
+        'skill_level': 'Intermediate',
+        'family_size': '4',
+    })
+    post_data.update(overrides)
+    return MealGeneratorView()._extract_form_data(post_data)
+
+
+class MealPlanCacheKeyTest(TestCase):
+    def test_equivalent_forms_share_a_key(self):
+        """Test near-identical budgets and reordered allergies share a pool"""
+        first = form_data(budget='48', allergies='Peanuts, shellfish')
+        second = form_data(budget='50.00', allergies='shellfish peanuts')
+
+        self.assertEqual(MealPlanCache.key(first), MealPlanCache.key(second))
+
+    def test_plan_shaping_fields_change_the_key(self):
+        """Test fields that change the plan give different pools"""
+        base = MealPlanCache.key(form_data())
+
+        self.assertNotEqual(base, MealPlanCache.key(form_data(plan_days='3')))
+        self.assertNotEqual(base, MealPlanCache.key(form_data(include_snacks='on')))
+        self.assertNotEqual(base, MealPlanCache.key(form_data(allergies='peanuts')))
+        self.assertNotEqual(base, MealPlanCache.key(form_data(dietary_preferences='igbo_traditional')))
+
+
+class MealPlanCacheGenerationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.view = MealGeneratorView()
+
+    def tearDown(self):
+        cache.clear()
+
+    @patch('dashboard.views.MealGeneratorView._generate_with_openai')
+    def test_warm_pool_skips_the_llm(self, mock_openai):
+        """Test plans are served from the pool once it is full"""
+        mock_openai.return_value = RESPONSE_TEXT
+        data = form_data()
+
+        for _ in range(MealPlanCache.POOL_SIZE):
+            self.assertEqual(self.view._generate_meal_plan(self.user, data)['generated_by'], 'openai')
+
+        result = self.view._generate_meal_plan(self.user, data)
+
+        self.assertEqual(mock_openai.call_count, MealPlanCache.POOL_SIZE)
+        self.assertEqual(result['generated_by'], 'cache')
+        self.assertEqual([day['day'] for day in result['meal_plan']], ['Day 1', 'Day 2'])
+        self.assertCountEqual(
+            [day['meals']['lunch'] for day in result['meal_plan']],
+            ['Jollof Rice with Chicken', 'Egusi Soup with Pounded Yam']
+        )
+        self.assertEqual(result['grocery_list'], ['Rice', 'Yam'])
+        self.assertTrue(MealPlan.objects.filter(id=result['meal_plan_id'], user=self.user).exists())
+
+    def test_pool_is_bounded(self):
+        """Test the pool keeps only the newest plans"""
+        data = form_data()
+        for i in range(MealPlanCache.POOL_SIZE + 2):
+            MealPlanCache.add(data, [{'day': 'Day 1', 'meals': {'lunch': f'Meal {i}'}}], [])
+
+        lunches = sorted(plan['meal_plan'][0]['meals']['lunch'] for plan in MealPlanCache.plans(data))
+
+        self.assertEqual(lunches, [f'Meal {i}' for i in range(2, MealPlanCache.POOL_SIZE + 2)])
+
+    def test_adds_claim_separate_slots(self):
+        """Test each add writes its own slot key instead of rewriting a shared list"""
+        data = form_data()
+        with patch('dashboard.services.meal_plan_cache.cache.set', wraps=cache.set) as mock_set:
+            MealPlanCache.add(data, [{'day': 'Day 1', 'meals': {'lunch': 'Worker A'}}], [])
+            MealPlanCache.add(data, [{'day': 'Day 1', 'meals': {'lunch': 'Worker B'}}], [])
+
+        key = MealPlanCache.key(data)
+        self.assertEqual([call.args[0] for call in mock_set.call_args_list], [f'{key}:0', f'{key}:1'])
+        self.assertEqual(len(MealPlanCache.plans(data)), 2)
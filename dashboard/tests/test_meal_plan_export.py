@@ -0,0 +1,129 @@
+# dashboard/tests/test_meal_plan_export.py
+import json
+import tempfile
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import MagicMock, patch
+
+from dashboard.models import GroceryList, MealPlan
+from dashboard.services.meal_plan_export import MealPlanExporter, meal_plan_exporter
+from dashboard.tasks import generate_pdf_async
+
+DESCRIPTION = 'Day 1:\nBreakfast: Akara\nLunch: Jollof Rice\nDinner: Egusi Soup'
+
+
+class MealPlanTableTest(TestCase):
+    def test_rows_from_structured_plan(self):
+        """Test rows come straight from the plan JSON, skipping empty meals"""
+        days = [{'day': 'Day 1', 'meals': {'breakfast': 'Akara', 'lunch': 'Jollof Rice', 'snack': None, 'dinner': 'Egusi Soup'}}]
+
+        self.assertEqual(MealPlanExporter.table_rows(json.dumps(days)), [
+            ['Day 1', 'Breakfast', 'Akara'],
+            ['Day 1', 'Lunch', 'Jollof Rice'],
+            ['Day 1', 'Dinner', 'Egusi Soup'],
+        ])
+
+    def test_rows_from_legacy_text(self):
+        """Test older text descriptions are still parsed"""
+        self.assertEqual(MealPlanExporter.table_rows(DESCRIPTION)[1], ['Day 1', 'Lunch', 'Jollof Rice'])
+
+
+class MealPlanExportTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(STORAGES={
+            **settings.STORAGES,
+            'exports': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': self.tmpdir.name}},
+        })
+        self.settings_override.enable()
+
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+        self.meal_plan = MealPlan.objects.create(user=self.user, name='Week 1', description=DESCRIPTION)
+        GroceryList.objects.create(user=self.user, items='Rice\nEgusi')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.tmpdir.cleanup()
+        cache.clear()
+
+    def test_export_is_rendered_once(self):
+        """Test an unchanged plan reuses its stored PDF"""
+        with patch.object(MealPlanExporter, 'render', wraps=meal_plan_exporter.render) as mock_render:
+            path = meal_plan_exporter.export(self.meal_plan)
+            self.assertEqual(meal_plan_exporter.export(self.meal_plan), path)
+
+        mock_render.assert_called_once()
+        with meal_plan_exporter.open(path) as pdf:
+            self.assertTrue(pdf.read().startswith(b'%PDF'))
+
+    def test_plan_change_invalidates_export(self):
+        """Test saving a plan drops its stored PDF"""
+        meal_plan_exporter.export(self.meal_plan)
+
+        self.meal_plan.description = DESCRIPTION.replace('Akara', 'Moi Moi')
+        self.meal_plan.save()
+
+        self.assertIsNone(meal_plan_exporter.cached(self.meal_plan))
+        self.assertEqual(meal_plan_exporter.storage.listdir(str(self.meal_plan.id))[1], [])
+
+    def test_grocery_list_change_gets_new_artifact(self):
+        """Test a new grocery list replaces the stored PDF on the next export"""
+        first = meal_plan_exporter.export(self.meal_plan)
+        GroceryList.objects.create(user=self.user, items='Yam')
+        second = meal_plan_exporter.export(self.meal_plan)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(meal_plan_exporter.storage.listdir(str(self.meal_plan.id))[1], [second.split('/')[1]])
+
+    def test_exports_use_configured_storage(self):
+        """Test the web process finds a worker's render through the shared exports storage"""
+        storages_setting = {**settings.STORAGES, 'exports': {'BACKEND': 'django.core.files.storage.InMemoryStorage'}}
+        with override_settings(STORAGES=storages_setting):
+            generate_pdf_async(self.meal_plan.id, self.user.id)
+
+            self.assertIsNotNone(MealPlanExporter().cached(self.meal_plan))
+        self.assertIsNone(meal_plan_exporter.cached(self.meal_plan))
+
+    @patch('dashboard.views.exports.generate_pdf_async.delay')
+    def test_first_export_is_queued(self, mock_delay):
+        """Test an unrendered plan is handed to a worker"""
+        mock_delay.return_value = MagicMock(id='task-1', ready=MagicMock(return_value=False))
+
+        response = self.client.get(reverse('export_meal_plan_pdf', args=[self.meal_plan.id]))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['task_id'], 'task-1')
+        mock_delay.assert_called_once_with(self.meal_plan.id, self.user.id)
+
+    @patch('dashboard.views.exports.generate_pdf_async.delay')
+    def test_repeat_export_serves_stored_file(self, mock_delay):
+        """Test a rendered plan is downloaded without queueing or rendering"""
+        result = generate_pdf_async(self.meal_plan.id, self.user.id)
+        self.assertEqual(result['download_url'], reverse('export_meal_plan_pdf', args=[self.meal_plan.id]))
+
+        response = self.client.get(result['download_url'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('meal_plan_', response['Content-Disposition'])
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+        mock_delay.assert_not_called()
+
+    @patch('dashboard.views.exports.generate_pdf_async.delay')
+    def test_stored_file_downloads_are_not_rate_limited(self, mock_delay):
+        """Test only queued renders count against the export limit"""
+        mock_delay.return_value = MagicMock(id='task-1', ready=MagicMock(return_value=False))
+        generate_pdf_async(self.meal_plan.id, self.user.id)
+        url = reverse('export_meal_plan_pdf', args=[self.meal_plan.id])
+
+        for _ in range(6):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.meal_plan.description = DESCRIPTION.replace('Akara', 'Moi Moi')
+        self.meal_plan.save()
+        self.assertEqual(self.client.get(url).status_code, 202)
@@ -0,0 +1,110 @@
+# dashboard/tests/test_meal_plan_formats.py
+import csv
+import io
+import json
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import MealPlan
+from dashboard.services.meal_plan_formats import EXPORT_FORMATS, ICSFormat, normalize
+
+DAYS = [
+    {'day': 'Day 1', 'meals': {'breakfast': 'Akara', 'lunch': 'Jollof Rice, Plantain', 'snack': None, 'dinner': 'Egusi Soup'}},
+    {'day': 'Day 2', 'meals': {'breakfast': 'Moi Moi', 'lunch': 'Ofada Rice', 'dinner': 'Pepper Soup'}},
+]
+
+
+class MealPlanFormatsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.meal_plan = MealPlan.objects.create(user=self.user, name='Week 1', description=json.dumps(DAYS))
+
+    def export(self, fmt, meal_plans=None, start=date(2026, 3, 2)):
+        return ''.join(EXPORT_FORMATS[fmt].stream(meal_plans or [self.meal_plan], start))
+
+    def test_normalize_dates_days_from_start(self):
+        """Test each day gets a date counted from the start date"""
+        plan = normalize(self.meal_plan, date(2026, 3, 2))
+
+        self.assertEqual([day['date'] for day in plan['days']], ['2026-03-02', '2026-03-03'])
+        self.assertEqual(plan['days'][0]['meals'][2], {'type': 'dinner', 'meal': 'Egusi Soup'})
+
+    def test_csv_has_a_row_per_meal(self):
+        """Test CSV rows cover every meal slot, quoting commas"""
+        rows = list(csv.reader(io.StringIO(self.export('csv'))))
+
+        self.assertEqual(rows[0], ['plan_id', 'plan_name', 'day', 'date', 'meal_type', 'meal'])
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[2], [str(self.meal_plan.id), 'Week 1', 'Day 1', '2026-03-02', 'lunch', 'Jollof Rice, Plantain'])
+
+    def test_ics_has_an_event_per_meal(self):
+        """Test the calendar has one timed event per meal slot"""
+        calendar = self.export('ics')
+
+        self.assertTrue(calendar.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(calendar.endswith('END:VCALENDAR\r\n'))
+        self.assertEqual(calendar.count('BEGIN:VEVENT'), 6)
+        self.assertIn('DTSTART:20260302T080000\r\n', calendar)
+        self.assertIn('SUMMARY:Lunch: Jollof Rice\\, Plantain\r\n', calendar)
+        self.assertIn(f'UID:plan-{self.meal_plan.id}-day-2-dinner@afrimeals\r\n', calendar)
+
+    def test_ics_folds_long_lines(self):
+        """Test content lines are folded to 75 octets without splitting characters"""
+        line = 'SUMMARY:' + 'Ẹ̀fọ́ riro ' * 20
+
+        folded = ICSFormat.fold(line)
+
+        self.assertEqual(folded.replace('\r\n ', ''), line)
+        self.assertTrue(all(len(part.encode()) <= 75 for part in folded.split('\r\n')))
+
+    def test_json_streams_every_plan(self):
+        """Test the JSON export is one valid document covering all plans"""
+        second = MealPlan.objects.create(user=self.user, name='Week 2', description='Day 1:\nBreakfast: Akara')
+
+        data = json.loads(self.export('json', [self.meal_plan, second]))
+
+        self.assertEqual([plan['name'] for plan in data['meal_plans']], ['Week 1', 'Week 2'])
+        self.assertEqual(data['meal_plans'][1]['days'][0]['meals'], [{'type': 'breakfast', 'meal': 'Akara'}])
+
+
+class MealPlanFormatViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+        self.meal_plan = MealPlan.objects.create(user=self.user, name='Week 1', description=json.dumps(DAYS))
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_plan_is_streamed_as_attachment(self):
+        """Test a single plan downloads as a streamed calendar file"""
+        response = self.client.get(reverse('export_meal_plan_format', args=[self.meal_plan.id, 'ics']), {'start': '2026-03-02'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertIn(f'filename="meal_plan_{self.meal_plan.id}.ics"', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content).count(b'BEGIN:VEVENT'), 6)
+
+    def test_all_plans_export(self):
+        """Test the history export covers only the user's own plans"""
+        MealPlan.objects.create(user=self.user, name='Week 2', description=json.dumps(DAYS))
+        other = User.objects.create_user(username='other', password='testpassword')
+        MealPlan.objects.create(user=other, name='Not mine', description=json.dumps(DAYS))
+
+        response = self.client.get(reverse('export_meal_plans_format', args=['json']))
+
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([plan['name'] for plan in data['meal_plans']], ['Week 2', 'Week 1'])
+
+    def test_unknown_format_and_bad_start(self):
+        """Test unsupported formats are 404s and invalid start dates 400s"""
+        self.assertEqual(self.client.get(reverse('export_meal_plans_format', args=['xlsx'])).status_code, 404)
+
+        response = self.client.get(reverse('export_meal_plans_format', args=['csv']), {'start': 'monday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
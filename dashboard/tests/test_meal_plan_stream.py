@@ -0,0 +1,127 @@
+# dashboard/tests/test_meal_plan_stream.py
+import json
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from unittest.mock import patch
+
+from dashboard.context_processors import streaming
+from dashboard.models import MealPlan
+from dashboard.services.meal_plan_stream import MealPlanStreamParser
+from dashboard.views import MealGeneratorView
+
+RESPONSE_TEXT = """MEAL PLAN:
+Day 1:
+Breakfast: Akara and Pap
+Lunch: Jollof Rice with Chicken
+Dinner: Amala with Ewedu Soup
+
+Day 2:
+Breakfast: Yam and Egg Sauce
+Lunch: Egusi Soup with Pounded Yam
+Dinner: Eba with Okra Soup
+
+GROCERY LIST:
+- Rice
+- Yam
+- Egusi"""
+
+
+def chunked(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class MealPlanStreamParserTest(TestCase):
+    def test_matches_structure_meal_plan(self):
+        """Test streamed parsing gives the same days as the blocking parser"""
+        form_data = {'include_snacks': False}
+        meal_plan_text = RESPONSE_TEXT.split('GROCERY LIST:')[0].replace('MEAL PLAN:', '')
+
+        parser = MealPlanStreamParser(include_snacks=False)
+        days = []
+        for chunk in chunked(RESPONSE_TEXT):
+            days.extend(parser.feed(chunk))
+        days.extend(parser.close())
+
+        self.assertEqual(days, MealGeneratorView()._structure_meal_plan(meal_plan_text, form_data))
+        self.assertEqual(parser.grocery_list, ['Rice', 'Yam', 'Egusi'])
+
+    def test_day_completes_when_next_day_starts(self):
+        """Test a day is emitted as soon as the next day header arrives"""
+        parser = MealPlanStreamParser(include_snacks=True)
+
+        self.assertEqual(parser.feed("Day 1:\nBreakfast: Akara\nSnack: Chin Chin\n"), [])
+        completed = parser.feed("Day 2:\n")
+
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0]['day'], 'Day 1')
+        self.assertEqual(completed[0]['meals']['snack'], 'Chin Chin')
+
+
+class MealGeneratorStreamViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.client = Client()
+        self.client.login(username='testuser', password='testpassword')
+
+    def _read_events(self, response):
+        body = b''.join(response).decode()
+        events = []
+        for raw_event in body.strip().split('\n\n'):
+            name, data = raw_event.split('\n')
+            events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+        return events
+
+    @patch('dashboard.views.MealGeneratorView._stream_with_openai')
+    def test_streams_days_then_complete(self, mock_stream):
+        """Test each day is sent as an event before the plan is saved"""
+        async def fake_stream(prompt):
+            for chunk in chunked(RESPONSE_TEXT):
+                yield chunk
+        mock_stream.side_effect = fake_stream
+
+        response = self.client.post(reverse('meal_generator_stream'), {
+            'dietary_preferences': 'yoruba_traditional',
+            'meals_per_day': '3',
+            'plan_days': '2'
+        })
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self._read_events(response)
+
+        self.assertEqual([name for name, _ in events], ['day', 'day', 'complete'])
+        self.assertEqual(events[0][1]['meals']['lunch'], 'Jollof Rice with Chicken')
+
+        complete = events[-1][1]
+        self.assertTrue(complete['success'])
+        self.assertEqual(complete['grocery_list'], ['Rice', 'Yam', 'Egusi'])
+        meal_plan = MealPlan.objects.get(id=complete['meal_plan_id'], user=self.user)
+        self.assertEqual(json.loads(meal_plan.description), [day for _, day in events[:2]])
+
+    @patch('dashboard.views.MealGeneratorView._stream_with_openai')
+    def test_streams_fallback_plan_on_error(self, mock_stream):
+        """Test the fallback plan is streamed when OpenAI fails up front"""
+        async def failing_stream(prompt):
+            raise Exception('API down')
+            yield
+        mock_stream.side_effect = failing_stream
+
+        response = self.client.post(reverse('meal_generator_stream'), {
+            'meals_per_day': '3',
+            'plan_days': '3'
+        })
+        events = self._read_events(response)
+
+        self.assertEqual([name for name, _ in events], ['day', 'day', 'day', 'complete'])
+        self.assertEqual(events[-1][1]['generated_by'], 'fallback')
+
+
+class StreamingContextTest(SimpleTestCase):
+    def test_streaming_only_under_asgi(self):
+        """Test pages only stream when the request came in over ASGI"""
+        self.assertFalse(streaming(RequestFactory().get('/'))['streaming_enabled'])
+        self.assertTrue(streaming(AsyncRequestFactory().get('/'))['streaming_enabled'])
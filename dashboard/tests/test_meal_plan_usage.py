@@ -0,0 +1,59 @@
+# dashboard/tests/test_meal_plan_usage.py
+from io import StringIO
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.auth.models import User
+
+from dashboard.models import MealPlan, MealPlanUsage
+
+
+class MealPlanUsageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def create_plan(self):
+        return MealPlan.objects.create(user=self.user, name='Plan', description='[]')
+
+    def test_counter_follows_creates_and_deletes(self):
+        """Test the counter is maintained by the MealPlan signal receivers"""
+        plans = [self.create_plan() for _ in range(3)]
+        plans[0].delete()
+        MealPlan.objects.filter(id=plans[1].id).delete()
+
+        self.assertEqual(MealPlanUsage.objects.get(user=self.user).meal_plan_count, 1)
+
+    def test_count_for_is_a_single_query(self):
+        """Test quota reads don't COUNT(*) the meal plan table"""
+        self.create_plan()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(MealPlanUsage.count_for(self.user.id), 1)
+
+    def test_missing_counter_is_seeded(self):
+        """Test users with plans from before the counter existed are seeded"""
+        self.create_plan()
+        MealPlanUsage.objects.all().delete()
+
+        self.assertEqual(MealPlanUsage.count_for(self.user.id), 1)
+        self.create_plan()
+        self.assertEqual(MealPlanUsage.count_for(self.user.id), 2)
+
+    def test_deleting_user_cascades(self):
+        """Test deleting a user with plans doesn't recreate its counter"""
+        self.create_plan()
+
+        self.user.delete()
+
+        self.assertFalse(MealPlanUsage.objects.exists())
+
+    def test_reconcile_command_fixes_drift(self):
+        """Test the reconciliation command corrects drifted counters"""
+        self.create_plan()
+        self.create_plan()
+        MealPlanUsage.objects.filter(user=self.user).update(meal_plan_count=7)
+        out = StringIO()
+
+        call_command('reconcile_meal_plan_usage', stdout=out)
+
+        self.assertEqual(MealPlanUsage.objects.get(user=self.user).meal_plan_count, 2)
+        self.assertIn('1 counters corrected', out.getvalue())
@@ -0,0 +1,83 @@
+# dashboard/tests/test_price_matrix.py
+import json
+from decimal import Decimal
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from unittest.mock import MagicMock, patch
+
+from dashboard.models import ExchangeRate, SubscriptionTier
+from dashboard.services.exchange_rates import exchange_rates, refresh_exchange_rates
+from dashboard.services.price_matrix import PriceMatrix
+from dashboard.utils.currency import CurrencyManager
+
+
+class PriceMatrixTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ExchangeRate.objects.create(currency='USD', rate=Decimal('1.25'), source='test')
+        exchange_rates.reload()
+        self.tier = SubscriptionTier.objects.create(
+            name='Weekly', tier_type='weekly', price=Decimal('7.99'), description='Weekly access'
+        )
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def tearDown(self):
+        cache.clear()
+        ExchangeRate.objects.all().delete()
+        exchange_rates.reload()
+
+    def test_tier_save_rebuilds_matrix(self):
+        """Test saving a tier refreshes its localized prices"""
+        self.assertEqual(PriceMatrix.price(self.tier.id, 'USD'), {'amount': 999, 'formatted': '$9.99'})
+
+        self.tier.price = Decimal('9.99')
+        self.tier.save()
+
+        self.assertEqual(PriceMatrix.price(self.tier.id, 'GBP'), {'amount': 999, 'formatted': '£9.99'})
+        self.assertEqual(PriceMatrix.price(self.tier.id, 'USD')['amount'], 1249)
+
+    @override_settings(CURRENCY_API_KEY='test-key')
+    @patch('dashboard.services.exchange_rates.http_client.get')
+    def test_rate_refresh_rebuilds_matrix(self, mock_get):
+        """Test refreshed rates reach the matrix immediately"""
+        mock_get.return_value = MagicMock(status_code=200, json=lambda: {'data': {'USD': 1.5}})
+
+        refresh_exchange_rates()
+
+        self.assertEqual(PriceMatrix.price(self.tier.id, 'USD')['amount'], 1199)
+
+    def test_price_data_is_served_from_matrix(self):
+        """Test CurrencyManager price data needs no recomputation once built"""
+        PriceMatrix.rebuild()
+
+        with patch.object(CurrencyManager, 'compute_price_data') as mock_compute:
+            self.assertEqual(CurrencyManager.get_price_data('USD')['formatted_weekly'], '$16.99')
+            mock_compute.assert_not_called()
+
+    @patch('stripe.checkout.Session.create')
+    def test_checkout_charges_the_displayed_price(self, mock_session):
+        """Test checkout uses the quoted matrix even after rates move"""
+        mock_session.return_value = MagicMock(id='cs_test_123')
+        self.client.login(username='testuser', password='testpass123')
+        self.client.get(reverse('pricing'))
+
+        ExchangeRate.objects.filter(currency='USD').update(rate=Decimal('2.00'))
+        exchange_rates.reload()
+        PriceMatrix.rebuild()
+
+        response = self.client.post(reverse('checkout', args=[self.tier.id]), HTTP_X_CURRENCY='USD')
+
+        self.assertEqual(response.status_code, 200)
+        line_item = mock_session.call_args.kwargs['line_items'][0]
+        self.assertEqual(line_item['price_data']['unit_amount'], 999)
+
+    def test_checkout_rejects_unsupported_currency(self):
+        """Test currencies outside the matrix aren't silently charged at 1:1"""
+        self.client.login(username='testuser', password='testpass123')
+
+        response = self.client.post(reverse('checkout', args=[self.tier.id]), HTTP_X_CURRENCY='JPY')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not available', json.loads(response.content)['error'])
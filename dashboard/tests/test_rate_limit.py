@@ -0,0 +1,108 @@
+# dashboard/tests/test_rate_limit.py
+import json
+import time
+from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from django.contrib.auth.models import User, AnonymousUser
+from django.http import JsonResponse
+from unittest.mock import patch
+
+from dashboard.decorators import rate_limit
+from dashboard.utils.rate_limit import SlidingWindowRateLimiter
+
+
+class SlidingWindowRateLimiterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.limiter = SlidingWindowRateLimiter('test', limit=3, window=60)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_blocks_after_limit(self):
+        """Test requests over the limit are rejected with a retry delay"""
+        results = [self.limiter.hit('user:1', now=600) for _ in range(4)]
+
+        self.assertEqual([r.allowed for r in results], [True, True, True, False])
+        self.assertEqual(results[2].remaining, 0)
+        self.assertEqual(results[3].retry_after, 60)
+
+    def test_rejected_requests_are_not_counted(self):
+        """Test hammering while throttled doesn't extend the throttle"""
+        for _ in range(10):
+            self.limiter.hit('user:1', now=600)
+
+        # Halfway through the next window, half of the previous 3 still count
+        self.assertTrue(self.limiter.hit('user:1', now=690).allowed)
+        self.assertFalse(self.limiter.hit('user:1', now=690).allowed)
+
+    def test_window_slides(self):
+        """Test the previous window's requests fade out instead of resetting"""
+        for _ in range(3):
+            self.limiter.hit('user:1', now=659)
+
+        # Just after the boundary almost all of the previous window still counts
+        result = self.limiter.hit('user:1', now=661)
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.retry_after, 20)
+        self.assertTrue(self.limiter.hit('user:1', now=661 + result.retry_after).allowed)
+
+    def test_identities_are_independent(self):
+        """Test one user's usage doesn't throttle another"""
+        for _ in range(3):
+            self.limiter.hit('user:1', now=600)
+
+        self.assertTrue(self.limiter.hit('user:2', now=600).allowed)
+
+
+class RateLimitDecoratorTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+        @rate_limit('test_view', max_requests=5, timeout=3600, burst=2, burst_window=60)
+        def view(request):
+            return JsonResponse({'success': True})
+
+        self.view = view
+
+    def tearDown(self):
+        cache.clear()
+
+    def request(self, user=None, ip='10.0.0.1'):
+        request = self.factory.post('/', HTTP_X_REQUESTED_WITH='XMLHttpRequest', REMOTE_ADDR=ip)
+        request.user = user or self.user
+        return request
+
+    def test_burst_limit_returns_429(self):
+        """Test the burst allowance is enforced with a Retry-After header"""
+        self.assertEqual(self.view(self.request()).status_code, 200)
+        self.assertEqual(self.view(self.request()).status_code, 200)
+
+        response = self.view(self.request())
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertFalse(json.loads(response.content)['success'])
+
+    def test_burst_rejection_keeps_hourly_allowance(self):
+        """Test requests rejected by the burst limit aren't counted against the hourly limit"""
+        hourly = SlidingWindowRateLimiter('test_view', 5, 3600)
+        window_index = int(time.time() // 3600)
+
+        # Pinned to the start of an hour, so every request falls in the same windows
+        with patch('dashboard.decorators.time.time', return_value=window_index * 3600):
+            responses = [self.view(self.request()) for _ in range(5)]
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 429, 429, 429])
+        self.assertEqual(cache.get(hourly._key(f"user:{self.user.id}", window_index)), 2)
+
+    def test_anonymous_users_are_limited_per_ip(self):
+        """Test anonymous requests are keyed on the client IP"""
+        anonymous = AnonymousUser()
+        self.view(self.request(anonymous, ip='10.0.0.2'))
+        self.view(self.request(anonymous, ip='10.0.0.2'))
+
+        self.assertEqual(self.view(self.request(anonymous, ip='10.0.0.2')).status_code, 429)
+        self.assertEqual(self.view(self.request(anonymous, ip='10.0.0.3')).status_code, 200)
@@ -0,0 +1,124 @@
+# dashboard/tests/test_recipe_batch.py
+import json
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from unittest.mock import MagicMock, patch
+
+from dashboard.models import MealPlan, Recipe
+from dashboard.services.recipe_batch import RecipeBatchGenerator
+from dashboard.views import MealGeneratorView
+
+MEAL_PLAN = [
+    {'day': 'Day 1', 'meals': {'breakfast': 'Akara and Pap', 'lunch': 'Jollof Rice', 'snack': None, 'dinner': 'Egusi Soup'}},
+    {'day': 'Day 2', 'meals': {'breakfast': 'Akara and Pap', 'lunch': 'Jollof Rice', 'snack': None, 'dinner': 'Amala'}},
+]
+
+
+def recipe_json(title):
+    return {
+        'title': title,
+        'description': f'{title} description',
+        'prepTime': '15 minutes',
+        'cookTime': '30 minutes',
+        'servings': '4 people',
+        'difficulty': 'Easy',
+        'ingredients': ['Salt', 'Pepper'],
+        'instructions': ['Cook it', 'Serve it'],
+        'nutrition': {'calories': '400'},
+        'tips': ['Serve hot'],
+    }
+
+
+def gemini_client():
+    """Fake Gemini client answering each batch prompt with its dishes"""
+    def generate_content(model, contents):
+        titles = [line[2:] for line in contents.split('\n') if line.startswith('- ')]
+        payload = json.dumps({'recipes': [recipe_json(title) for title in titles]})
+        return MagicMock(text=f'```json\n{payload}\n```')
+
+    client = MagicMock()
+    client.models.generate_content.side_effect = generate_content
+    return client
+
+
+class RecipeBatchGeneratorTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.meal_plan = MealPlan.objects.create(
+            user=self.user,
+            name='Test Meal Plan',
+            description=json.dumps(MEAL_PLAN)
+        )
+
+    def test_dishes_are_deduplicated_and_batched(self):
+        """Test each distinct dish is requested once, in batches"""
+        client = gemini_client()
+        generator = RecipeBatchGenerator(client=client)
+        generator.BATCH_SIZE = 2
+
+        created = generator.pregenerate_for_meal_plan(self.meal_plan)
+
+        self.assertEqual(created, 6)
+        self.assertEqual(client.models.generate_content.call_count, 2)  # 4 distinct dishes
+        recipe = Recipe.objects.get(meal_plan=self.meal_plan, day_index=1, meal_type='breakfast')
+        self.assertEqual(recipe.title, 'Akara and Pap')
+        self.assertEqual(recipe.servings, 4)
+        self.assertEqual(recipe.ingredients_list, ['Salt', 'Pepper'])
+        self.assertTrue(recipe.is_ai_generated)
+
+    def test_existing_recipes_are_kept(self):
+        """Test slots that already have a recipe are not regenerated"""
+        Recipe.objects.create(
+            user=self.user, meal_plan=self.meal_plan, day_index=0, meal_type='lunch',
+            title='Jollof Rice', ingredients='Rice', instructions='Cook'
+        )
+        client = gemini_client()
+
+        created = RecipeBatchGenerator(client=client).pregenerate_for_meal_plan(self.meal_plan)
+
+        self.assertEqual(created, 5)
+        self.assertEqual(
+            Recipe.objects.get(meal_plan=self.meal_plan, day_index=0, meal_type='lunch').instructions,
+            'Cook'
+        )
+
+    def test_failed_batch_is_skipped(self):
+        """Test a bad batch response leaves its slots for on-demand generation"""
+        client = MagicMock()
+        client.models.generate_content.return_value = MagicMock(text='not json')
+
+        created = RecipeBatchGenerator(client=client).pregenerate_for_meal_plan(self.meal_plan)
+
+        self.assertEqual(created, 0)
+        self.assertFalse(Recipe.objects.filter(meal_plan=self.meal_plan).exists())
+
+    @patch('dashboard.views.recipes.llm_clients.gemini')
+    def test_recipe_click_uses_pregenerated_recipe(self, mock_client):
+        """Test the recipe endpoint serves a pre-generated row without an LLM call"""
+        RecipeBatchGenerator(client=gemini_client()).pregenerate_for_meal_plan(self.meal_plan)
+        client = Client()
+        client.login(username='testuser', password='testpass123')
+
+        response = client.get(reverse('recipe_details', args=[self.meal_plan.id, 0, 'dinner']))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['title'], 'Egusi Soup')
+        self.assertFalse(data['isNewlyGenerated'])
+        mock_client.return_value.models.generate_content.assert_not_called()
+
+
+class RecipePregenerationQueueTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    @patch('dashboard.views.meal_generator.pregenerate_recipes_async.delay')
+    def test_saved_plan_queues_pregeneration(self, mock_delay):
+        """Test saving a meal plan queues recipe pre-generation on commit"""
+        form_data = {'dietary_preferences': 'yoruba_traditional'}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            meal_plan = MealGeneratorView()._save_meal_plan(self.user, form_data, MEAL_PLAN, ['Rice'])
+
+        mock_delay.assert_called_once_with(meal_plan.id)
@@ -0,0 +1,124 @@
+# dashboard/tests/test_recipe_library.py
+import json
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from unittest.mock import MagicMock, patch
+
+from dashboard.models import CanonicalRecipe, MealPlan, Recipe
+from dashboard.services.recipe_batch import RecipeBatchGenerator
+from dashboard.views import RecipeDetailsView
+
+MEAL_PLAN = [
+    {'day': 'Day 1', 'meals': {'breakfast': None, 'lunch': 'Jollof Rice with Chicken', 'snack': None, 'dinner': None}},
+]
+
+GEMINI_RECIPE = {
+    'title': 'Jollof Rice with Chicken',
+    'description': 'Party jollof',
+    'prepTime': '20 minutes',
+    'cookTime': '60 minutes',
+    'servings': '6',
+    'difficulty': 'Medium',
+    'ingredients': ['Rice', 'Chicken'],
+    'instructions': ['Fry the base', 'Add rice'],
+    'nutrition': {'calories': '550'},
+    'tips': ['Use long grain rice'],
+}
+
+
+class CanonicalRecipeTest(TestCase):
+    def test_normalize_name(self):
+        """Test spelling and punctuation variants normalize to one key"""
+        self.assertEqual(
+            CanonicalRecipe.normalize_name('  Jollof Rice & Chicken! '),
+            CanonicalRecipe.normalize_name('jollof rice and chicken')
+        )
+        self.assertEqual(CanonicalRecipe.normalize_name('Ẹ̀fọ́ Riro'), 'efo riro')
+
+    def test_first_stored_recipe_wins(self):
+        """Test storing a dish twice keeps the first shared recipe"""
+        first = CanonicalRecipe.store('Puff Puff', {'ingredients': 'Flour', 'instructions': 'Fry'})
+        second = CanonicalRecipe.store('puff-puff', {'ingredients': 'Other', 'instructions': 'Bake'})
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(CanonicalRecipe.objects.get().ingredients, 'Flour')
+
+
+class RecipeLibraryViewTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='testpass123')
+            for i in range(2)
+        ]
+        self.meal_plans = [
+            MealPlan.objects.create(user=user, name='Plan', description=json.dumps(MEAL_PLAN))
+            for user in self.users
+        ]
+
+    def get_recipe(self, index):
+        client = Client()
+        client.login(username=f'user{index}', password='testpass123')
+        return client.get(reverse('recipe_details', args=[self.meal_plans[index].id, 0, 'lunch']))
+
+    @patch('dashboard.views.recipes.llm_clients.gemini')
+    def test_dish_is_generated_once_across_users(self, mock_client):
+        """Test a second user's recipe view is copied from the library"""
+        generate = mock_client.return_value.models.generate_content
+        generate.return_value = MagicMock(text=json.dumps(GEMINI_RECIPE))
+
+        first = self.get_recipe(0).json()
+        second = self.get_recipe(1).json()
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertTrue(second['isNewlyGenerated'])
+        self.assertEqual(second['ingredients'], first['ingredients'])
+        self.assertEqual(second['instructions'], ['Fry the base', 'Add rice'])
+
+        copy = Recipe.objects.get(user=self.users[1])
+        self.assertEqual(copy.canonical_recipe, CanonicalRecipe.objects.get())
+        self.assertEqual(copy.ingredients_list, ['Rice', 'Chicken'])
+
+    def test_edited_copy_leaves_library(self):
+        """Test editing a copied recipe unlinks it from the shared recipe"""
+        canonical = CanonicalRecipe.store('Jollof Rice with Chicken', {'ingredients': 'Rice', 'instructions': 'Cook'})
+        recipe = Recipe.objects.create(
+            user=self.users[0], title='Jollof Rice with Chicken', **canonical.recipe_fields()
+        )
+        client = Client()
+        client.login(username='user0', password='testpass123')
+
+        client.post(reverse('recipe_edit', args=[recipe.pk]), {
+            'title': 'Jollof Rice with Chicken',
+            'ingredients': 'Rice\nTurkey\nTomatoes',
+            'instructions': 'Fry the base, add the rice and steam until done',
+        })
+
+        recipe.refresh_from_db()
+        canonical.refresh_from_db()
+        self.assertIsNone(recipe.canonical_recipe)
+        self.assertEqual(canonical.ingredients, 'Rice')
+
+    def test_batch_pregeneration_uses_library(self):
+        """Test batched pre-generation skips the LLM for dishes in the library"""
+        CanonicalRecipe.store('jollof rice with chicken', {'ingredients': 'Rice', 'instructions': 'Cook'})
+        client = MagicMock()
+
+        created = RecipeBatchGenerator(client=client).pregenerate_for_meal_plan(self.meal_plans[0])
+
+        self.assertEqual(created, 1)
+        client.models.generate_content.assert_not_called()
+        self.assertEqual(Recipe.objects.get(meal_plan=self.meal_plans[0]).title, 'Jollof Rice with Chicken')
+
+    def test_copy_after_concurrent_pregeneration(self):
+        """Test a slot pre-generated between the lookup and the copy is kept, not replaced by a fallback"""
+        canonical = CanonicalRecipe.store('Jollof Rice with Chicken', {'ingredients': 'Rice', 'instructions': 'Cook'})
+        RecipeBatchGenerator(client=MagicMock()).pregenerate_for_meal_plan(self.meal_plans[0])
+        view = RecipeDetailsView()
+        view.request = MagicMock(user=self.users[0])
+        view.kwargs = {'meal_plan_id': self.meal_plans[0].id, 'day_index': 0, 'meal_type': 'lunch'}
+
+        data = view._generate_recipe('Jollof Rice with Chicken')
+
+        self.assertEqual(data, canonical.to_recipe_data('Jollof Rice with Chicken'))
+        self.assertEqual(Recipe.objects.filter(meal_plan=self.meal_plans[0]).count(), 1)
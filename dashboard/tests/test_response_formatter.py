@@ -0,0 +1,62 @@
+# dashboard/tests/test_response_formatter.py
+from django.test import SimpleTestCase
+
+from dashboard.utils.response_formatter import response_formatter
+
+
+class ResponseFormatterTest(SimpleTestCase):
+    def test_block_elements(self):
+        """Test titles, sections, bullets and numbered items become styled blocks"""
+        html = response_formatter.format('NAIJAPLATE: Jollof\nII. Method\n  * Rinse rice\n3.  Stir')
+
+        self.assertEqual(html, (
+            '<div class="space-y-4 text-gray-800">'
+            '<div class="text-2xl font-bold text-green-700 mb-4">NAIJAPLATE: Jollof</div> '
+            '<h3 class="text-xl font-semibold text-green-600 mt-6 mb-3">II. Method</h3> '
+            '<div class="ml-4 my-2">• Rinse rice</div> '
+            '<div class="ml-4 my-2">3. Stir</div></div>'
+        ))
+
+    def test_inline_markdown_and_notes(self):
+        """Test bold, italic and notes are styled within a line"""
+        html = response_formatter.format('Serve **hot** and *smoky*\n\nTip:  use palm oil')
+
+        self.assertEqual(html, (
+            '<div class="space-y-4 text-gray-800">'
+            'Serve <strong class="font-semibold">hot</strong> and <em class="italic">smoky</em>'
+            '</div><div class="my-4">'
+            '<div class="bg-green-50 p-3 rounded-lg my-2"><span class="font-semibold">Tip:</span> use palm oil</div>'
+            '</div>'
+        ))
+
+    def test_links(self):
+        """Test store addresses and YouTube references become links"""
+        html = response_formatter.format(
+            'Afro Foods: 12 Harehills Road (Leeds LS8)\nSearch on YouTube for "egusi soup"'
+        )
+
+        self.assertIn('📍 Afro Foods: <a href="https://www.google.com/maps/search/?api=1&query=Leeds LS8"', html)
+        self.assertIn('>12 Harehills Road  (Leeds LS8)</a>', html)
+        self.assertIn('href="https://www.youtube.com/results?search_query=egusi soup"', html)
+
+    def test_patterns_do_not_span_lines(self):
+        """Test a colon on one line and an address on the next stay plain text"""
+        html = response_formatter.format('Ingredients:\nPalm oil (red oil)')
+
+        self.assertEqual(html, '<div class="space-y-4 text-gray-800">Ingredients: Palm oil (red oil)</div>')
+
+    def test_stream_matches_format(self):
+        """Test fragments from a chunked stream add up to the formatted reply"""
+        text = 'NAIJAPLATE: Jollof\n\n\nI. Method\n* Rinse **rice**\n\nTip: stir'
+        stream = response_formatter.stream()
+
+        html = ''.join(stream.feed(text[i:i + 4]) for i in range(0, len(text), 4)) + stream.close()
+
+        self.assertEqual(html, response_formatter.format(text))
+
+    def test_stream_emits_completed_lines_only(self):
+        """Test a line is only sent once its newline arrives"""
+        stream = response_formatter.stream()
+
+        self.assertEqual(stream.feed('* Rinse'), '<div class="space-y-4 text-gray-800">')
+        self.assertEqual(stream.feed(' rice\n'), '<div class="ml-4 my-2">• Rinse rice</div>')
@@ -0,0 +1,35 @@
+# dashboard/tests/test_startup_imports.py
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+BOOT = """
+import os, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'afrimeals_project.settings')
+import django
+django.setup()
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver(settings.ROOT_URLCONF).url_patterns
+print(' '.join(sorted(sys.modules)))
+"""
+
+
+class StartupImportsTest(SimpleTestCase):
+    def test_heavy_sdks_are_not_imported_at_startup(self):
+        """Test booting Django and loading every view leaves the payment, PDF and LLM SDKs unloaded"""
+        result = subprocess.run(
+            [sys.executable, '-c', BOOT],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, env=os.environ.copy()
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        modules = result.stdout.split()
+        for package in ('stripe', 'openai', 'google.genai', 'reportlab', 'mailjet_rest', 'pandas'):
+            self.assertFalse(
+                [name for name in modules if name == package or name.startswith(f'{package}.')],
+                f'{package} was imported at startup'
+            )
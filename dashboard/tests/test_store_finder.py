@@ -0,0 +1,229 @@
+# dashboard/tests/test_store_finder.py
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.core.cache import cache
+from unittest.mock import MagicMock, patch
+
+from dashboard.models import Store
+from dashboard.services.store_finder import StoreFinder
+from dashboard.utils.geo import geohash_encode, geohash_neighbors, haversine_km
+
+# Bradford city centre
+LAT, LNG = 53.7960, -1.7594
+
+
+class GeoTest(TestCase):
+    def test_haversine_is_vectorized(self):
+        """Test distances to many points are computed in one call"""
+        distances = haversine_km(LAT, LNG, [LAT, 53.8008, 51.5074], [LNG, -1.5491, -0.1278])
+
+        self.assertAlmostEqual(distances[0], 0)
+        self.assertAlmostEqual(distances[1], 13.8, places=1)  # Leeds
+        self.assertAlmostEqual(distances[2], 277.2, places=1)  # London
+
+    def test_neighbors_surround_cell(self):
+        """Test a cell's neighbourhood contains the cell and eight others"""
+        cell = geohash_encode(LAT, LNG, 5)
+        neighbors = geohash_neighbors(cell)
+
+        self.assertEqual(len(neighbors), 9)
+        self.assertIn(cell, neighbors)
+        self.assertIn(geohash_encode(LAT + 0.045, LNG + 0.03, 5), neighbors)
+
+
+class StoreFinderTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.african = Store.objects.create(
+            name='Afro Foods', store_type='african', address='Manningham Lane',
+            latitude=53.8030, longitude=-1.7600, ingredient_tags=['Egusi', 'palm oil']
+        )
+        self.supermarket = Store.objects.create(
+            name='Big Supermarket', store_type='supermarket', address='Thornton Road',
+            latitude=53.7950, longitude=-1.7610
+        )
+        self.far_away = Store.objects.create(
+            name='London Market', store_type='african', address='Peckham',
+            latitude=51.4740, longitude=-0.0690
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_save_sets_geohash_and_normalizes_tags(self):
+        """Test stores are indexed and tagged consistently on save"""
+        self.assertEqual(self.african.geohash, geohash_encode(53.8030, -1.7600))
+        self.assertEqual(self.african.ingredient_tags, ['egusi', 'palm oil'])
+
+    def test_nearest_orders_by_distance_within_radius(self):
+        """Test k-nearest returns only stores inside the radius, closest first"""
+        nearest = Store.nearest(LAT, LNG, k=5, radius_km=16)
+
+        self.assertEqual([store for store, _ in nearest], [self.supermarket, self.african])
+        self.assertLess(nearest[0][1], nearest[1][1])
+
+    def test_nearest_respects_k(self):
+        """Test at most k stores are returned"""
+        self.assertEqual(len(Store.nearest(LAT, LNG, k=1, radius_km=16)), 1)
+
+    @patch('dashboard.services.store_finder.llm_clients.gemini')
+    def test_search_ranks_stocking_stores_first_without_llm(self, mock_client):
+        """Test searches use the local index and never the LLM"""
+        result = StoreFinder().find_stores_for_ingredient(LAT, LNG, 'Egusi (ground)')
+
+        self.assertEqual(result['stores'][0]['name'], 'Afro Foods')
+        self.assertTrue(result['stores'][0]['likely_in_stock'])
+        self.assertFalse(result['stores'][1]['likely_in_stock'])
+        self.assertIn('recommendations', result)
+        mock_client.assert_not_called()
+
+    @patch('dashboard.services.store_finder.llm_clients.gemini')
+    def test_uncovered_area_falls_back_to_gemini(self, mock_client):
+        """Test areas without stores in the table are searched with Gemini"""
+        mock_client.return_value.models.generate_content.return_value = MagicMock(text=json.dumps({
+            'stores': [{'name': 'Manchester Afro Mart', 'type': 'African Store', 'address': 'Moss Side',
+                        'distance': '0.8 miles', 'likely_in_stock': True}]
+        }))
+
+        result = StoreFinder().find_stores_for_ingredient(53.4808, -2.2426, 'egusi')
+
+        self.assertEqual(result['stores'][0]['name'], 'Manchester Afro Mart')
+        self.assertIn('recommendations', result)
+        mock_client.return_value.models.generate_content.assert_called_once()
+
+    def test_find_stores_endpoint(self):
+        """Test the API returns nearby stores in the existing shape"""
+        response = self.client.get(reverse('find_stores'), {'lat': LAT, 'lng': LNG, 'ingredient': 'rice'})
+        data = json.loads(response.content)
+
+        self.assertTrue(data['success'])
+        self.assertEqual(data['stores'][0]['name'], 'Big Supermarket')
+        self.assertEqual(data['stores'][0]['distance'], '0.1 miles')
+
+    def test_find_stores_is_rate_limited_per_ip(self):
+        """Test anonymous searches are throttled by client IP"""
+        params = {'lat': LAT, 'lng': LNG, 'ingredient': 'rice'}
+        for _ in range(10):
+            self.client.get(reverse('find_stores'), params, HTTP_X_REQUESTED_WITH='XMLHttpRequest', REMOTE_ADDR='10.0.0.1')
+
+        response = self.client.get(reverse('find_stores'), params, HTTP_X_REQUESTED_WITH='XMLHttpRequest', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 429)
+        other = self.client.get(reverse('find_stores'), params, HTTP_X_REQUESTED_WITH='XMLHttpRequest', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(other.status_code, 200)
+
+
+class StoreSearchCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Store.objects.create(
+            name='Afro Foods', store_type='african', address='Manningham Lane',
+            latitude=53.8030, longitude=-1.7600, ingredient_tags=['egusi']
+        )
+        self.finder = StoreFinder()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_nearby_requests_share_cache_entry(self):
+        """Test a second user in the same area is served from cache with their own distances"""
+        first = self.finder.find_stores_for_ingredient(LAT, LNG, 'Egusi')
+
+        with self.assertNumQueries(0):
+            second = self.finder.find_stores_for_ingredient(LAT + 0.005, LNG, 'egusi  (ground)')
+
+        self.assertEqual(first['stores'][0]['name'], second['stores'][0]['name'])
+        self.assertNotEqual(first['stores'][0]['distance'], second['stores'][0]['distance'])
+
+    @patch('dashboard.services.store_finder.refresh_store_search_async.delay')
+    def test_stale_entry_is_served_while_revalidating(self, mock_delay):
+        """Test stale results are returned immediately and refreshed once in the background"""
+        self.finder.find_stores_for_ingredient(LAT, LNG, 'egusi')
+        with patch('dashboard.services.store_finder.time.time', return_value=time.time() + StoreFinder.FRESH_FOR + 1):
+            result = self.finder.find_stores_for_ingredient(LAT, LNG, 'egusi')
+            self.finder.find_stores_for_ingredient(LAT, LNG, 'egusi')
+
+        self.assertEqual(result['stores'][0]['name'], 'Afro Foods')
+        mock_delay.assert_called_once()
+
+    def test_failures_are_cached(self):
+        """Test a failing search isn't retried on every request"""
+        with patch.object(Store, 'nearest', side_effect=Exception('db down')) as mock_nearest:
+            first = self.finder.find_stores_for_ingredient(LAT, LNG, 'egusi')
+            self.finder.find_stores_for_ingredient(LAT, LNG, 'egusi')
+
+        self.assertEqual(first['stores'][0]['name'], 'Local African Food Store')
+        mock_nearest.assert_called_once()
+
+    @patch('dashboard.services.store_finder.llm_clients.gemini')
+    def test_gemini_fallback_is_cached(self, mock_client):
+        """Test an area outside the table asks Gemini once and caches its answer"""
+        mock_client.return_value.models.generate_content.return_value = MagicMock(text=json.dumps({
+            'stores': [{'name': 'Manchester Afro Mart', 'type': 'African Store', 'address': 'Moss Side',
+                        'distance': '0.8 miles', 'likely_in_stock': True}]
+        }))
+
+        self.finder.find_stores_for_ingredient(53.4808, -2.2426, 'egusi')
+        result = self.finder.find_stores_for_ingredient(53.4808, -2.2426, 'egusi')
+
+        self.assertEqual(result['stores'][0]['name'], 'Manchester Afro Mart')
+        mock_client.return_value.models.generate_content.assert_called_once()
+
+    @patch('dashboard.services.store_finder.llm_clients.gemini')
+    def test_gemini_failures_are_cached(self, mock_client):
+        """Test a failing Gemini fallback isn't retried on every request"""
+        mock_client.return_value.models.generate_content.side_effect = Exception('quota exceeded')
+
+        first = self.finder.find_stores_for_ingredient(53.4808, -2.2426, 'egusi')
+        self.finder.find_stores_for_ingredient(53.4808, -2.2426, 'egusi')
+
+        self.assertEqual(first['stores'][0]['name'], 'Local African Food Store')
+        mock_client.return_value.models.generate_content.assert_called_once()
+
+
+class ImportStoresCommandTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmpdir.name, 'stores.csv')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def import_csv(self, content, *args):
+        with open(self.csv_path, 'w') as f:
+            f.write(content)
+        out = StringIO()
+        call_command('import_stores', self.csv_path, *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_import_creates_and_updates_stores(self):
+        """Test stores are loaded, indexed and updated in place on re-import"""
+        self.import_csv(
+            'name,store_type,address,latitude,longitude,ingredient_tags\n'
+            'Afro Foods,african,Manningham Lane,53.8030,-1.7600,Egusi;palm oil\n'
+            'Nowhere,spaceport,Mars,0,0,\n'
+        )
+        output = self.import_csv(
+            'name,store_type,address,latitude,longitude,ingredient_tags\n'
+            'Afro Foods,african,Manningham Lane,53.8031,-1.7600,\n'
+        )
+
+        store = Store.objects.get()
+        self.assertEqual(store.latitude, 53.8031)
+        self.assertEqual(store.geohash, geohash_encode(53.8031, -1.7600))
+        self.assertEqual(store.ingredient_tags, ['egusi', 'palm oil'])
+        self.assertIn('0 created, 1 updated', output)
+        self.assertEqual([s for s, _ in Store.nearest(LAT, LNG)], [store])
+
+    def test_deactivate_missing(self):
+        """Test stores dropped from the directory stop showing up in searches"""
+        Store.objects.create(name='Closed Shop', store_type='market', address='Kirkgate', latitude=LAT, longitude=LNG)
+
+        self.import_csv('name,store_type,address,latitude,longitude\n', '--deactivate-missing')
+
+        self.assertEqual(Store.nearest(LAT, LNG), [])
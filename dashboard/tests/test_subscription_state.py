@@ -0,0 +1,110 @@
+# dashboard/tests/test_subscription_state.py
+import json
+from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.utils import timezone
+from unittest.mock import patch
+from datetime import timedelta
+
+from dashboard.context_processors import subscription_status
+from dashboard.decorators import check_subscription_limits
+from dashboard.middleware import SubscriptionMiddleware
+from dashboard.models import MealPlan, SubscriptionTier, UserSubscription
+from dashboard.utils.subscription import SubscriptionState, get_subscription_state
+from dashboard.views import gemini_chat
+
+
+class SubscriptionStateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        cache.clear()
+
+    def subscribe(self, tier_type):
+        tier = SubscriptionTier.objects.create(
+            name=tier_type.title(),
+            tier_type=tier_type,
+            price=12.99,
+            description=f'{tier_type} plan',
+            stripe_product_id='prod_123'
+        )
+        return UserSubscription.objects.create(
+            user=self.user,
+            subscription_tier=tier,
+            end_date=timezone.now() + timedelta(days=7)
+        )
+
+    def get_request(self):
+        request = self.factory.get('/')
+        request.user = self.user
+        return SubscriptionMiddleware(lambda req: req)(request)
+
+    def test_cached_subscription_expires_on_time(self):
+        """Test a cached subscription stops granting access once its end date passes"""
+        subscription = self.subscribe('weekly')
+        self.assertEqual(SubscriptionState(self.user).subscription, subscription)
+
+        with patch('django.utils.timezone.now', return_value=subscription.end_date + timedelta(seconds=1)):
+            self.assertIsNone(SubscriptionState(self.user).subscription)
+
+    def test_state_is_resolved_once_per_request(self):
+        """Test the context processor and decorators share one lookup"""
+        MealPlan.objects.create(user=self.user, name='Plan', description='[]')
+        request = self.get_request()
+
+        with self.assertNumQueries(2):  # subscription + meal plan count
+            context = subscription_status(request)
+            check_subscription_limits(lambda view, req: 'ok')(None, request)
+            get_subscription_state(request).meal_plans_remaining
+
+        self.assertEqual(context['meal_plans_used'], 1)
+        self.assertEqual(context['meal_plans_remaining'], 2)
+        self.assertEqual(context['subscription_type'], 'free')
+
+    def test_weekly_subscription_context(self):
+        """Test a weekly subscriber gets premium entitlements"""
+        subscription = self.subscribe('weekly')
+
+        context = subscription_status(self.get_request())
+
+        self.assertEqual(context['subscription'], subscription)
+        self.assertTrue(context['is_premium'])
+        self.assertTrue(context['can_use_gemini'])
+        self.assertIsNone(context['meal_plans_remaining'])
+
+    def test_state_attached_without_middleware(self):
+        """Test consumers still work when the middleware didn't run"""
+        request = self.factory.get('/')
+        request.user = self.user
+
+        state = get_subscription_state(request)
+
+        self.assertIsInstance(state, SubscriptionState)
+        self.assertIs(get_subscription_state(request), state)
+
+    @patch('dashboard.views.assistant.GeminiAssistant')
+    def test_gemini_chat_access(self, mock_assistant):
+        """Test the feature decorator works on function views"""
+        mock_assistant.return_value.chat.return_value = 'Hello'
+
+        def post_chat():
+            request = self.factory.post(
+                '/', data=json.dumps({'message': 'Hi'}), content_type='application/json',
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+            )
+            request.user = self.user
+            request.session = {}
+            request._messages = FallbackStorage(request)
+            return gemini_chat(request)
+
+        self.assertEqual(post_chat().status_code, 403)
+
+        self.subscribe('weekly')
+        response = post_chat()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['message'], 'Hello')
@@ -0,0 +1,123 @@
+# dashboard/tests/test_tiered_cache.py
+import pickle
+import tempfile
+import threading
+import time
+from django.test import TestCase, override_settings
+from django.core.cache import caches
+
+from dashboard.utils.tiered_cache import TieredCache
+
+
+def worker_cache(**options):
+    """A TieredCache as one worker process would see it"""
+    return TieredCache('shared', {'OPTIONS': {'SYNC_INTERVAL': 0, **options}})
+
+
+class TieredCacheTest(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.worker_a = worker_cache()
+        self.worker_b = worker_cache()
+
+    def tearDown(self):
+        caches['shared'].clear()
+
+    def test_values_are_shared_between_workers(self):
+        """Test a value set by one worker is read by another"""
+        self.worker_a.set('greeting', {'text': 'hello'})
+
+        self.assertEqual(self.worker_b.get('greeting'), {'text': 'hello'})
+
+    def test_local_tier_serves_repeat_reads(self):
+        """Test repeat reads are served without touching the shared tier"""
+        self.worker_a.set('greeting', 'hello')
+        self.worker_b.get('greeting')
+        caches['shared'].set('greeting', 'changed behind the cache')
+
+        self.assertEqual(self.worker_b.get('greeting'), 'hello')
+
+    def test_delete_is_broadcast_to_other_workers(self):
+        """Test a delete on one worker evicts other workers' local copies"""
+        self.worker_a.set('user_recipes_1', ['Jollof'])
+        self.assertEqual(self.worker_b.get('user_recipes_1'), ['Jollof'])
+
+        self.worker_a.delete('user_recipes_1')
+
+        self.assertIsNone(self.worker_b.get('user_recipes_1'))
+
+    def test_set_is_broadcast_to_other_workers(self):
+        """Test an overwrite on one worker is seen by the others"""
+        self.worker_a.set('rate', 1)
+        self.worker_b.get('rate')
+
+        self.worker_a.set('rate', 2)
+
+        self.assertEqual(self.worker_b.get('rate'), 2)
+
+    def test_lagging_worker_drops_local_tier(self):
+        """Test a worker that fell behind the invalidation log clears its local tier"""
+        worker = worker_cache(INVALIDATION_LOG_SIZE=2)
+        self.worker_a.set('stale', 'old')
+        worker.get('stale')
+        caches['shared'].set('stale', 'new')
+
+        for i in range(3):
+            self.worker_a.delete(f'other_{i}')
+
+        self.assertEqual(worker.get('stale'), 'new')
+
+    def test_local_values_are_copies(self):
+        """Test mutating a returned value doesn't change the cached one"""
+        self.worker_a.set('pool', [1])
+        self.worker_a.get('pool').append(2)
+
+        self.assertEqual(self.worker_a.get('pool'), [1])
+
+    def test_local_tier_is_bounded(self):
+        """Test the local tier evicts least recently used entries"""
+        worker = worker_cache(LOCAL_MAX_ENTRIES=2)
+        for key in ('a', 'b', 'c'):
+            worker.set(key, key)
+
+        self.assertEqual(list(worker._local), [
+            worker._local_key('b'), worker._local_key('c')
+        ])
+
+    def test_counters_are_not_broadcast(self):
+        """Test increments skip the local tier and leave other workers' entries alone"""
+        self.worker_a.set('greeting', 'hello')
+        self.worker_b.get('greeting')
+        sequence = caches['shared'].get(TieredCache.SEQUENCE_KEY)
+
+        self.worker_a.add('hits', 0)
+        for _ in range(5):
+            self.worker_a.incr('hits')
+
+        self.assertEqual(caches['shared'].get(TieredCache.SEQUENCE_KEY), sequence)
+        self.assertNotIn(self.worker_a._local_key('hits'), self.worker_a._local)
+        self.assertEqual(self.worker_b.get('greeting'), 'hello')
+        self.assertIn(self.worker_b._local_key('greeting'), self.worker_b._local)
+        self.assertEqual(caches['shared'].get('hits'), 5)
+
+    def test_file_based_counters_are_atomic(self):
+        """Test concurrent increments on the file-based shared tier are all counted and keep the expiry"""
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(CACHES={
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir},
+        }):
+            worker = worker_cache()
+            worker.add('hits', 0, 60)
+
+            def hammer():
+                for _ in range(20):
+                    worker.incr('hits')
+
+            threads = [threading.Thread(target=hammer) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(caches['shared'].get('hits'), 100)
+            with open(caches['shared']._key_to_file('hits'), 'rb') as f:
+                self.assertLessEqual(pickle.load(f), time.time() + 60)
@@ -2,6 +2,7 @@
 from django.test import TestCase, Client, RequestFactory
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 from unittest.mock import patch, MagicMock
 from datetime import timedelta
@@ -102,7 +103,7 @@ class MealGeneratorViewTest(ViewTestMixin, TestCase):
         self.assertTemplateUsed(response, 'meal_generator.html')
         self.assertTrue(response.context['has_subscription'])
     
-    @patch('dashboard.views.client.completions.create')
+    @patch('dashboard.views.meal_generator.llm_clients.openai')
     @patch('dashboard.views.MealGeneratorView._has_active_subscription')
     def test_meal_generator_post(self, mock_has_subscription, mock_openai):
         """Test meal generator POST view"""
@@ -163,6 +164,92 @@ class MealGeneratorViewTest(ViewTestMixin, TestCase):
         self.assertFalse(response_data['success'])
         self.assertTrue(response_data['requires_upgrade'])
 
+class MealGeneratorAsyncTest(ViewTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    @patch('dashboard.views.meal_generator.generate_meal_plan_async.delay')
+    def test_post_returns_job_id(self, mock_delay):
+        """Test meal generation is enqueued and returns a job id"""
+        mock_delay.return_value = MagicMock(id='job-123', ready=MagicMock(return_value=False))
+
+        response = self.client.post(reverse('meal_generator'), {
+            'dietary_preferences': 'igbo_traditional',
+            'meals_per_day': '3',
+            'plan_days': '3'
+        })
+
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertEqual(data['task_id'], 'job-123')
+        self.assertEqual(data['status_url'], reverse('check_task_status', args=['job-123']))
+
+        user_id, form_data = mock_delay.call_args[0]
+        self.assertEqual(user_id, self.user.id)
+        self.assertEqual(form_data['dietary_preferences'], 'igbo_traditional')
+
+    @patch('dashboard.views.jobs.AsyncResult')
+    def test_task_status_progress(self, mock_result):
+        """Test the status endpoint reports stage and progress"""
+        mock_result.return_value = MagicMock(
+            state='PROGRESS',
+            info={'stage': 'generating', 'progress': 30, 'user_id': self.user.id}
+        )
+
+        data = self.client.get(reverse('check_task_status', args=['job-123'])).json()
+
+        self.assertEqual(data['status'], 'processing')
+        self.assertEqual(data['stage'], 'generating')
+        self.assertEqual(data['progress'], 30)
+
+    @patch('dashboard.views.jobs.AsyncResult')
+    def test_task_status_complete(self, mock_result):
+        """Test the status endpoint returns the finished meal plan"""
+        result = {'success': True, 'meal_plan_id': 1, 'meal_plan': [], 'user_id': self.user.id}
+        mock_result.return_value = MagicMock(state='SUCCESS', info=result, result=result)
+
+        data = self.client.get(reverse('check_task_status', args=['job-123'])).json()
+
+        self.assertEqual(data['status'], 'complete')
+        self.assertEqual(data['meal_plan_id'], 1)
+
+    @patch('dashboard.views.jobs.AsyncResult')
+    def test_task_status_hides_other_users_jobs(self, mock_result):
+        """Test users can't poll jobs they didn't enqueue"""
+        mock_result.return_value = MagicMock(
+            state='PROGRESS',
+            info={'stage': 'generating', 'progress': 30, 'user_id': self.user.id + 1}
+        )
+
+        response = self.client.get(reverse('check_task_status', args=['job-123']))
+        self.assertEqual(response.status_code, 404)
+
+    @patch('dashboard.views.jobs.AsyncResult')
+    def test_task_status_hides_jobs_without_owner(self, mock_result):
+        """Test results that name no user (e.g. cache refreshes) aren't readable"""
+        result = {'success': True, 'cell': 'gcpvj'}
+        mock_result.return_value = MagicMock(state='SUCCESS', info=result, result=result)
+
+        response = self.client.get(reverse('check_task_status', args=['job-123']))
+        self.assertEqual(response.status_code, 404)
+
+    @patch('dashboard.views.jobs.AsyncResult')
+    @patch('dashboard.views.meal_generator.generate_meal_plan_async.delay')
+    def test_queued_job_is_pollable_by_owner(self, mock_delay, mock_result):
+        """Test a job still waiting for a worker reports as processing to the user who enqueued it"""
+        mock_delay.return_value = MagicMock(id='job-123', ready=MagicMock(return_value=False))
+        mock_result.return_value = MagicMock(state='PENDING', info=None)
+        self.client.post(reverse('meal_generator'), {'dietary_preferences': 'balanced', 'plan_days': '1'})
+
+        data = self.client.get(reverse('check_task_status', args=['job-123'])).json()
+
+        self.assertEqual(data['status'], 'processing')
+        self.assertEqual(data['stage'], 'queued')
+
 class CheckoutViewTest(ViewTestMixin, TestCase):
     def setUp(self):
         super().setUp()
@@ -184,8 +271,8 @@ class CheckoutViewTest(ViewTestMixin, TestCase):
         self.assertTemplateUsed(response, 'checkout.html')
         self.assertEqual(response.context['tier'], self.tier)
     
-    @patch('dashboard.views.stripe.Customer.create')
-    @patch('dashboard.views.stripe.Subscription.create')
+    @patch('stripe.Customer.create')
+    @patch('stripe.Subscription.create')
     def test_checkout_view_post_monthly(self, mock_subscription, mock_customer):
         """Test checkout view POST for monthly subscription"""
         # Mock Stripe responses
@@ -10,7 +10,8 @@ def get_or_set_cache(key, callback, timeout=None):
     value = cache.get(key)
     if value is None:
         value = callback()
-        cache.set(key, value, timeout or settings.CACHE_TIMEOUTS['medium'])
+        if value is not None:
+            cache.set(key, value, timeout or settings.CACHE_TIMEOUTS['medium'])
     return value
 
 def invalidate_user_caches(user_id):
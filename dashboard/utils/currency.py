@@ -1,14 +1,11 @@
 # dashboard/utils/currency.py
 
-import requests
-from django.conf import settings
-from django.core.cache import cache
+from .geoip import ip_currency
+from .rate_limit import client_ip
+from ..services.exchange_rates import exchange_rates
 from typing import Dict, Any
 
 class CurrencyManager:
-    CACHE_KEY = 'currency_rates'
-    CACHE_TIMEOUT = 3600  # 1 hour
-
     PRICES = {
         'pay_once': {'GBP': 5.99, 'USD': 7.99, 'EUR': 6.99, 'NGN': 3500},
         'weekly': {'GBP': 12.99, 'USD': 16.99, 'EUR': 14.99, 'NGN': 7500},
@@ -30,9 +27,7 @@ class CurrencyManager:
 
         try:
             # Use IP-based geolocation
-            response = requests.get('https://ipapi.co/json/', timeout=5)
-            data = response.json()
-            currency = data.get('currency', 'GBP')
+            currency = ip_currency.currency_for_ip(client_ip(request), default='GBP')
 
             # Store in session
             request.session['user_currency'] = currency
@@ -44,29 +39,23 @@ class CurrencyManager:
 
     @classmethod
     def get_exchange_rates(cls) -> Dict[str, float]:
-        """Get current exchange rates from cache or API"""
-        rates = cache.get(cls.CACHE_KEY)
-
-        if rates is None:
-            try:
-                api_key = settings.EXCHANGE_RATE_API_KEY
-                response = requests.get(
-                    f'https://api.exchangerate-api.com/v4/latest/GBP',
-                    timeout=5
-                )
-                rates = response.json()['rates']
-                cache.set(cls.CACHE_KEY, rates, cls.CACHE_TIMEOUT)
-            except Exception as e:
-                # Log the error if needed
-                print(f"Exchange rate API error: {str(e)}")
-                # Fallback rates
-                rates = {'GBP': 1, 'USD': 1.25, 'EUR': 1.15, 'NGN': 583}
-
-        return rates
+        """Get current exchange rates from the per-process rates snapshot"""
+        return exchange_rates.rates()
 
     @classmethod
     def get_price_data(cls, currency: str) -> Dict[str, Any]:
         """Get complete price data including symbols and formatted prices"""
+        # Imported here to avoid a circular import (price_matrix -> currency)
+        from ..services.price_matrix import PriceMatrix
+
+        price_data = PriceMatrix.get()['plans'].get(currency)
+        if price_data is None:
+            price_data = cls.compute_price_data(currency)
+        return price_data
+
+    @classmethod
+    def compute_price_data(cls, currency: str) -> Dict[str, Any]:
+        """Compute price data for one currency (precomputed by PriceMatrix)"""
         # Use predefined prices if available
         if currency in cls.PRICES['pay_once']:
             prices = {
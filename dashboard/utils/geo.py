@@ -0,0 +1,98 @@
+# dashboard/utils/geo.py
+
+import math
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+KM_PER_MILE = 1.609344
+MAX_PRECISION = 9
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_BASE32_INDEX = {char: index for index, char in enumerate(_BASE32)}
+
+
+def geohash_encode(lat: float, lng: float, precision: int = MAX_PRECISION) -> str:
+    """Geohash of a point; nearby points share prefixes"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, interval = (lng, lng_range) if even else (lat, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) of a geohash cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = _BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if (bits >> shift) & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def geohash_neighbors(geohash: str) -> List[str]:
+    """The cell itself plus its (up to) eight surrounding cells"""
+    min_lat, max_lat, min_lng, max_lng = geohash_bounds(geohash)
+    height, width = max_lat - min_lat, max_lng - min_lng
+    center_lat, center_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+    cells = []
+    for dlat in (-1, 0, 1):
+        lat = center_lat + dlat * height
+        if not -90 <= lat <= 90:
+            continue
+        for dlng in (-1, 0, 1):
+            lng = (center_lng + dlng * width + 180) % 360 - 180
+            cell = geohash_encode(lat, lng, len(geohash))
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def cell_size_km(precision: int, lat: float) -> Tuple[float, float]:
+    """(height, width) in km of a geohash cell at ``precision`` near ``lat``"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    height = 180 / 2 ** lat_bits * KM_PER_DEGREE
+    width = 360 / 2 ** lng_bits * KM_PER_DEGREE * math.cos(math.radians(lat))
+    return height, width
+
+
+def precision_for_radius(radius_km: float, lat: float) -> int:
+    """Finest precision whose 3x3 neighbourhood around ``lat`` still covers ``radius_km``"""
+    for precision in range(MAX_PRECISION, 0, -1):
+        if min(cell_size_km(precision, lat)) >= radius_km:
+            return precision
+    return 1
+
+
+def haversine_km(lat: float, lng: float, lats, lngs) -> 'np.ndarray':
+    """Vectorized great-circle distances from one point to arrays of points"""
+    import numpy as np  # Deferred so importing the models doesn't load numpy
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lngs, dtype=float))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
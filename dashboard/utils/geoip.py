@@ -0,0 +1,229 @@
+# dashboard/utils/geoip.py
+
+import csv
+import ipaddress
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+# ISO 3166 country code -> ISO 4217 currency code
+COUNTRY_CURRENCIES = {
+    'AD': 'EUR', 'AE': 'AED', 'AF': 'AFN', 'AG': 'XCD', 'AI': 'XCD', 'AL': 'ALL', 'AM': 'AMD',
+    'AO': 'AOA', 'AR': 'ARS', 'AS': 'USD', 'AT': 'EUR', 'AU': 'AUD', 'AW': 'AWG', 'AX': 'EUR',
+    'AZ': 'AZN', 'BA': 'BAM', 'BB': 'BBD', 'BD': 'BDT', 'BE': 'EUR', 'BF': 'XOF', 'BG': 'BGN',
+    'BH': 'BHD', 'BI': 'BIF', 'BJ': 'XOF', 'BL': 'EUR', 'BM': 'BMD', 'BN': 'BND', 'BO': 'BOB',
+    'BQ': 'USD', 'BR': 'BRL', 'BS': 'BSD', 'BT': 'BTN', 'BW': 'BWP', 'BY': 'BYN', 'BZ': 'BZD',
+    'CA': 'CAD', 'CD': 'CDF', 'CF': 'XAF', 'CG': 'XAF', 'CH': 'CHF', 'CI': 'XOF', 'CK': 'NZD',
+    'CL': 'CLP', 'CM': 'XAF', 'CN': 'CNY', 'CO': 'COP', 'CR': 'CRC', 'CU': 'CUP', 'CV': 'CVE',
+    'CW': 'ANG', 'CY': 'EUR', 'CZ': 'CZK', 'DE': 'EUR', 'DJ': 'DJF', 'DK': 'DKK', 'DM': 'XCD',
+    'DO': 'DOP', 'DZ': 'DZD', 'EC': 'USD', 'EE': 'EUR', 'EG': 'EGP', 'ER': 'ERN', 'ES': 'EUR',
+    'ET': 'ETB', 'FI': 'EUR', 'FJ': 'FJD', 'FK': 'FKP', 'FM': 'USD', 'FO': 'DKK', 'FR': 'EUR',
+    'GA': 'XAF', 'GB': 'GBP', 'GD': 'XCD', 'GE': 'GEL', 'GF': 'EUR', 'GG': 'GBP', 'GH': 'GHS',
+    'GI': 'GIP', 'GL': 'DKK', 'GM': 'GMD', 'GN': 'GNF', 'GP': 'EUR', 'GQ': 'XAF', 'GR': 'EUR',
+    'GT': 'GTQ', 'GU': 'USD', 'GW': 'XOF', 'GY': 'GYD', 'HK': 'HKD', 'HN': 'HNL', 'HR': 'EUR',
+    'HT': 'HTG', 'HU': 'HUF', 'ID': 'IDR', 'IE': 'EUR', 'IL': 'ILS', 'IM': 'GBP', 'IN': 'INR',
+    'IQ': 'IQD', 'IR': 'IRR', 'IS': 'ISK', 'IT': 'EUR', 'JE': 'GBP', 'JM': 'JMD', 'JO': 'JOD',
+    'JP': 'JPY', 'KE': 'KES', 'KG': 'KGS', 'KH': 'KHR', 'KI': 'AUD', 'KM': 'KMF', 'KN': 'XCD',
+    'KP': 'KPW', 'KR': 'KRW', 'KW': 'KWD', 'KY': 'KYD', 'KZ': 'KZT', 'LA': 'LAK', 'LB': 'LBP',
+    'LC': 'XCD', 'LI': 'CHF', 'LK': 'LKR', 'LR': 'LRD', 'LS': 'LSL', 'LT': 'EUR', 'LU': 'EUR',
+    'LV': 'EUR', 'LY': 'LYD', 'MA': 'MAD', 'MC': 'EUR', 'MD': 'MDL', 'ME': 'EUR', 'MF': 'EUR',
+    'MG': 'MGA', 'MH': 'USD', 'MK': 'MKD', 'ML': 'XOF', 'MM': 'MMK', 'MN': 'MNT', 'MO': 'MOP',
+    'MP': 'USD', 'MQ': 'EUR', 'MR': 'MRU', 'MS': 'XCD', 'MT': 'EUR', 'MU': 'MUR', 'MV': 'MVR',
+    'MW': 'MWK', 'MX': 'MXN', 'MY': 'MYR', 'MZ': 'MZN', 'NA': 'NAD', 'NC': 'XPF', 'NE': 'XOF',
+    'NG': 'NGN', 'NI': 'NIO', 'NL': 'EUR', 'NO': 'NOK', 'NP': 'NPR', 'NR': 'AUD', 'NU': 'NZD',
+    'NZ': 'NZD', 'OM': 'OMR', 'PA': 'PAB', 'PE': 'PEN', 'PF': 'XPF', 'PG': 'PGK', 'PH': 'PHP',
+    'PK': 'PKR', 'PL': 'PLN', 'PM': 'EUR', 'PR': 'USD', 'PS': 'ILS', 'PT': 'EUR', 'PW': 'USD',
+    'PY': 'PYG', 'QA': 'QAR', 'RE': 'EUR', 'RO': 'RON', 'RS': 'RSD', 'RU': 'RUB', 'RW': 'RWF',
+    'SA': 'SAR', 'SB': 'SBD', 'SC': 'SCR', 'SD': 'SDG', 'SE': 'SEK', 'SG': 'SGD', 'SH': 'SHP',
+    'SI': 'EUR', 'SK': 'EUR', 'SL': 'SLE', 'SM': 'EUR', 'SN': 'XOF', 'SO': 'SOS', 'SR': 'SRD',
+    'SS': 'SSP', 'ST': 'STN', 'SV': 'USD', 'SX': 'ANG', 'SY': 'SYP', 'SZ': 'SZL', 'TC': 'USD',
+    'TD': 'XAF', 'TG': 'XOF', 'TH': 'THB', 'TJ': 'TJS', 'TL': 'USD', 'TM': 'TMT', 'TN': 'TND',
+    'TO': 'TOP', 'TR': 'TRY', 'TT': 'TTD', 'TV': 'AUD', 'TW': 'TWD', 'TZ': 'TZS', 'UA': 'UAH',
+    'UG': 'UGX', 'US': 'USD', 'UY': 'UYU', 'UZ': 'UZS', 'VA': 'EUR', 'VC': 'XCD', 'VE': 'VES',
+    'VG': 'USD', 'VI': 'USD', 'VN': 'VND', 'VU': 'VUV', 'WF': 'XPF', 'WS': 'WST', 'XK': 'EUR',
+    'YE': 'YER', 'YT': 'EUR', 'ZA': 'ZAR', 'ZM': 'ZMW', 'ZW': 'USD',
+}
+
+
+def _ipv4_int(value: str) -> Optional[int]:
+    """IPv4 address (dotted or integer form) as an int; None for IPv6 or junk"""
+    value = value.strip()
+    if value.isdigit():
+        number = int(value)
+        return number if number < 2 ** 32 else None
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+    if address.version == 6:
+        address = address.ipv4_mapped
+        if address is None:
+            return None
+    return int(address)
+
+
+def _pack_country(code: str) -> int:
+    return (ord(code[0]) << 8) | ord(code[1])
+
+
+def _unpack_country(value: int) -> str:
+    return chr(value >> 8) + chr(value & 0xFF)
+
+
+def build_ip_country_db(csv_path: str, db_path: str) -> int:
+    """Compile an IP range CSV into the sorted range table used for lookups.
+
+    Accepts ``start,end,country`` rows with dotted (DB-IP) or integer
+    (IP2Location) addresses. IPv6 rows are skipped, and adjacent ranges of the
+    same country are merged. The table is a (3, n) uint32 ``.npy`` of range
+    starts, range ends and packed country codes, so each row is contiguous
+    when memory-mapped. Returns the number of ranges written.
+    """
+    import numpy as np
+
+    rows = []
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 3:
+                continue
+            start, end = _ipv4_int(row[0]), _ipv4_int(row[1])
+            country = row[2].strip().upper()
+            if start is None or end is None or len(country) != 2 or not country.isalpha():
+                continue
+            rows.append((start, end, _pack_country(country)))
+
+    rows.sort()
+    merged: List[List[int]] = []
+    for start, end, country in rows:
+        if merged and merged[-1][2] == country and merged[-1][1] + 1 >= start:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end, country])
+
+    table = np.ascontiguousarray(np.array(merged, dtype=np.uint32).reshape(-1, 3).T)
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    tmp_path = f"{db_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, table)
+    os.replace(tmp_path, db_path)
+    return len(merged)
+
+
+class IPCountryDatabase:
+    """Memory-mapped range table; lookups are a binary search over range starts"""
+
+    def __init__(self, path: str):
+        import numpy as np
+
+        table = np.load(path, mmap_mode='r')
+        self.starts, self.ends, self.countries = table[0], table[1], table[2]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def lookup(self, ip: int) -> Optional[str]:
+        index = int(self.starts.searchsorted(ip, side='right')) - 1
+        if index >= 0 and ip <= int(self.ends[index]):
+            return _unpack_country(int(self.countries[index]))
+        return None
+
+
+class IPCurrencyResolver:
+    """Resolve client IPs to a country and currency without a network call.
+
+    The range table at ``GEOIP_DB_PATH`` is built ahead of time by the
+    ``build_ip_country_db`` command; without it only the API is available.
+    ``ipapi.co`` is only consulted for addresses the table doesn't cover, and
+    only when ``GEOIP_API_FALLBACK`` is enabled.
+    """
+
+    API_CACHE_TIMEOUT = 86400  # 24 hours
+
+    def __init__(self, db_path=None, api_fallback=None):
+        self._db_path = db_path
+        self._api_fallback = api_fallback
+        self._db = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def api_fallback(self) -> bool:
+        if self._api_fallback is None:
+            return getattr(settings, 'GEOIP_API_FALLBACK', True)
+        return self._api_fallback
+
+    def _load(self) -> Optional[IPCountryDatabase]:
+        db_path = self._db_path or settings.GEOIP_DB_PATH
+        try:
+            # Never compiled here: workers would race on the file. See build_ip_country_db.
+            if os.path.exists(db_path):
+                return IPCountryDatabase(db_path)
+            logger.warning(
+                f"No IP country database at {db_path}; offline geolocation disabled "
+                f"(run manage.py build_ip_country_db)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to load IP country database: {str(e)}")
+        return None
+
+    @property
+    def db(self) -> Optional[IPCountryDatabase]:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._db = self._load()
+                    self._loaded = True
+        return self._db
+
+    def reload(self):
+        with self._lock:
+            self._loaded = False
+
+    def _api_country(self, ip: str) -> Optional[str]:
+        cache_key = f'geoip_country_{ip}'
+        country = cache.get(cache_key)
+        if country is None:
+            try:
+                response = http_client.get(f'https://ipapi.co/{ip}/country/')
+                country = response.text.strip().upper() if response.status_code == 200 else ''
+            except Exception as e:
+                logger.warning(f"IP geolocation API failed: {str(e)}")
+                return None
+            cache.set(cache_key, country if len(country) == 2 else '', self.API_CACHE_TIMEOUT)
+        return country or None
+
+    def country_for_ip(self, ip: Optional[str]) -> Optional[str]:
+        """ISO country code for ``ip``, or None if it can't be resolved"""
+        if not ip:
+            return None
+        try:
+            address = ipaddress.ip_address(ip.strip())
+        except ValueError:
+            return None
+        if not address.is_global:
+            return None
+
+        ip_int = _ipv4_int(str(address))
+        if ip_int is not None and self.db is not None:
+            country = self.db.lookup(ip_int)
+            if country:
+                return country
+
+        if self.api_fallback:
+            return self._api_country(str(address))
+        return None
+
+    def currency_for_ip(self, ip: Optional[str], default: Optional[str] = None) -> Optional[str]:
+        """Local currency for ``ip``, or ``default`` if it can't be resolved"""
+        return COUNTRY_CURRENCIES.get(self.country_for_ip(ip), default)
+
+
+ip_currency = IPCurrencyResolver()
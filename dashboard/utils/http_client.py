@@ -0,0 +1,125 @@
+# dashboard/utils/http_client.py
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: after ``failure_threshold`` consecutive failures, calls
+    are refused for ``reset_timeout`` seconds. After that, one trial call is
+    let through, and its result closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._opened_at = time.monotonic()  # Half-open: one trial per reset period
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class OutboundHTTPClient:
+    """
+    Shared client for third-party HTTP calls. It provides:
+    - a keep-alive connection pool
+    - per-host (connect, read) timeouts, so no call can block a worker forever
+    - retries with full-jitter exponential backoff for idempotent requests
+    - a circuit breaker per host
+    """
+
+    DEFAULT_TIMEOUT = (3.05, 5)
+    HOST_TIMEOUTS = {
+        'ipapi.co': (2, 3),
+        'api.freecurrencyapi.com': (3.05, 5),
+        'api.exchangerate-api.com': (3.05, 5),
+    }
+    MAX_RETRIES = 2
+    BACKOFF_BASE = 0.25
+    BACKOFF_CAP = 2.0
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    RETRY_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+    def __init__(self, pool_maxsize=20):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._breakers = {}
+        self._breakers_lock = threading.Lock()
+
+    def breaker_for(self, host):
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    def request(self, method, url, **kwargs):
+        host = urlparse(url).hostname
+        kwargs.setdefault('timeout', self.HOST_TIMEOUTS.get(host, self.DEFAULT_TIMEOUT))
+        breaker = self.breaker_for(host)
+        attempts = 1 + (self.MAX_RETRIES if method.upper() in self.RETRY_METHODS else 0)
+
+        for attempt in range(attempts):
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit open for {host}")
+
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                if last_attempt:
+                    raise
+                logger.warning(f"{method} {host} failed ({str(e)}), retrying")
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                if last_attempt or response.status_code not in self.RETRY_STATUSES:
+                    return response
+                logger.warning(f"{method} {host} returned {response.status_code}, retrying")
+
+            time.sleep(random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt)))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+http_client = OutboundHTTPClient()
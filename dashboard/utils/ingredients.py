@@ -0,0 +1,70 @@
+# dashboard/utils/ingredients.py
+
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List
+
+# Common Nigerian/African ingredients keywords
+NIGERIAN_INGREDIENTS = (
+    "egusi", "ogbono", "uda", "uziza", "ehuru", "utazi", "ukazi",
+    "stockfish", "crayfish", "palm oil", "red oil", "locust beans", "iru",
+    "bitter leaf", "pounded yam", "garri", "fufu", "semolina", "efo",
+    "okra", "okro", "melon seeds", "pepper soup", "suya", "yam flour",
+    "plantain flour", "cassava flour", "ground melon", "dried fish",
+    "dried prawns", "periwinkle", "snail", "goat meat", "cow foot",
+    "cow skin", "kpomo", "dawadawa",
+)
+
+# Store suggestions the LLM appends to grocery items, e.g. "Garri (African store)"
+_PARENTHESES = re.compile(r'\s*\([^)]*\)')
+
+
+class IngredientMatcher:
+    """Keyword classifier compiled once into a single regex alternation.
+
+    Keywords match whole words (plurals included), longest first, so one
+    ``finditer`` scan finds every keyword in a text regardless of how many
+    keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        alternation = '|'.join(
+            r'[ \t]+'.join(re.escape(word) for word in keyword.split())
+            for keyword in sorted(set(keywords), key=len, reverse=True)
+        )
+        self.pattern = re.compile(rf'\b(?:{alternation})(?:e?s)?\b', re.IGNORECASE)
+
+    @staticmethod
+    def clean(text: str) -> str:
+        return _PARENTHESES.sub('', text).strip()
+
+    def classify(self, text: str) -> Dict:
+        """``{'name', 'is_nigerian'}`` for one ingredient line"""
+        name = self.clean(text)
+        return {'name': name, 'is_nigerian': self.pattern.search(name) is not None}
+
+    def classify_many(self, items: List[str]) -> List[Dict]:
+        """Classify a whole list with a single scan over the joined lines.
+
+        Returns ``{'text', 'name', 'is_nigerian'}`` per item, ``text`` being the item as given.
+        """
+        names = [self.clean(item) for item in items]
+        text = '\n'.join(names)
+
+        # Offset of each line in ``text``, to map matches back to items
+        starts, offset = [], 0
+        for name in names:
+            starts.append(offset)
+            offset += len(name) + 1
+
+        matched = [False] * len(names)
+        for match in self.pattern.finditer(text):
+            matched[bisect_right(starts, match.start()) - 1] = True
+
+        return [
+            {'text': item, 'name': name, 'is_nigerian': hit}
+            for item, name, hit in zip(items, names, matched)
+        ]
+
+
+nigerian_ingredients = IngredientMatcher(NIGERIAN_INGREDIENTS)
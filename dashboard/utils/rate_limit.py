@@ -0,0 +1,94 @@
+# dashboard/utils/rate_limit.py
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.cache import cache
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after: int = 0
+
+
+class SlidingWindowRateLimiter:
+    """
+    Sliding-window counter backed by atomic cache increments.
+
+    Each window gets its own counter. A request's count is the current
+    window's count plus the previous window's count, weighted by how much of
+    the previous window still overlaps the sliding window. Counters live in
+    the shared cache tier, so every worker sees the same totals, and they are
+    only ever changed with ``incr``, which is atomic on Redis.
+    """
+
+    KEY_PREFIX = 'rate_limit'
+
+    def __init__(self, scope: str, limit: int, window: int):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+
+    def _key(self, identity: str, window_index: int) -> str:
+        return f"{self.KEY_PREFIX}:{self.scope}:{self.window}:{identity}:{window_index}"
+
+    def _incr(self, key: str, delta: int) -> int:
+        # Counters outlive their window by one window so they can weigh the next one
+        cache.add(key, 0, self.window * 2)
+        try:
+            return cache.incr(key, delta)
+        except ValueError:  # Expired between add and incr
+            cache.add(key, 0, self.window * 2)
+            return cache.incr(key, delta)
+
+    def hit(self, identity: str, now: Optional[float] = None) -> RateLimitResult:
+        """Count a request and report whether it is within the limit"""
+        now = time.time() if now is None else now
+        window_index = int(now // self.window)
+        elapsed = now - window_index * self.window
+
+        current_key = self._key(identity, window_index)
+        current = self._incr(current_key, 1)
+        previous = cache.get(self._key(identity, window_index - 1), 0)
+
+        overlap = 1 - elapsed / self.window
+        count = previous * overlap + current
+        if count <= self.limit:
+            return RateLimitResult(True, int(self.limit - count))
+
+        # Rejected requests don't count against the user
+        self.release(identity, now)
+        current -= 1
+        return RateLimitResult(False, 0, self._retry_after(previous, current, elapsed))
+
+    def release(self, identity: str, now: float):
+        """Take back a request counted by ``hit`` at ``now``"""
+        self._incr(self._key(identity, int(now // self.window)), -1)
+
+    def _retry_after(self, previous: int, current: int, elapsed: float) -> int:
+        """Seconds until one more request would fit in the window"""
+        headroom = self.limit - 1 - current
+        if headroom < 0 or not previous:
+            wait = self.window - elapsed
+        else:
+            # Solve previous * (1 - (elapsed + t) / window) <= headroom for t
+            wait = self.window * (1 - headroom / previous) - elapsed
+        return max(1, math.ceil(wait))
+
+
+def client_ip(request) -> str:
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded_for:
+        return forwarded_for.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', 'unknown')
+
+
+def request_identity(request) -> str:
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.id}"
+    return f"ip:{client_ip(request)}"
@@ -0,0 +1,155 @@
+# dashboard/utils/response_formatter.py
+
+import re
+
+CONTAINER_OPEN = '<div class="space-y-4 text-gray-800">'
+CONTAINER_CLOSE = '</div>'
+PARAGRAPH_BREAK = '</div><div class="my-4">'
+TITLE_HTML = '<div class="text-2xl font-bold text-green-700 mb-4">{}</div>'
+SECTION_HTML = '<h3 class="text-xl font-semibold text-green-600 mt-6 mb-3">{} {}</h3>'
+BULLET_HTML = '<div class="ml-4 my-2">• {}</div>'
+NUMBERED_HTML = '<div class="ml-4 my-2">{}. {}</div>'
+LINK_CLASS = 'text-green-600 hover:text-green-800'
+
+_SECTION = re.compile(r'(I+V?\.|[IVX]+\.)\s*(.+)')
+_NUMBERED = re.compile(r'\s*(\d+)\.\s*(.*)')
+_VIDEO = re.compile(r'Watch this video:\s*([^:\n]+):\s*(https?://(?:www\.)?youtube\.com/watch\?v=[a-zA-Z0-9_-]+)')
+_VIDEO_SEARCH = re.compile(r'Search on YouTube for "(.[^"\n]+)"')
+_LOCATION = re.compile(r'([^:\n]+):\s*([^(\n]+)\s*\(([^)\n]+)\)')
+_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC = re.compile(r'\*(.*?)\*')
+_NOTE = re.compile(r'(Note:|Important:|Tip:)\s*(.*)')
+
+
+def _video_link(match) -> str:
+    return (
+        '<div class="flex items-center gap-2 my-2"><span class="text-red-600">▶</span>'
+        f'<a href="{match.group(2)}" target="_blank" class="{LINK_CLASS}">{match.group(1)}</a></div>'
+    )
+
+
+def _video_search_link(match) -> str:
+    return (
+        '<div class="flex items-center gap-2 my-2"><span class="text-red-600">▶</span>'
+        f'<a href="https://www.youtube.com/results?search_query={match.group(1)}" target="_blank" '
+        f'class="{LINK_CLASS}">Watch: {match.group(1)}</a></div>'
+    )
+
+
+def _location_link(match) -> str:
+    return (
+        f'<div class="flex items-center gap-2 my-2">📍 {match.group(1)}: '
+        f'<a href="https://www.google.com/maps/search/?api=1&query={match.group(3)}" '
+        f'target="_blank" class="{LINK_CLASS}">{match.group(2)} ({match.group(3)})</a></div>'
+    )
+
+
+def _note(match) -> str:
+    return (
+        f'<div class="bg-green-50 p-3 rounded-lg my-2">'
+        f'<span class="font-semibold">{match.group(1)}</span> {match.group(2)}</div>'
+    )
+
+
+class ResponseFormatter:
+    """Line-oriented HTML formatter for assistant replies.
+
+    Each line is classified once (title, section, bullet, numbered item or
+    text) and only the inline patterns it can contain are run on it, so a
+    reply is formatted in one pass over its lines. Constructs never span
+    lines: a pattern that would need a newline to match leaves the text as is.
+    """
+
+    def format(self, text: str) -> str:
+        body = '\n'.join(self.format_line(line) for line in text.split('\n'))
+        body = f'{CONTAINER_OPEN}{body}{CONTAINER_CLOSE}'
+        return body.replace('\n\n', PARAGRAPH_BREAK).replace('\n', ' ')
+
+    def stream(self) -> 'ResponseStream':
+        """An incremental formatter for a reply that arrives in chunks"""
+        return ResponseStream(self)
+
+    def format_line(self, line: str) -> str:
+        # Block level: title and section headers
+        if line.startswith('NAIJAPLATE:') and len(line) > 11:
+            line = TITLE_HTML.format(line)
+        elif line[:1] in ('I', 'V', 'X'):
+            match = _SECTION.match(line)
+            if match:
+                line = SECTION_HTML.format(match.group(1), match.group(2))
+
+        # Links
+        if 'Watch this video:' in line:
+            line = _VIDEO.sub(_video_link, line)
+        if 'Search on YouTube for "' in line:
+            line = _VIDEO_SEARCH.sub(_video_search_link, line)
+        if ':' in line and '(' in line:
+            line = _LOCATION.sub(_location_link, line)
+
+        # Lists
+        stripped = line.lstrip()
+        if stripped.startswith('*'):
+            line = BULLET_HTML.format(stripped[1:].lstrip())
+        elif stripped[:1].isdecimal():
+            match = _NUMBERED.match(line)
+            if match:
+                line = NUMBERED_HTML.format(match.group(1), match.group(2))
+
+        # Inline markdown
+        if '*' in line:
+            if '**' in line:
+                line = _BOLD.sub(r'<strong class="font-semibold">\1</strong>', line)
+            line = _ITALIC.sub(r'<em class="italic">\1</em>', line)
+        if 'Note:' in line or 'Important:' in line or 'Tip:' in line:
+            line = _NOTE.sub(_note, line, count=1)
+
+        return line
+
+
+class ResponseStream:
+    """Format a reply as it streams in, one completed line at a time.
+
+    ``feed``/``close`` return HTML fragments whose concatenation is exactly
+    ``ResponseFormatter.format`` of the whole text, so a client can append
+    them as they arrive.
+    """
+
+    def __init__(self, formatter: ResponseFormatter):
+        self.formatter = formatter
+        self._buffer = ''
+        self._newlines = 0
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed text and return the HTML for the lines it completed"""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        return self._open() + ''.join(self._emit(line, ended=True) for line in lines)
+
+    def close(self) -> str:
+        """Flush the last line and close the container"""
+        html = self._open() + self._emit(self._buffer, ended=False)
+        self._buffer = ''
+        return html + self._separator() + CONTAINER_CLOSE
+
+    def _open(self) -> str:
+        if self._started:
+            return ''
+        self._started = True
+        return CONTAINER_OPEN
+
+    def _emit(self, line: str, ended: bool) -> str:
+        html = self.formatter.format_line(line)
+        if html:
+            html = self._separator() + html
+        if ended:
+            self._newlines += 1
+        return html
+
+    def _separator(self) -> str:
+        # Same as format(): blank-line pairs become paragraph breaks, other newlines spaces
+        newlines, self._newlines = self._newlines, 0
+        return PARAGRAPH_BREAK * (newlines // 2) + ' ' * (newlines % 2)
+
+
+response_formatter = ResponseFormatter()
@@ -0,0 +1,15 @@
+# dashboard/utils/stripe_client.py
+
+from django.conf import settings
+
+
+def get_stripe():
+    """The ``stripe`` module, configured with our secret key.
+
+    The SDK takes about a second to import, so it is loaded on the first
+    payment call instead of when a worker starts.
+    """
+    import stripe
+
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
@@ -1,14 +1,79 @@
 # dashboard/utils/subscription.py
 from functools import wraps
-from django.http import JsonResponse
+from django.http import HttpRequest, JsonResponse
 from django.shortcuts import redirect
 from django.contrib import messages
-from ..models import UserSubscription, MealPlan
+from django.utils.functional import cached_property
+from ..models import UserSubscription, MealPlanUsage
+
+
+class SubscriptionState:
+    """
+    Subscription facts for one request. Each is resolved lazily and at most
+    once, so middleware, context processors, decorators and views can all
+    read it without repeating queries.
+    """
+    FREE_PLAN_LIMIT = 3
+    PAY_ONCE_PLAN_LIMIT = 1
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def subscription(self):
+        if not self.user.is_authenticated:
+            return None
+        return UserSubscription.get_active_subscription(self.user.id)
+
+    @cached_property
+    def tier_type(self):
+        return self.subscription.subscription_tier.tier_type if self.subscription else 'free'
+
+    @cached_property
+    def meal_plan_count(self):
+        if not self.user.is_authenticated:
+            return 0
+        return MealPlanUsage.count_for(self.user.id)
+
+    @property
+    def has_subscription(self):
+        return self.subscription is not None
+
+    @property
+    def is_premium(self):
+        return self.tier_type == 'weekly'
+
+    @property
+    def meal_plans_remaining(self):
+        if not self.has_subscription:
+            return self.FREE_PLAN_LIMIT - self.meal_plan_count
+        if self.is_premium:
+            return None
+        return self.PAY_ONCE_PLAN_LIMIT - self.meal_plan_count
+
+    def has_tier(self, allowed_tiers):
+        return self.has_subscription and self.tier_type in allowed_tiers
+
+    def refresh(self):
+        """Forget resolved values after the subscription or usage changes"""
+        for name in ('subscription', 'tier_type', 'meal_plan_count'):
+            self.__dict__.pop(name, None)
+
+
+def get_subscription_state(request):
+    """Return the request's SubscriptionState, attaching one if middleware didn't"""
+    state = getattr(request, 'subscription_state', None)
+    if state is None:
+        state = request.subscription_state = SubscriptionState(request.user)
+    return state
+
 
 def check_subscription_access(feature):
     def decorator(view_func):
         @wraps(view_func)
-        def wrapper(self, request, *args, **kwargs):
+        def wrapper(*args, **kwargs):
+            # Works for function views (request, ...) and methods (self, request, ...)
+            request = args[0] if isinstance(args[0], HttpRequest) else args[1]
             # Remove recipe_details from feature requirements
             feature_requirements = {
                 'gemini_chat': ['weekly'],  # Weekly only
@@ -18,15 +83,9 @@ def check_subscription_access(feature):
 
             # Only check subscription for features other than recipe_details
             if feature in feature_requirements:
-                subscription = UserSubscription.objects.filter(
-                    user=request.user,
-                    is_active=True,
-                    end_date__gt=timezone.now()
-                ).select_related('subscription_tier').first()
-
                 allowed_tiers = feature_requirements[feature]
 
-                if not subscription or subscription.subscription_tier.tier_type not in allowed_tiers:
+                if not get_subscription_state(request).has_tier(allowed_tiers):
                     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                         return JsonResponse({
                             'success': False,
@@ -37,7 +96,7 @@ def check_subscription_access(feature):
                     messages.warning(request, f'This feature requires a {"weekly" if "weekly" in allowed_tiers else "premium"} subscription')
                     return redirect('pricing')
 
-            return view_func(self, request, *args, **kwargs)
+            return view_func(*args, **kwargs)
 
         return wrapper
     return decorator
\ No newline at end of file
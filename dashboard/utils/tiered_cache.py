@@ -0,0 +1,268 @@
+# dashboard/utils/tiered_cache.py
+
+import logging
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCache(BaseCache):
+    """
+    Two-tier cache backend: a small in-process LRU in front of a cache shared
+    by every worker (Redis, or a file-based stand-in on a single host).
+
+    Writes and deletes go straight to the shared tier and are broadcast
+    through a sequence-numbered invalidation log stored in that tier. Each
+    process replays the log at most every ``SYNC_INTERVAL`` seconds and evicts
+    the affected keys from its local tier. If a process falls behind the log,
+    it drops its whole local tier. Local entries also expire after
+    ``LOCAL_TIMEOUT`` seconds, which caps staleness if an invalidation is lost.
+
+    Counters live only in the shared tier: ``add`` and ``incr`` never keep a
+    local copy and increments aren't broadcast, so a busy counter doesn't
+    flood the invalidation log or evict other processes' local entries.
+
+    ``LOCATION`` is the alias of the shared cache in ``settings.CACHES``.
+    """
+
+    SEQUENCE_KEY = 'tiered_cache:invalidation_seq'
+    COUNTER_LOCK_FILE = '.counters.lock'
+    LOG_KEY = 'tiered_cache:invalidation:{}'
+    _missing = object()
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = location or 'shared'
+        self._local_max_entries = int(options.get('LOCAL_MAX_ENTRIES', 500))
+        self._local_timeout = float(options.get('LOCAL_TIMEOUT', 30))
+        self._sync_interval = float(options.get('SYNC_INTERVAL', 1))
+        self._log_size = int(options.get('INVALIDATION_LOG_SIZE', 1000))
+        self._log_timeout = int(options.get('INVALIDATION_LOG_TIMEOUT', 300))
+
+        self._local = OrderedDict()  # local key -> (expires_at, pickled value)
+        self._lock = threading.RLock()
+        self._seen_sequence = None
+        self._own_sequences = set()
+        self._next_sync = 0.0
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # Local tier
+
+    def _local_key(self, key, version=None):
+        return self.shared.make_and_validate_key(key, version=version)
+
+    def _local_get(self, local_key):
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is None:
+                return None
+            expires_at, pickled = entry
+            if expires_at <= time.monotonic():
+                del self._local[local_key]
+                return None
+            self._local.move_to_end(local_key)
+            return entry
+
+    def _local_set(self, local_key, value, timeout=DEFAULT_TIMEOUT):
+        ttl = self._local_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            ttl = min(ttl, timeout)
+        if ttl <= 0:
+            self._local_delete(local_key)
+            return
+
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[local_key] = (time.monotonic() + ttl, pickled)
+            self._local.move_to_end(local_key)
+            while len(self._local) > self._local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, local_key):
+        with self._lock:
+            self._local.pop(local_key, None)
+
+    # Shared tier
+
+    @contextmanager
+    def _counter_lock(self):
+        """Serialize counter updates across processes when the shared tier is the file-based stand-in"""
+        shared = self.shared
+        if not isinstance(shared, FileBasedCache):
+            yield  # Redis and locmem update counters atomically
+            return
+
+        os.makedirs(shared._dir, exist_ok=True)
+        with open(os.path.join(shared._dir, self.COUNTER_LOCK_FILE), 'ab') as lock_file:
+            locks.lock(lock_file, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(lock_file)
+
+    def _shared_incr(self, key, delta=1, version=None):
+        shared = self.shared
+        if not isinstance(shared, FileBasedCache):
+            return shared.incr(key, delta, version=version)
+
+        # FileBasedCache.incr is a get then a set that resets the expiry, so
+        # read the expiry back and rewrite the counter under the lock instead
+        with self._counter_lock():
+            try:
+                with open(shared._key_to_file(key, version), 'rb') as f:
+                    expires_at = pickle.load(f)
+                    value = pickle.loads(zlib.decompress(f.read()))
+            except (FileNotFoundError, EOFError):
+                raise ValueError(f"Key '{key}' not found")
+            now = time.time()
+            if expires_at is not None and expires_at <= now:
+                raise ValueError(f"Key '{key}' not found")
+
+            value += delta
+            shared.set(key, value, None if expires_at is None else expires_at - now, version=version)
+            return value
+
+    # Cross-worker invalidation
+
+    def _broadcast(self, local_key):
+        """Record an invalidation for other processes to replay"""
+        try:
+            try:
+                sequence = self._shared_incr(self.SEQUENCE_KEY)
+            except ValueError:
+                self.add(self.SEQUENCE_KEY, 0, None)
+                sequence = self._shared_incr(self.SEQUENCE_KEY)
+            self.shared.set(self.LOG_KEY.format(sequence), local_key, self._log_timeout)
+            with self._lock:
+                self._own_sequences.add(sequence)
+        except Exception as e:
+            logger.warning(f"Cache invalidation broadcast failed for {local_key}: {str(e)}")
+
+    def _sync(self):
+        """Evict local entries invalidated by other processes"""
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self._sync_interval
+
+        current = self.shared.get(self.SEQUENCE_KEY) or 0
+        with self._lock:
+            seen, self._seen_sequence = self._seen_sequence, current
+            if seen is None or current == seen:
+                return
+
+            if current < seen or current - seen > self._log_size:
+                self._clear_local()
+                return
+
+            sequences = [n for n in range(seen + 1, current + 1) if n not in self._own_sequences]
+            self._own_sequences = {n for n in self._own_sequences if n > current}
+
+        if not sequences:
+            return
+
+        log_keys = [self.LOG_KEY.format(n) for n in sequences]
+        invalidated = self.shared.get_many(log_keys)
+        with self._lock:
+            if len(invalidated) < len(log_keys):
+                self._clear_local()  # Part of the log expired, so we can't tell what changed
+                return
+            for local_key in invalidated.values():
+                self._local.pop(local_key, None)
+
+    def _clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._own_sequences.clear()
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        self._sync()
+        local_key = self._local_key(key, version)
+        entry = self._local_get(local_key)
+        if entry is not None:
+            return pickle.loads(entry[1])
+
+        value = self.shared.get(key, self._missing, version=version)
+        if value is self._missing:
+            return default
+        self._local_set(local_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self._local_key(key, version)
+        self.shared.set(key, value, timeout, version=version)
+        self._local_set(local_key, value, timeout)
+        self._broadcast(local_key)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # Not copied locally: add is mostly used to seed counters
+        with self._counter_lock():
+            return self.shared.add(key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        local_key = self._local_key(key, version)
+        deleted = self.shared.delete(key, version=version)
+        self._local_delete(local_key)
+        self._broadcast(local_key)
+        return deleted
+
+    def has_key(self, key, version=None):
+        return self.get(key, version=version, default=self._missing) is not self._missing
+
+    def incr(self, key, delta=1, version=None):
+        # Counters stay in the shared tier, so there is nothing to broadcast
+        value = self._shared_incr(key, delta, version=version)
+        self._local_delete(self._local_key(key, version))
+        return value
+
+    def get_many(self, keys, version=None):
+        self._sync()
+        found = {}
+        remote_keys = []
+        for key in keys:
+            entry = self._local_get(self._local_key(key, version))
+            if entry is not None:
+                found[key] = pickle.loads(entry[1])
+            else:
+                remote_keys.append(key)
+
+        if remote_keys:
+            remote = self.shared.get_many(remote_keys, version=version)
+            for key, value in remote.items():
+                self._local_set(self._local_key(key, version), value)
+            found.update(remote)
+        return found
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.shared.delete_many(keys, version=version)
+        for key in keys:
+            local_key = self._local_key(key, version)
+            self._local_delete(local_key)
+            self._broadcast(local_key)
+
+    def clear(self):
+        # Clearing the shared tier resets the sequence, so other processes drop their local tier too
+        self.shared.clear()
+        self._clear_local()
+        self._seen_sequence = None
@@ -0,0 +1,25 @@
+# dashboard/views/__init__.py
+"""Views, one module per feature.
+
+Modules import only what their own views need and load the heavy SDKs
+(stripe, reportlab, openai, mailjet) inside the code paths that use them.
+"""
+from .accounts import (
+    ActivityListView, LogoutView, UserProfileView, activity_detail_api, custom_logout, google_login_redirect
+)
+from .assistant import find_stores, gemini_chat
+from .currency import detect_user_currency, get_exchange_rates, update_currency
+from .exports import (
+    ExportMealPlanArchiveView, ExportMealPlanFormatView, ExportMealPlanPDF, ExportMealPlanView, export_activity_pdf
+)
+from .jobs import check_task_status
+from .meal_generator import MealGeneratorStreamView, MealGeneratorView
+from .meal_plans import MealPlanListView, ShoppingListView, get_meal_plan_details, meal_plan_history
+from .pages import DashboardView, FeedbackView, HomeView, TermsAndPolicyView, mark_feedback_status
+from .recipes import (
+    RecipeCreateView, RecipeDeleteView, RecipeDetailsView, RecipeDetailView, RecipeListView, RecipeUpdateView
+)
+from .subscriptions import (
+    CheckoutView, MySubscriptionView, PricingView, SubscriptionManagementView, SubscriptionSuccessView,
+    SubscriptionUpgradeSuccessView, checkout_cancel, checkout_success
+)
@@ -0,0 +1,313 @@
+# dashboard/views/accounts.py
+import json
+import logging
+from datetime import timedelta
+
+from django.contrib import messages
+from django.contrib.auth import logout
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Q
+from django.http import JsonResponse
+from django.shortcuts import redirect, render, get_object_or_404
+from django.utils import timezone
+from django.views import View
+from django.views.decorators.http import require_http_methods
+from django.views.generic import ListView
+
+from ..models import MealPlan, Recipe, UserSubscription, UserActivity
+
+logger = logging.getLogger(__name__)
+
+
+def google_login_redirect(request):
+    """Redirect all login attempts to Google OAuth"""
+    next_url = request.GET.get('next', '')
+    # Clear any existing session data
+    request.session.flush()
+    # Always force account selection
+    return redirect(f'/accounts/google/login/?next={next_url}&prompt=select_account')
+
+
+@require_http_methods(["GET"])
+def custom_logout(request):
+    logout(request)
+    return redirect('/')
+
+
+class LogoutView(LoginRequiredMixin, View):
+    def post(self, request):
+        try:
+            # Track activity before logout
+            UserActivity.objects.create(
+                user=request.user,
+                action='logout',
+                details={'ip': request.META.get('REMOTE_ADDR', '')}
+            )
+
+            # Perform logout
+            logout(request)
+            messages.success(request, "You have been successfully logged out.")
+            return redirect('home')
+
+        except Exception as e:
+            messages.error(
+                request,
+                "An error occurred during logout. Please try again."
+            )
+            return redirect('dashboard')
+
+
+class UserProfileView(LoginRequiredMixin, View):
+    def get(self, request):
+        # Get all user data with efficient queries
+        user_data = {
+            'activities': UserActivity.objects.filter(user=request.user),
+            # 'active_subscription': UserSubscription.get_active_subscription(request.user.id),
+            'purchases': UserSubscription.objects.filter(
+                user=request.user
+            ).select_related('subscription_tier').order_by('-start_date')
+        }
+
+        # Handle activity filters
+        filters = self._handle_filters(request, user_data['activities'])
+
+        # Paginate activities
+        activities_page = self._paginate_activities(
+            request,
+            filters['filtered_activities']
+        )
+
+        context = {
+            'user': request.user,
+            # 'subscription': user_data['active_subscription'],
+            'purchases': user_data['purchases'],
+            'recent_activity': activities_page,
+            'is_paginated': True,
+            'action_types': UserActivity.ACTION_CHOICES,
+            'current_filters': filters['current_filters'],
+            # Add subscription stats
+            'subscription_stats': self._get_subscription_stats(user_data['purchases'])
+        }
+
+        return render(request, 'user_profile.html', context)
+
+    def _handle_filters(self, request, activities):
+        """Handle activity filtering"""
+        current_filters = {
+            'search': request.GET.get('search', ''),
+            'action_type': request.GET.get('action_type', ''),
+            'date_filter': request.GET.get('date_filter', '')
+        }
+
+        filtered_activities = activities
+
+        # Search filter
+        if current_filters['search']:
+            filtered_activities = filtered_activities.filter(
+                Q(action__icontains=current_filters['search']) |
+                Q(details__icontains=current_filters['search'])
+            )
+
+        # Action type filter
+        if current_filters['action_type'] and current_filters['action_type'] != 'all':
+            filtered_activities = filtered_activities.filter(
+                action=current_filters['action_type']
+            )
+
+        # Date filter
+        if current_filters['date_filter']:
+            today = timezone.now()
+            date_filters = {
+                'today': today.date(),
+                'week': today - timedelta(days=7),
+                'month': today - timedelta(days=30)
+            }
+
+            if current_filters['date_filter'] == 'today':
+                filtered_activities = filtered_activities.filter(
+                    timestamp__date=date_filters['today']
+                )
+            else:
+                filtered_activities = filtered_activities.filter(
+                    timestamp__gte=date_filters[current_filters['date_filter']]
+                )
+
+        return {
+            'filtered_activities': filtered_activities.order_by('-timestamp'),
+            'current_filters': current_filters
+        }
+
+    def _paginate_activities(self, request, activities, per_page=10):
+        """Handle activity pagination"""
+        paginator = Paginator(activities, per_page)
+        page = request.GET.get('page', 1)
+
+        try:
+            activities_page = paginator.page(page)
+        except PageNotAnInteger:
+            activities_page = paginator.page(1)
+        except EmptyPage:
+            activities_page = paginator.page(paginator.num_pages)
+
+        return activities_page
+
+    def _get_subscription_stats(self, purchases):
+        """Calculate subscription statistics"""
+        stats = {
+            'total_spent': 0,
+            'active_plans': 0,
+            'total_purchases': len(purchases),
+            'subscription_types': {}
+        }
+
+        for purchase in purchases:
+            # Calculate total spent
+            stats['total_spent'] += float(purchase.subscription_tier.price)
+
+            # Count active plans
+            if purchase.status == 'active':
+                stats['active_plans'] += 1
+
+            # Count subscription types
+            plan_type = purchase.subscription_tier.get_tier_type_display()
+            stats['subscription_types'][plan_type] = stats['subscription_types'].get(plan_type, 0) + 1
+
+        return stats
+
+
+class ActivityListView(LoginRequiredMixin, ListView):
+    model = UserActivity
+    template_name = 'dashboard/activity_list.html'
+    context_object_name = 'activities'
+    paginate_by = 10
+
+    def get_queryset(self):
+        queryset = UserActivity.objects.filter(user=self.request.user)
+
+        # Search functionality
+        search_query = self.request.GET.get('search', '')
+        if search_query:
+            queryset = queryset.filter(
+                Q(action__icontains=search_query) |
+                Q(details__icontains=search_query)
+            )
+
+        # Filter by action type
+        action_type = self.request.GET.get('action_type', '')
+        if action_type and action_type != 'all':
+            queryset = queryset.filter(action=action_type)
+
+        # Filter by date range
+        date_filter = self.request.GET.get('date_filter', '')
+        if date_filter:
+            today = timezone.now()
+            if date_filter == 'today':
+                queryset = queryset.filter(timestamp__date=today.date())
+            elif date_filter == 'week':
+                queryset = queryset.filter(timestamp__gte=today - timedelta(days=7))
+            elif date_filter == 'month':
+                queryset = queryset.filter(timestamp__gte=today - timedelta(days=30))
+
+        # Sorting
+        sort_by = self.request.GET.get('sort', '-timestamp')
+        if sort_by not in ['-timestamp', 'timestamp', '-action', 'action']:
+            sort_by = '-timestamp'
+
+        return queryset.order_by(sort_by)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'action_types': UserActivity.ACTION_CHOICES,
+            'current_filters': {
+                'search': self.request.GET.get('search', ''),
+                'action_type': self.request.GET.get('action_type', 'all'),
+                'date_filter': self.request.GET.get('date_filter', 'all'),
+                'sort': self.request.GET.get('sort', '-timestamp'),
+            }
+        })
+        return context
+
+
+@login_required
+def activity_detail_api(request, activity_id):
+    try:
+        activity = get_object_or_404(UserActivity, id=activity_id, user=request.user)
+
+        # Base response data
+        response_data = {
+            'id': activity.id,
+            'action': activity.get_action_display(),
+            'timestamp': activity.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            'details': activity.details
+        }
+
+        # If this is a meal plan activity
+        if 'meal' in activity.action:
+            meal_plan_id = activity.details.get('meal_plan_id')
+            if meal_plan_id:
+                try:
+                    meal_plan = MealPlan.objects.get(id=meal_plan_id)
+                    meal_data = json.loads(meal_plan.description)
+
+                    # Structure for the meal plan data
+                    structured_days = []
+
+                    # Process each day in the meal plan
+                    for day_index, day_data in enumerate(meal_data):
+                        day_meals = {}
+
+                        # Process each meal type
+                        for meal_type in ['breakfast', 'lunch', 'snack', 'dinner']:
+                            if meal_type in day_data['meals']:
+                                # Get the recipe for this meal
+                                recipe = Recipe.objects.filter(
+                                    meal_plan=meal_plan,
+                                    day_index=day_index,
+                                    meal_type=meal_type
+                                ).first()
+
+                                day_meals[meal_type] = day_data['meals'][meal_type]
+
+                                if recipe:
+                                    day_meals[f'{meal_type}_recipe'] = recipe.id
+                                    day_meals[f'{meal_type}_recipe_details'] = {
+                                        'title': recipe.title,
+                                        'prep_time': recipe.prep_time,
+                                        'cook_time': recipe.cook_time,
+                                        'servings': recipe.servings,
+                                        'difficulty': recipe.difficulty,
+                                        'ingredients': recipe.ingredients_list,
+                                        'instructions': recipe.instructions_list,
+                                        'nutrition_info': recipe.nutrition_info,
+                                        'tips': recipe.tips
+                                    }
+
+                        structured_days.append({
+                            'day': f"Day {day_index + 1}",
+                            'meals': day_meals
+                        })
+
+                    response_data['meal_plan'] = {
+                        'id': meal_plan.id,
+                        'name': meal_plan.name,
+                        'created_at': meal_plan.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                        'days': structured_days
+                    }
+
+                except MealPlan.DoesNotExist:
+                    logger.error(f"Meal plan {meal_plan_id} not found")
+                except json.JSONDecodeError:
+                    logger.error(f"Invalid JSON in meal plan description")
+                except Exception as e:
+                    logger.error(f"Error processing meal plan: {str(e)}")
+
+        return JsonResponse(response_data)
+
+    except Exception as e:
+        logger.error(f"Error in activity_detail_api: {str(e)}")
+        return JsonResponse({
+            'error': 'An error occurred while fetching activity details'
+        }, status=500)
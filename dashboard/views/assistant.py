@@ -0,0 +1,69 @@
+# dashboard/views/assistant.py
+import json
+import logging
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from ..decorators import rate_limit
+from ..services.gemini_assistant import GeminiAssistant
+from ..services.store_finder import StoreFinder
+from ..utils.subscription import check_subscription_access
+
+logger = logging.getLogger(__name__)
+
+
+@rate_limit('find_stores', max_requests=60, timeout=3600, burst=10)
+def find_stores(request):
+    try:
+        lat = float(request.GET.get('lat', 0))
+        lng = float(request.GET.get('lng', 0))
+        ingredient = request.GET.get('ingredient', '')
+
+        if not all([lat, lng, ingredient]):
+            return JsonResponse({
+                'success': False,
+                'error': 'Missing required parameters',
+                'stores': []
+            })
+
+        store_finder = StoreFinder()
+        result = store_finder.find_stores_for_ingredient(lat, lng, ingredient)
+
+        # Ensure we always return a valid response
+        return JsonResponse({
+            'success': True,
+            'stores': result.get('stores', []),
+            'recommendations': result.get('recommendations', [])
+        })
+
+    except Exception as e:
+        logger.error(f"Store finder error: {str(e)}", exc_info=True)
+        return JsonResponse({
+            'success': False,
+            'error': 'An error occurred while searching for stores',
+            'stores': []
+        })    
+
+
+@require_http_methods(["POST"])
+@check_subscription_access('gemini_chat')
+@rate_limit('gemini_chat', max_requests=60, timeout=3600, burst=10)
+def gemini_chat(request):
+    try:
+        data = json.loads(request.body)
+        user_message = data.get('message', '')
+
+        gemini_assistant = GeminiAssistant()
+        response = gemini_assistant.chat(user_message)
+
+        return JsonResponse({
+            'success': True,
+            'message': response
+        })
+    except Exception as e:
+        logger.error(f"Gemini chat error: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
@@ -0,0 +1,59 @@
+# dashboard/views/currency.py
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods, require_GET
+
+from ..services.exchange_rates import exchange_rates
+from ..utils.currency import CurrencyManager
+from ..utils.geoip import ip_currency
+from ..utils.rate_limit import client_ip
+
+
+def detect_user_currency(request):
+    try:
+        currency = ip_currency.currency_for_ip(client_ip(request), default='GBP')
+
+        return JsonResponse({
+            'success': True,
+            'currency': currency
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'currency': 'GBP',
+            'error': str(e)
+        })
+
+
+@require_http_methods(["GET"])
+def get_exchange_rates(request):
+    try:
+        base_currency = request.GET.get('base_currency', 'GBP')
+        currencies = request.GET.get('currencies', 'USD,EUR').split(',')
+
+        # Served from the refreshed rates table, never from the upstream API
+        rates = exchange_rates.rates_for(currencies, base=base_currency)
+        if not rates:
+            return JsonResponse({
+                'error': f'Unsupported base currency: {base_currency}'
+            }, status=400)
+
+        return JsonResponse({'data': rates})
+
+    except Exception as e:
+        return JsonResponse({
+            'error': str(e)
+        }, status=500)
+
+
+@require_GET
+def update_currency(request):
+    """API endpoint for currency updates"""
+    currency = request.GET.get('currency', 'GBP')
+
+    # Update session
+    request.session['user_currency'] = currency
+
+    # Get and return updated price data
+    price_data = CurrencyManager.get_price_data(currency)
+    return JsonResponse(price_data)
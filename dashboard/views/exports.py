@@ -0,0 +1,255 @@
+# dashboard/views/exports.py
+import json
+import logging
+from datetime import date
+from io import BytesIO
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse, Http404, JsonResponse, HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect, get_object_or_404
+from django.urls import reverse
+from django.views import View
+
+from ..decorators import rate_limit
+from ..models import MealPlan, UserActivity
+from ..services.meal_plan_archive import MealPlanArchive
+from ..services.meal_plan_export import meal_plan_exporter
+from ..services.meal_plan_formats import EXPORT_FORMATS
+from ..tasks import generate_pdf_async
+from .jobs import remember_task_owner
+
+logger = logging.getLogger(__name__)
+
+
+class ExportMealPlanView(LoginRequiredMixin, View):
+    """Download a meal plan as PDF.
+
+    The stored render is served when the plan hasn't changed since it was
+    last exported; otherwise rendering is queued and the response carries a
+    ``task_id`` to poll, after which the same URL serves the file. Only
+    queued renders count against the ``export_pdf`` rate limit.
+    """
+
+    def get(self, request, pk):
+        try:
+            meal_plan = get_object_or_404(MealPlan, pk=pk, user=request.user)
+
+            path = meal_plan_exporter.cached(meal_plan)
+            if path:
+                return self._file_response(request, meal_plan, path)
+            return self._queue_render(request, meal_plan)
+
+        except Exception as e:
+            logger.error(f"Error exporting meal plan: {str(e)}", exc_info=True)
+            messages.error(request, "Failed to export meal plan. Please try again.")
+            return redirect('dashboard')
+
+    @rate_limit('export_pdf', max_requests=5, timeout=3600)
+    def _queue_render(self, request, meal_plan):
+        job = generate_pdf_async.delay(meal_plan.id, request.user.id)
+        remember_task_owner(job.id, request.user.id)
+
+        # Eager mode (local development) finishes inline
+        if job.ready():
+            result = job.get()
+            if not result.get('success'):
+                raise ValueError(result.get('error'))
+            return self._file_response(request, meal_plan, meal_plan_exporter.cached(meal_plan))
+
+        return JsonResponse({
+            'success': True,
+            'task_id': job.id,
+            'status': 'processing',
+            'status_url': reverse('check_task_status', args=[job.id])
+        }, status=202)
+
+    def _file_response(self, request, meal_plan, path):
+        UserActivity.log_activity(
+            user=request.user,
+            action='export_meal',
+            details={
+                'meal_plan_id': meal_plan.id,
+                'meal_plan_name': meal_plan.name
+            },
+            request=request
+        )
+        return FileResponse(
+            meal_plan_exporter.open(path),
+            as_attachment=True,
+            filename=meal_plan_exporter.filename(meal_plan),
+            content_type='application/pdf'
+        )
+
+
+
+class ExportMealPlanFormatView(LoginRequiredMixin, View):
+    """Stream one meal plan, or all of the user's plans, as CSV, ICS or JSON.
+
+    The document is generated plan by plan while it is sent, reading the
+    history with ``.iterator()``, so exporting every plan never holds the
+    whole file in memory. ``?start=YYYY-MM-DD`` sets the date of day 1.
+    """
+
+    @rate_limit('export_data', max_requests=30, timeout=3600)
+    def get(self, request, fmt, pk=None):
+        export_format = EXPORT_FORMATS.get(fmt)
+        if export_format is None:
+            raise Http404(f"Unknown export format: {fmt}")
+
+        try:
+            start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else None
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'start must be a date (YYYY-MM-DD)'}, status=400)
+
+        if pk is None:
+            meal_plan = None
+            meal_plans = MealPlan.objects.filter(user=request.user).order_by('-created_at').iterator(chunk_size=100)
+        else:
+            meal_plan = get_object_or_404(MealPlan, pk=pk, user=request.user)
+            meal_plans = [meal_plan]
+
+        UserActivity.log_activity(
+            user=request.user,
+            action='export_meal',
+            details={
+                'format': fmt,
+                'meal_plan_id': meal_plan.id if meal_plan else None,
+                'meal_plan_name': meal_plan.name if meal_plan else None
+            },
+            request=request
+        )
+
+        response = StreamingHttpResponse(
+            export_format.stream(meal_plans, start), content_type=export_format.content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{export_format.filename(meal_plan)}"'
+        return response
+
+
+class ExportMealPlanArchiveView(LoginRequiredMixin, View):
+    """Download every meal plan of the user as one streamed ZIP.
+
+    ``?format=`` picks the file for each plan: ``csv`` (default), ``ics``,
+    ``json`` or ``pdf`` (stored PDFs only; see ``MealPlanArchive``). Plans are
+    read with ``.iterator()`` and zipped while the response is sent, so one
+    request replaces a per-plan export each.
+    """
+
+    @rate_limit('export_archive', max_requests=3, timeout=3600)
+    def get(self, request):
+        fmt = request.GET.get('format', 'csv')
+        if fmt not in MealPlanArchive.FORMATS:
+            return JsonResponse({
+                'success': False,
+                'error': f"format must be one of: {', '.join(MealPlanArchive.FORMATS)}"
+            }, status=400)
+
+        archive = MealPlanArchive(fmt)
+        meal_plans = MealPlan.objects.filter(user=request.user).order_by('-created_at').iterator(chunk_size=100)
+
+        UserActivity.log_activity(
+            user=request.user,
+            action='export_meal',
+            details={'format': fmt, 'archive': True},
+            request=request
+        )
+
+        response = StreamingHttpResponse(archive.stream(meal_plans), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{archive.filename()}"'
+        return response
+
+class ExportMealPlanPDF(LoginRequiredMixin, View):
+    def get(self, request, meal_plan_id):
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
+
+        meal_plan = get_object_or_404(MealPlan, id=meal_plan_id, user=request.user)
+
+        # Create PDF
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        elements = []
+        styles = getSampleStyleSheet()
+
+        # Add content
+        elements.append(Paragraph("Your Meal Plan", styles['Title']))
+
+        # Add meal plan table
+        data = [['Day', 'Breakfast', 'Lunch', 'Snack', 'Dinner']]
+        for day in json.loads(meal_plan.content):
+            data.append([
+                day['day'],
+                day['meals']['breakfast'],
+                day['meals']['lunch'],
+                day['meals'].get('snack', ''),
+                day['meals']['dinner']
+            ])
+
+        t = Table(data)
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        elements.append(t)
+
+        doc.build(elements)
+        buffer.seek(0)
+
+        return FileResponse(
+            buffer,
+            as_attachment=True,
+            filename=f'meal_plan_{meal_plan_id}.pdf'
+        )
+
+
+@login_required
+def export_activity_pdf(request, activity_id):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    activity = get_object_or_404(UserActivity, id=activity_id, user=request.user)
+
+    # Create PDF buffer
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    # Add content to PDF
+    elements.append(Paragraph(f"Activity Details", styles['Title']))
+    elements.append(Spacer(1, 12))
+
+    # Add activity details
+    elements.append(Paragraph(f"Type: {activity.get_action_display()}", styles['Normal']))
+    elements.append(Paragraph(f"Date: {activity.timestamp.strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+
+    if activity.details:
+        elements.append(Paragraph("Details:", styles['Heading2']))
+        for key, value in activity.details.items():
+            elements.append(Paragraph(f"{key}: {value}", styles['Normal']))
+
+    # Build PDF
+    doc.build(elements)
+    pdf = buffer.getvalue()
+    buffer.close()
+
+    # Create response
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="activity_{activity_id}.pdf"'
+    response.write(pdf)
+
+    return response
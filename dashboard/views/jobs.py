@@ -0,0 +1,56 @@
+# dashboard/views/jobs.py
+import logging
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from celery.result import AsyncResult
+
+logger = logging.getLogger(__name__)
+
+
+def remember_task_owner(task_id, user_id):
+    """Record who enqueued a job, so its status can be polled before the worker reports it"""
+    cache.set(f"task_owner_{task_id}", user_id, settings.CELERY_RESULT_EXPIRES)
+
+
+@login_required
+@require_GET
+def check_task_status(request, task_id):
+    """Report progress of a background job enqueued by the current user"""
+    task = AsyncResult(task_id)
+    info = task.info if isinstance(task.info, dict) else {}
+
+    # Only the user who enqueued a job may read it; queued jobs have no meta yet,
+    # and jobs nobody enqueued for a user (e.g. cache refreshes) are never readable
+    owner = info.get('user_id', cache.get(f"task_owner_{task_id}"))
+    if owner != request.user.id:
+        return JsonResponse({'success': False, 'error': 'Task not found'}, status=404)
+
+    if task.state == 'SUCCESS':
+        result = task.result
+        if result.get('success'):
+            return JsonResponse({**result, 'status': 'complete', 'progress': 100})
+        return JsonResponse({
+            'success': False,
+            'status': 'failed',
+            'error': result.get('error')
+        })
+
+    if task.state in ('FAILURE', 'REVOKED'):
+        logger.error(f"Task {task_id} failed: {task.result}")
+        return JsonResponse({
+            'success': False,
+            'status': 'failed',
+            'error': 'Meal plan generation failed. Please try again.'
+        })
+
+    return JsonResponse({
+        'status': 'processing',
+        'state': task.state,
+        'stage': info.get('stage', 'queued'),
+        'progress': info.get('progress', 0)
+    })
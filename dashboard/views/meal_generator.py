@@ -0,0 +1,874 @@
+# dashboard/views/meal_generator.py
+import json
+import logging
+import random
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone
+from django.views.generic import TemplateView
+
+from asgiref.sync import sync_to_async
+
+from ..decorators import rate_limit
+from ..models import MealPlan, GroceryList, UserSubscription, UserActivity
+from ..services.llm_clients import llm_clients
+from ..services.meal_plan_cache import MealPlanCache
+from ..services.meal_plan_stream import MealPlanStreamParser, sse_event
+from ..tasks import generate_meal_plan_async, pregenerate_recipes_async
+from ..utils.geoip import ip_currency
+from ..utils.rate_limit import client_ip
+from ..utils.subscription import get_subscription_state
+from .jobs import remember_task_owner
+
+logger = logging.getLogger(__name__)
+
+
+class MealGeneratorView(LoginRequiredMixin, TemplateView):
+    template_name = 'meal_generator.html'
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.base_context = """
+        You are a Nigerian cuisine expert specializing in creating detailed recipes
+        that blend traditional Nigerian cooking with modern techniques and UK ingredients.
+        Focus on:
+        1. Clear, step-by-step instructions
+        2. UK-available ingredients with substitutions
+        3. Precise measurements in UK units
+        4. Cultural context and significance
+        5. Health and nutrition information
+        """
+
+    @property
+    def openai_client(self):
+        return llm_clients.openai()
+
+    @property
+    def gemini_client(self):
+        return llm_clients.gemini()
+
+    def _check_and_expire_subscription(self, user):
+        """Check and expire one-time subscription after use"""
+        try:
+            subscription = UserSubscription.objects.select_related('subscription_tier').filter(
+                user=user,
+                is_active=True,
+                subscription_tier__tier_type='one_time'
+            ).first()
+
+            self.logger.info(f"Checking subscription for user {user.id}")
+            self.logger.info(f"Current subscription: {subscription}")
+
+            if subscription:
+                self.logger.info(f"Found active one-time subscription: {subscription.id}")
+                expired = subscription.expire_one_time_subscription()
+
+                if expired:
+                    self.logger.info(f"Successfully expired subscription {subscription.id}")
+                    # Create activity log
+                    UserActivity.objects.create(
+                        user=user,
+                        action='subscription',
+                        details={
+                            'event': 'subscription_expired',
+                            'subscription_id': subscription.id,
+                            'subscription_type': 'one_time',
+                            'expiration_date': timezone.now().isoformat()
+                        }
+                    )
+                    return True
+
+            self.logger.info(f"No active one-time subscription found for user {user.id}")
+            return False
+
+        except Exception as e:
+            self.logger.error(f"Error in subscription expiration: {str(e)}", exc_info=True)
+            return False
+
+    def _complete_generation(self, user, form_data, response_data):
+        """Record a generated meal plan and use up a one-time subscription"""
+        UserActivity.objects.create(
+            user=user,
+            action='create_meal',
+            details={
+                'meal_plan_id': response_data.get('meal_plan_id'),
+                'meal_plan_type': form_data['dietary_preferences'],
+                'generated_by': response_data.get('generated_by')
+            }
+        )
+
+        if self._check_and_expire_subscription(user):
+            self.logger.info("One-time subscription expired successfully")
+            response_data['subscription_deactivated'] = True
+
+        return response_data
+
+    def _premium_upgrade_response(self, user, form_data):
+        """Return an upgrade response if premium features need a subscription"""
+        if not form_data['premium_features_requested']:
+            return None
+
+        self.logger.info("Premium features requested")
+        subscription = UserSubscription.objects.select_related('subscription_tier').filter(
+            user=user,
+            is_active=True
+        ).first()
+
+        if subscription:
+            return None
+
+        self.logger.info("No active subscription found for premium features")
+        return JsonResponse({
+            'success': False,
+            'requires_upgrade': True,
+            'message': 'This feature requires a subscription. Please upgrade to access it.'
+        })
+        
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            # Get user's subscription
+            state = get_subscription_state(self.request)
+            subscription = state.subscription
+
+            # Determine subscription type
+            if subscription:
+                if state.tier_type == 'weekly':
+                    subscription_type = 'weekly'
+                else:
+                    subscription_type = 'pay_once'
+            else:
+                subscription_type = 'free'
+
+            # Check trial usage
+            has_maxed_trials = self._check_trial_usage(state)
+
+            # Convert currencies to JSON string
+            supported_currencies_json = json.dumps(settings.SUPPORTED_CURRENCIES)
+
+            context.update({
+                'has_subscription': subscription is not None,
+                'subscription': subscription,
+                'subscription_type': subscription_type,
+                'has_maxed_trials': has_maxed_trials,
+                'dietary_preferences': settings.DIETARY_PREFERENCES,
+                'supported_currencies': settings.SUPPORTED_CURRENCIES,
+                'supported_currencies_json': supported_currencies_json,
+                'user_currency': self.get_user_currency(self.request)
+            })
+
+        except Exception as e:
+            logger.error(f"Error in meal generator view: {str(e)}")
+            messages.error(self.request, "An error occurred. Please try again.")
+            return redirect('dashboard')
+
+        return context
+
+
+    def get_user_currency(self, request):
+        """Detect user's currency based on IP location"""
+        try:
+            country = ip_currency.country_for_ip(client_ip(request))
+
+            currency_map = {
+                'US': 'USD', 'GB': 'GBP'
+            }
+
+            return currency_map.get(country, 'USD')
+        except Exception as e:
+            logger.warning(f"Currency detection failed: {str(e)}")
+            return 'USD'
+
+    @rate_limit('meal_generation', max_requests=30, timeout=3600, burst=10)
+    def post(self, request):
+        """Handle POST request - generate meal plan"""
+        try:
+            self.logger.info(f"Starting meal plan generation for user {request.user.id}")
+
+            form_data = self._extract_form_data(request.POST)
+
+            # Check if premium features are requested
+            upgrade_response = self._premium_upgrade_response(request.user, form_data)
+            if upgrade_response:
+                return upgrade_response
+
+            # Enqueue generation so the request worker is released immediately
+            job = generate_meal_plan_async.delay(request.user.id, request.POST.dict())
+            remember_task_owner(job.id, request.user.id)
+            self.logger.info(f"Enqueued meal plan generation job {job.id}")
+
+            # Eager mode (local development) finishes inline
+            if job.ready():
+                response_data = job.get()
+                if response_data.get('subscription_deactivated'):
+                    messages.info(request, "Your one-time subscription has been used and is now expired.")
+                return JsonResponse(response_data)
+
+            return JsonResponse({
+                'success': True,
+                'task_id': job.id,
+                'status': 'processing',
+                'status_url': reverse('check_task_status', args=[job.id])
+            }, status=202)
+
+        except Exception as e:
+            self.logger.error(f"Error in meal plan generation: {str(e)}", exc_info=True)
+            return JsonResponse({
+                'success': False,
+                'error': str(e) if settings.DEBUG else "An error occurred"
+            }, status=500)
+        
+
+    def _generate_with_gemini(self, prompt):
+        """Generate response using Gemini API with enhanced randomization"""
+        try:
+            # Random context elements
+            random_contexts = [
+                "Create innovative Nigerian-British fusion recipes.",
+                "Focus on traditional Nigerian flavors with modern British twists.",
+                "Emphasize healthy adaptations of classic Nigerian dishes.",
+                "Design weekday-friendly quick Nigerian meals.",
+                "Create budget-conscious Nigerian recipes with UK ingredients."
+            ]
+
+            # Combine random elements with base context
+            enhanced_prompt = (
+                self.base_context + "\n" +
+                random.choice(random_contexts) + "\n\n" +
+                "Generate a Nigerian meal plan with grocery list. Format the response exactly as follows:\n\n" +
+                "MEAL PLAN:\n" +
+                "Day 1:\n" +
+                "Breakfast: [meal]\n" +
+                "Lunch: [meal]\n" +
+                "Dinner: [meal]\n" +
+                "[Continue for all days]\n\n" +
+                "GROCERY LIST:\n" +
+                "- [ingredient 1]\n" +
+                "- [ingredient 2]\n" +
+                "[Continue for all ingredients]\n\n" +
+                prompt
+            )
+
+            # Generate content using gemini-2.0-flash model
+            with llm_clients.limit('gemini'):
+                response = self.gemini_client.models.generate_content(
+                    model='gemini-2.0-flash',
+                    contents=enhanced_prompt
+                )
+
+            if not response or not response.text:
+                raise ValueError("Empty response from Gemini API")
+
+            # Get the response text as string
+            response_text = str(response.text)
+
+            # Split the response into sections
+            sections = response_text.split("GROCERY LIST:")
+            
+            if len(sections) < 2:
+                raise ValueError("Invalid response format from Gemini")
+
+            meal_plan_text = sections[0].replace("MEAL PLAN:", "").strip()
+            grocery_list_text = sections[1].strip()
+
+            # Process grocery list
+            grocery_list = [
+                item.strip("- ").strip()
+                for item in grocery_list_text.split("\n")
+                if item.strip() and not item.strip().startswith("COOKING TIPS:")
+            ]
+
+            # Add random cooking tips
+            cooking_tips = random.sample([
+                "Use fresh ingredients when possible",
+                "Remember to adjust seasoning to taste",
+                "Prep ingredients before starting to cook",
+                "Store leftover ingredients properly",
+                "Consider batch cooking for efficiency"
+            ], 2)
+
+            return {
+                'success': True,
+                'meal_plan': meal_plan_text,
+                'grocery_list': grocery_list,
+                'cooking_tips': cooking_tips,
+                'generated_by': 'gemini'
+            }
+
+        except Exception as e:
+            logger.error(f"Gemini API error: {str(e)}")
+            raise
+
+
+    
+    def _build_openai_messages(self, prompt):
+        """Create message array with clear formatting instructions"""
+        return [
+            {
+                "role": "system",
+                "content": """You are a Nigerian cuisine expert. Generate meal plans in this exact format:
+                    MEAL PLAN:
+                    Day 1:
+                    Breakfast: [meal name]
+                    Lunch: [meal name]
+                    Snack: [meal name]
+                    Dinner: [meal name]
+
+                    Continue for all days...
+
+                    GROCERY LIST:
+                    - [ingredient 1]
+                    - [ingredient 2]
+                    etc."""
+            },
+            {"role": "user", "content": prompt}
+        ]
+
+    def _generate_with_openai(self, prompt):
+        """Generate response using OpenAI API with enhanced reliability"""
+        try:
+            with llm_clients.limit('openai'):
+                response = self.openai_client.chat.completions.create(
+                    model="gpt-4",
+                    messages=self._build_openai_messages(prompt),
+                    temperature=0.7,
+                    max_tokens=2000
+                )
+
+            return response.choices[0].message.content
+
+        except Exception as e:
+            logger.error(f"OpenAI API error: {str(e)}")
+            raise
+
+    async def _stream_with_openai(self, prompt):
+        """Yield the OpenAI completion text as it is generated"""
+        async with llm_clients.async_limit('openai'), llm_clients.async_client('openai') as client:
+            stream = await client.chat.completions.create(
+                model="gpt-4",
+                messages=self._build_openai_messages(prompt),
+                temperature=0.7,
+                max_tokens=2000,
+                stream=True
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+
+
+    def _generate_random_tips(self):
+        """Generate random cooking tips"""
+        tips = random.sample([
+            "For best results, marinate overnight",
+            "Toast spices before grinding",
+            "Use fresh herbs when possible",
+            "Adjust heat levels to taste",
+            "Let stews simmer for deeper flavor",
+            "Store leftovers properly sealed",
+            "Prep ingredients before starting",
+            "Monitor cooking temperatures carefully"
+        ], 3)
+        return "Additional Tips:\n- " + "\n- ".join(tips)
+
+    def _generate_random_variations(self):
+        """Generate random recipe variations"""
+        variations = random.sample([
+            "Make it vegetarian by substituting mushrooms",
+            "Add extra spice with scotch bonnets",
+            "Create a fusion version with British ingredients",
+            "Make it kid-friendly by reducing spices",
+            "Prepare a batch-cooking version",
+            "Create a quick weeknight version"
+        ], 2)
+        return "Recipe Variations:\n- " + "\n- ".join(variations)
+
+    def _generate_random_cultural_notes(self):
+        """Generate random cultural context"""
+        notes = random.sample([
+            "Traditionally served during festivals",
+            "Common street food in Lagos",
+            "Popular for Sunday family gatherings",
+            "Modern adaptation of a classic dish",
+            "Fusion of Nigerian and British tastes",
+            "Regional variation from Northern Nigeria"
+        ], 2)
+        return "Cultural Notes:\n- " + "\n- ".join(notes)
+
+
+    def _ensure_sequential_days(self, meal_plan):
+        """Ensure days are sequential while keeping meals random"""
+        # Create a pool of meals for each meal type
+        meal_pools = {
+            'breakfast': [],
+            'lunch': [],
+            'snack': [],
+            'dinner': []
+        }
+
+        # Collect all meals into their respective pools
+        for day in meal_plan:
+            for meal_type, meal in day['meals'].items():
+                if meal and meal_type in meal_pools:
+                    meal_pools[meal_type].append(meal)
+
+        # Shuffle each meal pool
+        for meal_type in meal_pools:
+            random.shuffle(meal_pools[meal_type])
+
+        # Create new sequential days with randomized meals
+        sequential_meal_plan = []
+        for i in range(len(meal_plan)):
+            day_plan = {
+                'day': f'Day {i + 1}',
+                'meals': {
+                    'breakfast': meal_pools['breakfast'][i] if meal_pools['breakfast'] else None,
+                    'lunch': meal_pools['lunch'][i] if meal_pools['lunch'] else None,
+                    'snack': meal_pools['snack'][i] if meal_pools['snack'] else None,
+                    'dinner': meal_pools['dinner'][i] if meal_pools['dinner'] else None
+                }
+            }
+            sequential_meal_plan.append(day_plan)
+
+        return sequential_meal_plan
+
+    def _generate_meal_plan(self, user, form_data):
+        """Generate meal plan using OpenAI with enhanced reliability"""
+        try:
+            # Serve from the shared pool when it is warm
+            cached_data = self._cached_meal_plan(user, form_data)
+            if cached_data:
+                return cached_data
+
+            # Construct base prompt
+            prompt = self._construct_prompt(form_data)
+
+            # Generate with OpenAI
+            response_text = self._generate_with_openai(prompt)
+
+            if not response_text:
+                raise ValueError("Empty response from OpenAI API")
+
+            # Process and structure the response
+            processed_data = self._process_response(response_text, form_data, user, source='openai')
+            MealPlanCache.add(form_data, processed_data['meal_plan'], processed_data['grocery_list'])
+
+            # Ensure days are sequential but meals are random
+            processed_data['meal_plan'] = self._ensure_sequential_days(processed_data['meal_plan'])
+
+            return processed_data
+
+        except Exception as e:
+            logger.error(f"Meal plan generation failed: {str(e)}")
+            # Generate a fallback meal plan
+            return self._generate_fallback_meal_plan(form_data)
+
+
+    def _generate_fallback_meal_plan(self, form_data):
+        """Generate a reliable fallback meal plan"""
+        # Default meal options
+        default_meals = {
+            'breakfast': [
+                "Nigerian Breakfast Pap with Akara",
+                "Yam and Egg Sauce",
+                "Nigerian Pancakes (Masa)",
+                "Custard with Moi Moi",
+                "Jollof Rice with Fried Eggs",
+                "Yam Porridge",
+                "Plantain and Egg Sauce"
+            ],
+            'lunch': [
+                "Jollof Rice with Chicken",
+                "Rice and Vegetable Stew",
+                "Egusi Soup with Pounded Yam",
+                "Ofada Rice with Ayamase Sauce",
+                "Nigerian Fried Rice",
+                "Beans and Plantain",
+                "Pepper Soup with Rice"
+            ],
+            'snack': [
+                "Plantain Chips",
+                "Chin Chin",
+                "Puff Puff",
+                "Roasted Plantain",
+                "Nigerian Meat Pie",
+                "Boli (Roasted Plantain)",
+                "Coconut Chips"
+            ],
+            'dinner': [
+                "Amala with Ewedu Soup",
+                "Semolina with Okra Soup",
+                "Eba with Egusi Soup",
+                "Pounded Yam with Vegetable Soup",
+                "Rice and Bean Porridge",
+                "Wheat with Ogbono Soup",
+                "Fufu with Bitterleaf Soup"
+            ]
+        }
+
+        days = int(form_data['plan_days'])
+        meals_per_day = int(form_data['meals_per_day'])
+        include_snacks = form_data['include_snacks']
+
+        # Generate meal plan
+        meal_plan = []
+        for day in range(1, days + 1):
+            day_meals = {'breakfast': None, 'lunch': None, 'snack': None, 'dinner': None}
+
+            if meals_per_day >= 2:
+                day_meals['breakfast'] = random.choice(default_meals['breakfast'])
+
+            day_meals['lunch'] = random.choice(default_meals['lunch'])
+
+            if include_snacks:
+                day_meals['snack'] = random.choice(default_meals['snack'])
+
+            if meals_per_day >= 3:
+                day_meals['dinner'] = random.choice(default_meals['dinner'])
+
+            meal_plan.append({
+                'day': f'Day {day}',
+                'meals': day_meals
+            })
+
+        # Generate grocery list
+        grocery_list = [
+            "Rice", "Yam", "Plantain", "Tomatoes", "Onions", "Peppers",
+            "Chicken", "Fish", "Beef", "Eggs", "Beans", "Palm Oil",
+            "Vegetable Oil", "Garri", "Semolina", "Stock Cubes",
+            "Salt", "Curry Powder", "Thyme", "Ginger", "Garlic"
+        ]
+        random.shuffle(grocery_list)
+
+        return {
+            'success': True,
+            'meal_plan_id': None,  # Will be set when saved to database
+            'meal_plan': meal_plan,
+            'grocery_list': grocery_list,
+            'generated_by': 'fallback'
+        }
+
+
+    def _process_response(self, response_text, form_data, user, source='openai'):
+        """Process AI response into structured data"""
+        parts = response_text.strip().split('GROCERY LIST:')
+
+        if len(parts) < 2:
+            raise ValueError(f'Invalid response format from {source}')
+
+        meal_plan_text = parts[0].replace('MEAL PLAN:', '').strip()
+        grocery_list_text = parts[1].strip()
+
+        structured_meal_plan = self._structure_meal_plan(meal_plan_text, form_data)
+        structured_grocery_list = [
+            item.strip('- ').strip()
+            for item in grocery_list_text.split('\n')
+            if item.strip()
+        ]
+
+        meal_plan = self._save_meal_plan(user, form_data, structured_meal_plan, structured_grocery_list)
+
+        return {
+            'success': True,
+            'meal_plan_id': meal_plan.id,
+            'meal_plan': structured_meal_plan,
+            'grocery_list': structured_grocery_list,
+            'generated_by': source
+        }
+
+    def _save_meal_plan(self, user, form_data, meal_plan, grocery_list):
+        """Save a structured meal plan and its grocery list"""
+        saved_plan = MealPlan.objects.create(
+            user=user,
+            name=f"Meal Plan for {form_data['dietary_preferences']}",
+            description=json.dumps(meal_plan)
+        )
+
+        GroceryList.objects.create(
+            user=user,
+            items="\n".join(grocery_list)
+        )
+
+        transaction.on_commit(lambda: self._queue_recipe_pregeneration(saved_plan.id))
+        return saved_plan
+
+    def _queue_recipe_pregeneration(self, meal_plan_id):
+        """Queue batched generation of the plan's recipes; clicks fall back to on-demand"""
+        try:
+            pregenerate_recipes_async.delay(meal_plan_id)
+        except Exception as e:
+            logger.warning(f"Could not queue recipe pre-generation for meal plan {meal_plan_id}: {str(e)}")
+
+    def _cached_meal_plan(self, user, form_data):
+        """Save and return a reshuffled plan from the warm cache pool, or None"""
+        cached = MealPlanCache.get(form_data)
+        if not cached:
+            return None
+
+        meal_plan = self._ensure_sequential_days(cached['meal_plan'])
+        grocery_list = cached['grocery_list']
+        saved_plan = self._save_meal_plan(user, form_data, meal_plan, grocery_list)
+        logger.info(f"Served cached meal plan for user {user.id}")
+
+        return {
+            'success': True,
+            'meal_plan_id': saved_plan.id,
+            'meal_plan': meal_plan,
+            'grocery_list': grocery_list,
+            'generated_by': 'cache'
+        }
+    
+    
+    
+
+
+    def _extract_form_data(self, post_data):
+        """Extract and validate form data"""
+        try:
+            budget_amount = Decimal(post_data.get('budget', '0'))
+        except:
+            budget_amount = Decimal('0')
+
+        dietary_pref = post_data.get('dietary_preferences', '')
+
+        # Get the region directly from DIETARY_PREFERENCES
+        preferred_cuisine = settings.DIETARY_PREFERENCES.get(dietary_pref, {}).get('region', 'Contemporary Nigerian')
+
+        return {
+            'dietary_preferences': dietary_pref,
+            'preferred_cuisine': preferred_cuisine,  # This is now automatically set based on dietary preference
+            'health_goals': post_data.get('health_goals', ''),
+            'allergies': post_data.get('allergies', ''),
+            'meals_per_day': post_data.get('meals_per_day', '3'),
+            'include_snacks': post_data.get('include_snacks') == 'on',
+            'plan_days': post_data.get('plan_days', '7'),
+            'budget': {
+                'amount': budget_amount,
+                'currency': post_data.get('currency', 'USD')
+            },
+            'skill_level': post_data.get('skill_level', 'Intermediate'),
+            'family_size': post_data.get('family_size', '4'),
+            'premium_features_requested': any(
+                post_data.get(feature) for feature in
+                ['detailed_nutrition', 'video_recipes', 'detailed_recipes']
+            )
+        }
+
+    def _construct_prompt(self, form_data):
+        """Construct the prompt for AI models"""
+        # Get currency symbol directly since it's a simple mapping
+        currency_symbol = settings.SUPPORTED_CURRENCIES.get(
+            form_data['budget']['currency'], '$'  # Default to $ if currency not found
+        )
+        budget_string = f"{currency_symbol}{form_data['budget']['amount']}"
+
+        prompt = (
+            f"Generate a meal plan for {form_data['plan_days']} days and grocery list "
+            f"for a {form_data['dietary_preferences']} diet with {form_data['preferred_cuisine']} cuisine.\n"
+            f"Budget: {budget_string} in {form_data['budget']['currency']}.\n"
+        )
+
+        if form_data['health_goals']:
+            prompt += f"Health goals: {form_data['health_goals']}.\n"
+        if form_data['allergies']:
+            prompt += f"Allergies and restrictions: {form_data['allergies']}.\n"
+
+        prompt += self._add_meal_structure(form_data)
+        return prompt
+
+
+    
+    def _add_meal_structure(self, form_data):
+        """Add meal structure to prompt"""
+        structure = (
+            f"Include {form_data['meals_per_day']} meals per day.\n"
+            f"{'Include a snack for each day.' if form_data['include_snacks'] else ''}\n"
+            f"Skill level: {form_data['skill_level']}.\n"
+            f"Family size: {form_data['family_size']}.\n\n"
+            "Format the response as:\n"
+            "MEAL PLAN:\n"
+        )
+
+        for day in range(1, int(form_data['plan_days']) + 1):
+            structure += f"Day {day}:\n"
+            if int(form_data['meals_per_day']) >= 2:
+                structure += "Breakfast: [meal]\n"
+            structure += "Lunch: [meal]\n"
+            if form_data['include_snacks']:
+                structure += "Snack: [snack]\n"
+            if int(form_data['meals_per_day']) >= 3:
+                structure += "Dinner: [meal]\n"
+            structure += "\n"
+
+        structure += "GROCERY LIST:\n- [ingredient 1]\n- [ingredient 2]\n..."
+        return structure
+
+
+
+    def _structure_meal_plan(self, meal_plan_text, form_data):
+        """Convert meal plan text to structured data"""
+        parser = MealPlanStreamParser(form_data['include_snacks'])
+        parser.feed(meal_plan_text)
+        parser.close()
+        return parser.days
+
+    def _get_error_message(self, error):
+        """Get appropriate error message based on error type"""
+        from openai import APIError, RateLimitError
+
+        if isinstance(error, RateLimitError):
+            return "We're experiencing high demand. Please try again in a few minutes."
+        elif isinstance(error, APIError):
+            return "Our meal generation service is temporarily unavailable. Please try again later."
+        elif isinstance(error, ValueError):
+            return "Please check your meal preferences and try again."
+        return "We couldn't generate your meal plan. Please try again with different preferences."
+
+    def _has_active_subscription(self, user):
+        """Check if user has an active subscription"""
+        return UserSubscription.get_active_subscription(user.id) is not None
+
+
+    def _check_trial_usage(self, state):
+        """Check if user has exceeded their plan limits"""
+        user = state.user
+        subscription = state.subscription
+
+        logger.info(f"Checking trial usage for user {user.id}")
+        logger.info(f"Current subscription: {subscription}")
+
+        if subscription:
+            logger.info(f"Subscription type: {subscription.subscription_tier.tier_type}")
+            logger.info(f"Is active: {subscription.is_active}")
+            logger.info(f"End date: {subscription.end_date}")
+
+        if not subscription:
+            # Free user - check trial limit
+            meal_plan_count = state.meal_plan_count
+            logger.info(f"Free user meal plan count: {meal_plan_count}")
+            return meal_plan_count >= 3
+        elif subscription.subscription_tier.tier_type == 'pay_once':
+            # Pay once user - check if they've used their one-time access
+            meal_plan_count = MealPlan.objects.filter(
+                user=user,
+                created_at__gt=subscription.start_date
+            ).count()
+
+            logger.info(f"Pay once user meal plan count: {meal_plan_count}")
+
+            if meal_plan_count >= 1:
+                logger.info("Deactivating pay-once subscription")
+                # Deactivate the pay-once subscription
+                subscription.is_active = False
+                subscription.status = 'expired'
+                subscription.end_date = timezone.now()
+                subscription.save()
+
+                # Create activity record
+                UserActivity.objects.create(
+                    user=user,
+                    action='subscription_expired',
+                    details={
+                        'subscription_type': 'pay_once',
+                        'reason': 'One-time use completed'
+                    }
+                )
+
+                # Clear subscription cache
+                cache.delete(f"active_subscription_{user.id}")
+                state.refresh()
+
+                logger.info("Pay-once subscription deactivated successfully")
+                return True
+
+            logger.info("Pay-once subscription still valid")
+            return False
+
+        # Weekly subscription - no limits
+        logger.info("Weekly subscription - no limits")
+        return False
+
+
+class MealGeneratorStreamView(MealGeneratorView):
+    """Stream a meal plan to the browser day by day over Server-Sent Events.
+
+    Serve this through the ASGI application (``afrimeals_project.asgi``) so an
+    open stream doesn't hold a WSGI worker; under WSGI the events are buffered
+    and sent when generation finishes.
+    """
+    http_method_names = ['post']
+
+    @rate_limit('meal_generation', max_requests=30, timeout=3600, burst=10)
+    def post(self, request):
+        form_data = self._extract_form_data(request.POST)
+
+        upgrade_response = self._premium_upgrade_response(request.user, form_data)
+        if upgrade_response:
+            return upgrade_response
+
+        response = StreamingHttpResponse(
+            self._stream_meal_plan(request.user, form_data),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Stop proxies buffering the stream
+        return response
+
+    async def _stream_meal_plan(self, user, form_data):
+        """Yield a ``day`` event per completed day, then ``complete``"""
+        response_data = await sync_to_async(self._cached_meal_plan)(user, form_data)
+
+        if response_data:
+            for day in response_data['meal_plan']:
+                yield sse_event('day', day)
+        else:
+            parser = MealPlanStreamParser(form_data['include_snacks'])
+            response_text = ''
+
+            try:
+                prompt = self._construct_prompt(form_data)
+                async for chunk in self._stream_with_openai(prompt):
+                    response_text += chunk
+                    for day in parser.feed(chunk):
+                        yield sse_event('day', day)
+
+                for day in parser.close():
+                    yield sse_event('day', day)
+
+                response_data = await sync_to_async(self._process_response)(
+                    response_text, form_data, user, source='openai'
+                )
+                await sync_to_async(MealPlanCache.add)(
+                    form_data, response_data['meal_plan'], response_data['grocery_list']
+                )
+
+            except Exception as e:
+                logger.error(f"Meal plan streaming failed: {str(e)}")
+
+                # Days already on screen can't be swapped for a fallback plan
+                if parser.days:
+                    yield sse_event('error', {
+                        'success': False,
+                        'error': 'Meal plan generation was interrupted. Please try again.'
+                    })
+                    return
+
+                response_data = self._generate_fallback_meal_plan(form_data)
+                for day in response_data['meal_plan']:
+                    yield sse_event('day', day)
+
+        await sync_to_async(self._complete_generation)(user, form_data, response_data)
+
+        yield sse_event('complete', {
+            key: value for key, value in response_data.items() if key != 'meal_plan'
+        })
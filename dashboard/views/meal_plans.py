@@ -0,0 +1,104 @@
+# dashboard/views/meal_plans.py
+import json
+import logging
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.shortcuts import render, get_object_or_404
+from django.views import View
+from django.views.generic import ListView
+
+from ..models import MealPlan, Recipe, GroceryList
+from ..utils.ingredients import nigerian_ingredients
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUTS = settings.CACHE_TIMEOUTS
+
+
+@login_required
+def meal_plan_history(request):
+    meal_plans = MealPlan.objects.filter(user=request.user).order_by('-created_at')
+    return render(request, 'meal_plan_history.html', {'meal_plans': meal_plans})
+
+
+@login_required
+def get_meal_plan_details(request, meal_plan_id):
+    try:
+        # Get the meal plan
+        meal_plan = get_object_or_404(MealPlan, id=meal_plan_id, user=request.user)
+
+        # Parse the JSON data from the description field
+        meal_plan_data = json.loads(meal_plan.description)
+
+        # Get associated recipes if they exist
+        recipes = Recipe.objects.filter(
+            meal_plan=meal_plan
+        ).values('id', 'title', 'meal_type', 'day_index')
+
+        # Create a recipe lookup dictionary
+        recipe_lookup = {
+            f"{recipe['day_index']}-{recipe['meal_type']}": recipe
+            for recipe in recipes
+        }
+
+        # Add recipe information to meal plan data
+        for day_index, day in enumerate(meal_plan_data):
+            for meal_type in day['meals'].keys():
+                recipe_key = f"{day_index}-{meal_type}"
+                if recipe_key in recipe_lookup:
+                    day['meals'][f"{meal_type}_recipe"] = recipe_lookup[recipe_key]
+
+        return JsonResponse({
+            'success': True,
+            'meal_plan': meal_plan_data,
+            'name': meal_plan.name,
+            'created_at': meal_plan.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid meal plan data format'
+        }, status=400)
+    except Exception as e:
+        logger.error(f"Error fetching meal plan details: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Failed to load meal plan details'
+        }, status=500)
+
+
+class MealPlanListView(LoginRequiredMixin, ListView):
+    template_name = 'meal_plans.html'
+    context_object_name = 'meal_plans'
+    paginate_by = 10
+
+    def get_queryset(self):
+        return MealPlan.objects.filter(
+            user=self.request.user
+        ).select_related('user').order_by('-created_at')
+
+
+class ShoppingListView(LoginRequiredMixin, View):
+    def get(self, request):
+        cache_key = f"shopping_list_{request.user.id}"
+        grocery_list = cache.get(cache_key)
+
+        if not grocery_list:
+            grocery_list = GroceryList.objects.filter(
+                user=request.user
+            ).order_by('-created_at').first()
+            if grocery_list:
+                cache.set(cache_key, grocery_list, CACHE_TIMEOUTS['short'])
+
+        # Tag items that usually need a trip to an African store
+        items = nigerian_ingredients.classify_many(grocery_list.items.splitlines()) if grocery_list else []
+
+        return render(request, 'shopping_list.html', {
+            'grocery_list': grocery_list,
+            'items': items
+        })
@@ -0,0 +1,192 @@
+# dashboard/views/pages.py
+import logging
+
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
+from django.views import View
+from django.views.decorators.http import require_POST
+from django.views.generic import TemplateView
+
+from ..decorators import rate_limit
+from ..forms import FeedbackForm
+from ..models import MealPlan, Recipe, UserActivity, UserFeedback
+from ..utils.currency import CurrencyManager
+
+logger = logging.getLogger(__name__)
+
+
+class HomeView(TemplateView):
+    template_name = 'home.html'
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return redirect('dashboard')
+
+        # Get currency and pricing information
+        currency = CurrencyManager.get_user_currency(request)
+        price_data = CurrencyManager.get_price_data(currency)
+
+        # Add pricing context
+# Set context for template
+        self.extra_context = {
+            **price_data,  # Unpack all price data
+            'supported_currencies': CurrencyManager.get_supported_currencies(),
+            'page_title': 'Welcome to NaijaPlate',
+            'meta_description': 'AI-powered Nigerian meal planning for the UK diaspora'
+        }
+
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        # Add any additional context data if needed
+        context['page_title'] = 'Welcome to NaijaPlate'
+        context['meta_description'] = 'AI-powered Nigerian meal planning for the UK diaspora'
+
+        return context
+
+
+class DashboardView(LoginRequiredMixin, TemplateView):
+    template_name = 'dashboard.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        user = self.request.user
+
+        try:
+            # Get recent activities
+            recent_activities = UserActivity.objects.filter(
+                user=user
+            ).select_related('user').order_by('-timestamp')[:5]
+
+            # Get meal plans and recipes
+            recent_meal_plans = MealPlan.objects.filter(
+                user=user
+            ).select_related('user').order_by('-created_at')[:5]
+
+            recent_recipes = Recipe.objects.filter(
+                user=user
+            ).select_related('user').order_by('-created_at')[:5]
+
+            # Get subscription
+            # subscription = UserSubscription.get_active_subscription(user.id)
+
+            # Process activities to include related objects
+            processed_activities = []
+            for activity in recent_activities:
+                activity_data = {
+                    'id': activity.id,
+                    'action': activity.action,
+                    'timestamp': activity.timestamp,
+                    'get_action_display': activity.get_action_display(),
+                    'details': activity.details or {},
+                }
+                processed_activities.append(activity_data)
+
+            context.update({
+                'recent_meal_plans': recent_meal_plans,
+                'recent_recipes': recent_recipes,
+                # 'subscription': subscription,
+                'recent_activities': processed_activities,
+            })
+
+        except Exception as e:
+            # Log the error
+            logger.error(f"Dashboard error for user {user.id}: {str(e)}", exc_info=True)
+            # Provide empty defaults
+            context.update({
+                'recent_meal_plans': [],
+                'recent_recipes': [],
+                'subscription': None,
+                'recent_activities': [],
+            })
+            messages.error(self.request, "There was an error loading your dashboard. Please try again later.")
+
+        return context
+
+
+class TermsAndPolicyView(TemplateView):
+    template_name = 'terms_policy.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'page_title': 'Terms and Policy - NaijaPlate',
+            'meta_description': 'Terms of Service and Privacy Policy for NaijaPlate'
+        })
+        return context
+    
+
+
+class FeedbackView(LoginRequiredMixin, View):
+    def get(self, request):
+        form = FeedbackForm()
+        return render(request, 'feedback.html', {'form': form})
+
+    @rate_limit('feedback', max_requests=3, timeout=3600)
+    def post(self, request):
+        try:
+            form = FeedbackForm(request.POST)
+            if form.is_valid():
+                feedback = form.save(commit=False)
+                feedback.user = request.user
+                feedback.save()
+
+                # Track activity
+                UserActivity.objects.create(
+                    user=request.user,
+                    action='feedback',
+                    details={
+                        'feedback_type': feedback.feedback_type,
+                        'subject': feedback.subject
+                    }
+                )
+
+                messages.success(
+                    request,
+                    "Thank you for your feedback! We'll review it shortly."
+                )
+                return redirect('dashboard')
+
+            return render(request, 'feedback.html', {'form': form})
+
+        except Exception as e:
+            messages.error(
+                request,
+                "An error occurred while submitting your feedback. Please try again."
+            )
+            return render(request, 'feedback.html', {'form': form})
+
+
+@require_POST
+@staff_member_required
+def mark_feedback_status(request, feedback_id):
+    try:
+        feedback = UserFeedback.objects.get(id=feedback_id)
+        feedback.is_resolved = not feedback.is_resolved  # Toggle the resolved status
+        feedback.save()
+
+        # Calculate updated feedback statistics
+        total_feedback = UserFeedback.objects.count()
+        resolved_feedback = UserFeedback.objects.filter(is_resolved=True).count()
+        unresolved_feedback = total_feedback - resolved_feedback
+
+        feedback_stats = {
+            'total': total_feedback,
+            'resolved': resolved_feedback,
+            'unresolved': unresolved_feedback
+        }
+
+        return JsonResponse({
+            'success': True,
+            'is_resolved': feedback.is_resolved,
+            'feedback_stats': feedback_stats
+        })
+    except UserFeedback.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Feedback not found'}, status=404)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -0,0 +1,383 @@
+# dashboard/views/recipes.py
+import json
+import logging
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import JsonResponse
+from django.shortcuts import redirect, render, get_object_or_404
+from django.utils import timezone
+from django.views import View
+from django.views.generic import DetailView, ListView
+
+from ..decorators import rate_limit
+from ..forms import RecipeForm
+from ..models import CanonicalRecipe, MealPlan, Recipe, UserActivity
+from ..services.llm_clients import llm_clients
+from ..services.recipe_batch import recipe_fields
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUTS = settings.CACHE_TIMEOUTS
+
+
+class RecipeListView(LoginRequiredMixin, ListView):
+    template_name = 'recipes.html'
+    context_object_name = 'user_recipes'  # Changed from 'recipes'
+    paginate_by = 12
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['admin_recipes'] = Recipe.objects.filter(is_admin_recipe=True).order_by('-created_at')
+        context['query'] = self.request.GET.get('q', '')
+        context['sort'] = self.request.GET.get('sort', '-created_at')
+        return context
+
+    def get_queryset(self):
+        query = self.request.GET.get('q', '')
+        sort = self.request.GET.get('sort', '-created_at')
+
+        recipes = Recipe.objects.filter(user=self.request.user, is_admin_recipe=False)
+
+        if query:
+            recipes = recipes.filter(
+                Q(title__icontains=query) |
+                Q(ingredients__icontains=query) |
+                Q(instructions__icontains=query)
+            )
+
+        if sort in ['title', '-title', 'created_at', '-created_at']:
+            recipes = recipes.order_by(sort)
+        else:
+            recipes = recipes.order_by('-created_at')
+
+        return recipes.select_related('user')   
+    
+
+
+# Update MealPlanListView (add this if you don't have it)
+
+
+class RecipeDetailView(LoginRequiredMixin, DetailView):
+    model = Recipe
+    template_name = 'recipe_detail.html'
+    context_object_name = 'recipe'
+
+    def get_object(self):
+        cache_key = f"recipe_detail_{self.kwargs['pk']}_{self.request.user.id}"
+        recipe = cache.get(cache_key)
+
+        if not recipe:
+            recipe = get_object_or_404(
+                Recipe.objects.select_related('user'),
+                pk=self.kwargs['pk'],
+                user=self.request.user
+            )
+            cache.set(cache_key, recipe, CACHE_TIMEOUTS['medium'])
+
+        return recipe
+
+    # def get_context_data(self, **kwargs):
+    #     context = super().get_context_data(**kwargs)
+    #     context['has_subscription'] = UserSubscription.get_active_subscription(
+    #         self.request.user.id
+    #     ) is not None
+    #     return context
+
+
+class RecipeDetailsView(LoginRequiredMixin, View):
+    @property
+    def client(self):
+        return llm_clients.gemini()
+
+    def _generate_recipe(self, meal_name):
+        """Generate detailed recipe using Gemini API"""
+        try:
+            # Copy the shared recipe for this dish when there is one
+            canonical = CanonicalRecipe.lookup(meal_name)
+            if canonical:
+                self._save_recipe(title=meal_name, **canonical.recipe_fields())
+                return canonical.to_recipe_data(meal_name)
+
+            # Construct the prompt for recipe generation
+            prompt = f"""Generate a detailed recipe for {meal_name}, a Nigerian dish.
+            Return ONLY a JSON object with NO additional text or formatting.
+            The JSON must follow this EXACT structure:
+            {{
+                "title": "{meal_name}",
+                "description": "A detailed description of the dish and its cultural significance",
+                "prepTime": "Preparation time in minutes",
+                "cookTime": "Cooking time in minutes",
+                "servings": "Number of people it serves",
+                "difficulty": "Easy/Medium/Hard",
+                "ingredients": [
+                    "List each ingredient with exact measurements"
+                ],
+                "instructions": [
+                    "Numbered step-by-step cooking instructions"
+                ],
+                "nutrition": {{
+                    "calories": "Calories per serving",
+                    "protein": "Protein in grams",
+                    "carbs": "Carbohydrates in grams",
+                    "fat": "Fat in grams"
+                }},
+                "tips": [
+                    "Cooking tips and variations"
+                ]
+            }}"""
+
+            try:
+                # Generate recipe using Gemini with only the required parameters
+                with llm_clients.limit('gemini'):
+                    response = self.client.models.generate_content(
+                        model='gemini-pro',
+                        contents=prompt
+                    )
+
+                # Get the response text
+                response_text = response.text.strip()
+                
+                # Remove any markdown formatting if present
+                if response_text.startswith('```json'):
+                    response_text = response_text[7:].strip()
+                    if response_text.endswith('```'):
+                        response_text = response_text[:-3].strip()
+                
+                # Parse the JSON response
+                recipe_data = json.loads(response_text)
+                
+                # Create Recipe object, sharing it with future requests for the dish
+                fields = recipe_fields(recipe_data)
+                self._save_recipe(canonical_recipe=CanonicalRecipe.store(meal_name, fields), **fields)
+
+                return recipe_data
+
+            except json.JSONDecodeError as e:
+                logger.error(f"JSON parsing error: {str(e)}")
+                return self._get_fallback_recipe(meal_name, "JSON parsing error")
+            except Exception as e:
+                logger.error(f"Error processing Gemini response: {str(e)}")
+                return self._get_fallback_recipe(meal_name, str(e))
+
+        except Exception as e:
+            logger.error(f"Error generating recipe: {str(e)}")
+            return self._get_fallback_recipe(meal_name, str(e))
+
+
+    def _save_recipe(self, **fields):
+        """Store the recipe for this meal slot, keeping a row pre-generation inserted meanwhile"""
+        recipe, _ = Recipe.objects.get_or_create(
+            meal_plan_id=self.kwargs['meal_plan_id'],
+            day_index=self.kwargs['day_index'],
+            meal_type=self.kwargs['meal_type'],
+            defaults={'user': self.request.user, **fields}
+        )
+        return recipe
+
+    def _get_fallback_recipe(self, meal_name, error_type):
+        """Return a fallback recipe structure"""
+        return {
+            'success': True,
+            'title': meal_name,
+            'description': f"A flavorful Nigerian dish featuring {meal_name}",
+            'prepTime': "30-45 minutes",
+            'cookTime': "45-60 minutes",
+            'servings': "4-6 servings",
+            'difficulty': "Medium",
+            'ingredients': [
+                "Recipe ingredients temporarily unavailable",
+                "Please try regenerating the recipe",
+                f"Error: {error_type}"
+            ],
+            'instructions': [
+                "Recipe instructions temporarily unavailable",
+                "Please try regenerating the recipe",
+                f"Error: {error_type}"
+            ],
+            'nutrition': {
+                'calories': "Approximately 400-500 kcal per serving",
+                'protein': "25-30g per serving",
+                'carbs': "45-50g per serving",
+                'fat': "20-25g per serving"
+            },
+            'tips': [
+                "Recipe tips temporarily unavailable",
+                "Please try regenerating the recipe",
+                f"Error: {error_type}"
+            ]
+        }
+
+    @rate_limit('recipe_details', max_requests=200, timeout=3600, burst=60)
+    def get(self, request, meal_plan_id, day_index, meal_type):
+            try:
+                # Get meal plan and validate access
+                meal_plan = get_object_or_404(MealPlan, id=meal_plan_id, user=request.user)
+
+                try:
+                    meal_data = json.loads(meal_plan.description)
+                    meal_name = meal_data[int(day_index)]['meals'][meal_type]
+                except (json.JSONDecodeError, IndexError, KeyError):
+                    return JsonResponse({
+                        'success': False,
+                        'error': 'Invalid meal plan data'
+                    }, status=400)
+
+                # Check for existing recipe
+                existing_recipe = Recipe.objects.filter(
+                    meal_plan=meal_plan,
+                    day_index=day_index,
+                    meal_type=meal_type
+                ).first()
+
+                if existing_recipe:
+                    return JsonResponse({
+                        'success': True,
+                        'title': existing_recipe.title,
+                        'description': existing_recipe.description,
+                        'prepTime': existing_recipe.prep_time,
+                        'cookTime': existing_recipe.cook_time,
+                        'servings': existing_recipe.servings,
+                        'difficulty': existing_recipe.difficulty,
+                        'ingredients': existing_recipe.ingredients_list,
+                        'instructions': existing_recipe.instructions_list,
+                        'nutrition': existing_recipe.nutrition_info,
+                        'tips': existing_recipe.tips,
+                        'isNewlyGenerated': False
+                    })
+
+                # Generate new recipe if none exists
+                recipe_data = self._generate_recipe(meal_name)
+                return JsonResponse({
+                    'success': True,
+                    **recipe_data,
+                    'isNewlyGenerated': True
+                })
+
+            except Exception as e:
+                logger.error(f"Error in RecipeDetailsView: {str(e)}", exc_info=True)
+                return JsonResponse({
+                    'success': False,
+                    'error': 'An error occurred while generating the recipe'
+                }, status=500)
+
+
+class RecipeCreateView(LoginRequiredMixin, View):
+    def get(self, request):
+        form = RecipeForm()
+        return render(request, 'recipe_form.html', {
+            'form': form,
+            'title': 'Add Recipe'
+        })
+
+    @rate_limit('recipe_create', max_requests=10, timeout=3600)
+    def post(self, request):
+        form = RecipeForm(request.POST, request.FILES)
+        if form.is_valid():
+            recipe = form.save(commit=False)
+            recipe.user = request.user
+            recipe.is_admin_recipe = request.user.is_staff  # Only staff can create admin recipes
+            recipe.save()
+
+            # Track activity
+            UserActivity.objects.create(
+                user=request.user,
+                action='create_recipe',
+                details={'recipe_id': recipe.id, 'title': recipe.title}
+            )
+
+            # Invalidate relevant caches
+            cache.delete_many([
+                f"user_recipes_{request.user.id}",
+                f"dashboard_data_{request.user.id}"
+            ])
+
+            messages.success(request, "Recipe created successfully!")
+            return redirect('recipe_detail', pk=recipe.pk)
+
+        return render(request, 'recipe_form.html', {
+            'form': form,
+            'title': 'Add Recipe'
+        })
+
+
+class RecipeDeleteView(LoginRequiredMixin, View):
+    def post(self, request, pk):
+        recipe = get_object_or_404(Recipe, pk=pk, user=request.user)
+        recipe.delete()
+        messages.success(request, "Recipe deleted successfully")
+        return JsonResponse({'success': True})
+        
+    
+
+
+class RecipeUpdateView(LoginRequiredMixin, View):
+    def get(self, request, pk):
+        try:
+            recipe = get_object_or_404(Recipe, pk=pk, user=request.user)
+            form = RecipeForm(instance=recipe)
+            return render(request, 'recipe_form.html', {
+                'form': form,
+                'title': 'Edit Recipe',
+                'recipe': recipe,
+                'editing': True
+            })
+        except Exception as e:
+            logger.error(f"Error in recipe edit view: {str(e)}", exc_info=True)
+            messages.error(request, "Unable to load recipe for editing.")
+            return redirect('recipe_list')
+
+    @rate_limit('recipe_update', max_requests=10, timeout=3600)
+    def post(self, request, pk):
+        try:
+            recipe = get_object_or_404(Recipe, pk=pk, user=request.user)
+            form = RecipeForm(request.POST, instance=recipe)
+
+            if form.is_valid():
+                recipe = form.save(commit=False)
+                recipe.user = request.user
+                if form.has_changed():
+                    recipe.canonical_recipe = None  # Edited copies no longer follow the shared recipe
+                recipe.save()
+
+                # Track activity
+                UserActivity.objects.create(
+                    user=request.user,
+                    action='update_recipe',
+                    details={
+                        'recipe_id': recipe.id,
+                        'title': recipe.title,
+                        'updated_at': timezone.now().isoformat()
+                    }
+                )
+
+                # Invalidate relevant caches
+                cache_keys = [
+                    f"recipe_detail_{pk}_{request.user.id}",
+                    f"user_recipes_{request.user.id}",
+                    f"dashboard_data_{request.user.id}"
+                ]
+                cache.delete_many(cache_keys)
+
+                messages.success(request, "Recipe updated successfully!")
+                return redirect('recipe_detail', pk=recipe.pk)
+
+            return render(request, 'recipe_form.html', {
+                'form': form,
+                'title': 'Edit Recipe',
+                'recipe': recipe,
+                'editing': True
+            })
+
+        except Exception as e:
+            logger.error(f"Error updating recipe {pk}: {str(e)}", exc_info=True)
+            messages.error(request, "An error occurred while updating the recipe.")
+            return render(request, 'recipe_form.html', {
+                'form': form,
+                'title': 'Edit Recipe',
+                'recipe': recipe,
+                'editing': True
+            })
@@ -0,0 +1,824 @@
+# dashboard/views/subscriptions.py
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.shortcuts import redirect, render, get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.views import View
+from django.views.generic import TemplateView, DetailView
+
+from ..models import PaymentHistory, SubscriptionTier, UserSubscription, UserActivity
+from ..services.price_matrix import PriceMatrix
+from ..utils.stripe_client import get_stripe
+from ..utils.subscription import get_subscription_state
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUTS = settings.CACHE_TIMEOUTS
+
+
+class PricingView(TemplateView):
+    template_name = 'pricing.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        subscription_tiers = SubscriptionTier.get_active_tiers()
+
+        # Remember which prices were shown so checkout charges the same amounts
+        price_matrix = PriceMatrix.get()
+        if self.request.session.get('price_matrix_version') != price_matrix['version']:
+            self.request.session['price_matrix_version'] = price_matrix['version']
+
+        # Add currency-related context
+        context.update({
+            'subscription_tiers': subscription_tiers,
+            'tier_prices': price_matrix['tiers'],
+            'stripe_public_key': settings.STRIPE_PUBLISHABLE_KEY,
+            'currency_api_key': settings.CURRENCY_API_KEY,
+            'base_currency': 'GBP',
+            'supported_currencies': settings.SUPPORTED_CURRENCIES
+        })
+        return context
+
+# class CheckoutView(View):
+#     def post(self, request, tier_id):
+#         try:
+#             tier = get_object_or_404(SubscriptionTier, id=tier_id)
+#             currency = request.headers.get('X-Currency', 'GBP')
+#             exchange_rate = self.get_exchange_rate(currency)
+#             converted_price = float(tier.price) * exchange_rate
+
+#             # Deactivate existing subscriptions
+#             UserSubscription.objects.filter(
+#                 user=request.user,
+#                 is_active=True
+#             ).update(
+#                 is_active=False,
+#                 status='expired',
+#                 end_date=timezone.now()
+#             )
+
+#             # Calculate end date based on tier type
+#             end_date = timezone.now() + {
+#                 'weekly': timedelta(days=7),
+#                 'monthly': timedelta(days=30),
+#                 'one_time': timedelta(days=365),
+#             }.get(tier.tier_type, timedelta(days=30))
+
+#             # Map our tier types to Stripe's accepted intervals
+#             stripe_intervals = {
+#                 'weekly': 'week',
+#                 'monthly': 'month'
+#             }
+
+#             # Set up common metadata
+#             metadata = {
+#                 'user_id': str(request.user.id),
+#                 'tier_id': str(tier.id),
+#                 'tier_type': tier.tier_type,
+#                 'payment_currency': currency,
+#                 'exchange_rate': str(exchange_rate),
+#                 'end_date': end_date.isoformat()
+#             }
+
+#             if tier.tier_type in ['weekly', 'monthly']:
+#                 # For subscription plans
+#                 checkout_session = stripe.checkout.Session.create(
+#                     payment_method_types=['card'],
+#                     line_items=[{
+#                         'price_data': {
+#                             'currency': currency.lower(),
+#                             'unit_amount': int(converted_price * 100),
+#                             'product_data': {
+#                                 'name': f"{tier.name} - {tier.get_tier_type_display()}",
+#                                 'description': tier.description,
+#                             },
+#                             'recurring': {
+#                                 'interval': stripe_intervals[tier.tier_type],  # Use mapped interval
+#                                 'interval_count': 1
+#                             }
+#                         },
+#                         'quantity': 1,
+#                     }],
+#                     mode='subscription',
+#                     success_url=request.build_absolute_uri(reverse('checkout_success')),
+#                     cancel_url=request.build_absolute_uri(reverse('checkout_cancel')),
+#                     metadata=metadata
+#                 )
+#             else:
+#                 # For one-time payment
+#                 checkout_session = stripe.checkout.Session.create(
+#                     payment_method_types=['card'],
+#                     line_items=[{
+#                         'price_data': {
+#                             'currency': currency.lower(),
+#                             'unit_amount': int(converted_price * 100),
+#                             'product_data': {
+#                                 'name': f"{tier.name} - One-time Payment",
+#                                 'description': tier.description,
+#                             },
+#                         },
+#                         'quantity': 1,
+#                     }],
+#                     mode='payment',
+#                     success_url=request.build_absolute_uri(reverse('checkout_success')),
+#                     cancel_url=request.build_absolute_uri(reverse('checkout_cancel')),
+#                     metadata=metadata
+#                 )
+
+#             # Create subscription record
+#             subscription = UserSubscription.objects.create(
+#                 user=request.user,
+#                 subscription_tier=tier,
+#                 start_date=timezone.now(),
+#                 end_date=end_date,
+#                 is_active=True,
+#                 status='active',
+#                 payment_status='pending',
+#                 stripe_subscription_id=checkout_session.id
+#             )
+
+#             # Create payment history record
+#             PaymentHistory.objects.create(
+#                 user=request.user,
+#                 subscription=subscription,
+#                 amount=converted_price,
+#                 currency=currency.upper(),
+#                 payment_method='card',
+#                 transaction_id=checkout_session.id,
+#                 status='pending'
+#             )
+
+#             self.send_confirmation_email(request.user, tier, end_date)
+
+#             return JsonResponse({
+#                 'sessionId': checkout_session.id
+#             })
+
+#         except Exception as e:
+#             logger.error(f"Checkout error: {str(e)}")
+#             return JsonResponse({'error': str(e)}, status=500)
+#     def get_exchange_rate(self, target_currency):
+#         """Get exchange rate from GBP to target currency"""
+#         try:
+#             cache_key = f'exchange_rate_GBP_{target_currency}'
+#             rate = cache.get(cache_key)
+
+#             if rate is None:
+#                 response = requests.get(
+#                     'https://api.freecurrencyapi.com/v1/latest',
+#                     headers={'apikey': settings.CURRENCY_API_KEY},
+#                     params={'base_currency': 'GBP'}
+#                 )
+
+#                 if response.ok:
+#                     rates = response.json().get('data', {})
+#                     rate = rates.get(target_currency, 1.0)
+#                     cache.set(cache_key, rate, 3600)
+#                 else:
+#                     logger.error(f"Failed to fetch exchange rate: {response.status_code}")
+#                     rate = 1.0
+
+#             return float(rate)
+
+#         except Exception as e:
+#             logger.error(f"Error fetching exchange rate: {str(e)}")
+#             return 1.0
+
+#     def send_confirmation_email(self, user, tier, end_date):
+#         try:
+#             # Initialize Mailjet client
+#             mailjet = Client(
+#                 auth=(settings.MAILJET_API_KEY, settings.MAILJET_API_SECRET),
+#                 version='v3.1'
+#             )
+
+#             # Format end date
+#             end_date_str = end_date.strftime('%Y-%m-%d')
+
+#             # Prepare email content
+#             text_content = (
+#                 f"Dear {user.username},\n\n"
+#                 f"Thank you for subscribing to {tier.name}! "
+#                 f"Your subscription is active until {end_date_str}."
+#             )
+
+#             # HTML email template with modern styling
+#             html_content = f"""
+#             <!DOCTYPE html>
+#             <html lang="en">
+#             <head>
+#                 <meta charset="UTF-8">
+#                 <meta name="viewport" content="width=device-width, initial-scale=1.0">
+#                 <title>Subscription Confirmation</title>
+#                 <style>
+#                     body {{
+#                         font-family: Arial, sans-serif;
+#                         line-height: 1.6;
+#                         color: #333;
+#                         background-color: #f4f4f4;
+#                         margin: 0;
+#                         padding: 0;
+#                     }}
+#                     .container {{
+#                         max-width: 600px;
+#                         margin: 0 auto;
+#                         padding: 20px;
+#                         background-color: #ffffff;
+#                         border-radius: 8px;
+#                         box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
+#                     }}
+#                     .header {{
+#                         background-color: #4CAF50;
+#                         color: white;
+#                         text-align: center;
+#                         padding: 20px;
+#                         border-radius: 8px 8px 0 0;
+#                     }}
+#                     .content {{
+#                         padding: 20px;
+#                     }}
+#                     .footer {{
+#                         background-color: #f4f4f4;
+#                         text-align: center;
+#                         padding: 10px;
+#                         border-radius: 0 0 8px 8px;
+#                         font-size: 0.8em;
+#                     }}
+#                     .icon {{
+#                         font-size: 24px;
+#                         color: #4CAF50;
+#                         margin-right: 10px;
+#                     }}
+#                     h1 {{
+#                         color: #ffffff;
+#                     }}
+#                     h3 {{
+#                         color: #333;
+#                     }}
+#                     p {{
+#                         margin-bottom: 20px;
+#                     }}
+#                 </style>
+#             </head>
+#             <body>
+#                 <div class="container">
+#                     <div class="header">
+#                         <h1>Subscription Confirmation</h1>
+#                     </div>
+#                     <div class="content">
+#                         <h3><span class="icon">✨</span> Dear {user.username},</h3>
+#                         <p>Thank you for subscribing to <strong>{tier.name}</strong>! Your subscription is now active and will remain so until <strong>{end_date_str}</strong>.</p>
+#                         <p>We're excited to have you on board and can't wait for you to enjoy all the benefits of your new plan. If you have any questions or need assistance, feel free to reach out to our support team.</p>
+#                         <p>Happy meal planning!</p>
+#                         <p>The NaijaPlate Team</p>
+#                     </div>
+#                     <div class="footer">
+#                         <p>&copy; 2025 NaijaPlate. All rights reserved.</p>
+#                     </div>
+#                 </div>
+#             </body>
+#             </html>
+#             """
+
+#             # Build Mailjet API payload
+#             data = {
+#                 'Messages': [{
+#                     "From": {
+#                         "Email": settings.DEFAULT_FROM_EMAIL,
+#                         "Name": "NaijaPlate"
+#                     },
+#                     "To": [{
+#                         "Email": user.email,
+#                         "Name": user.get_full_name() or user.username
+#                     }],
+#                     "Subject": "Subscription Confirmation",
+#                     "TextPart": text_content,
+#                     "HTMLPart": html_content
+#                 }]
+#             }
+
+#             # Send email
+#             response = mailjet.send.create(data=data)
+#             if response.status_code != 200:
+#                 logger.error(f"Mailjet API error: {response.status_code} - {response.json()}")
+#             else:
+#                 logger.info(f"Confirmation email sent successfully to {user.email}")
+
+#         except Exception as email_err:
+#             logger.error(f"Failed to send confirmation email: {str(email_err)}")
+
+
+class CheckoutView(LoginRequiredMixin, View):
+    def get(self, request, tier_id):
+        # Redirect GET requests to pricing page
+        return redirect('pricing')
+
+
+    def post(self, request, tier_id):
+            try:
+                # Get subscription tier
+                tier = get_object_or_404(SubscriptionTier, id=tier_id)
+
+                # Get currency from request headers
+                currency = request.headers.get('X-Currency', 'GBP').upper()
+
+                # Charge the price the pricing page showed, even if rates have refreshed since
+                price = PriceMatrix.price(
+                    tier.id, currency, version=request.session.get('price_matrix_version')
+                )
+                if price is None:
+                    return JsonResponse({
+                        'error': f'{tier.name} is not available in {currency}'
+                    }, status=400)
+
+                # Create Stripe checkout session
+                checkout_session = get_stripe().checkout.Session.create(
+                    payment_method_types=['card'],
+                    line_items=[{
+                        'price_data': {
+                            'currency': currency.lower(),
+                            'unit_amount': price['amount'],
+                            'product_data': {
+                                'name': f"{tier.name} - {tier.get_tier_type_display()}",
+                                'description': tier.description
+                            },
+                            'recurring': {
+                                'interval': 'week',
+                                'interval_count': 1
+                            } if tier.tier_type == 'weekly' else None
+                        },
+                        'quantity': 1,
+                    }],
+                    mode='subscription' if tier.tier_type == 'weekly' else 'payment',
+                    success_url=request.build_absolute_uri(reverse('checkout_success')),
+                    cancel_url=request.build_absolute_uri(reverse('checkout_cancel')),
+                    metadata={
+                        'user_id': str(request.user.id),
+                        'tier_id': str(tier.id),
+                        'tier_type': tier.tier_type
+                    }
+                )
+
+                # Create subscription record
+                subscription = UserSubscription.objects.create(
+                    user=request.user,
+                    subscription_tier=tier,
+                    start_date=timezone.now(),
+                    end_date=timezone.now() + timedelta(days=7 if tier.tier_type == 'weekly' else 365),
+                    is_active=True,
+                    status='Active',
+                    stripe_subscription_id=checkout_session.id
+                )
+
+                return JsonResponse({
+                    'sessionId': checkout_session.id,
+                    'tier_type': tier.tier_type
+                })
+
+            except Exception as e:
+                logger.error(f"Checkout error: {str(e)}")
+                return JsonResponse({
+                    'error': str(e)
+                }, status=500)
+
+
+    def _create_stripe_session(self, tier, price, currency, config):
+        """Create Stripe checkout session based on tier type"""
+        common_data = {
+            'payment_method_types': ['card'],
+            'success_url': self.request.build_absolute_uri(reverse('checkout_success')),
+            'cancel_url': self.request.build_absolute_uri(reverse('checkout_cancel')),
+            'metadata': {
+                'user_id': str(self.request.user.id),
+                'tier_id': str(tier.id),
+                'tier_type': tier.tier_type,
+                'features': ','.join(config['features'])
+            }
+        }
+
+        if tier.tier_type == 'weekly':
+            # Subscription payment
+            return get_stripe().checkout.Session.create(
+                **common_data,
+                mode='subscription',
+                line_items=[{
+                    'price_data': {
+                        'currency': currency.lower(),
+                        'unit_amount': int(price * 100),
+                        'product_data': {
+                            'name': f"{tier.name} Subscription",
+                            'description': tier.description
+                        },
+                        'recurring': {
+                            'interval': 'week',
+                            'interval_count': 1
+                        }
+                    },
+                    'quantity': 1
+                }]
+            )
+        else:
+            # One-time payment
+            return get_stripe().checkout.Session.create(
+                **common_data,
+                mode='payment',
+                line_items=[{
+                    'price_data': {
+                        'currency': currency.lower(),
+                        'unit_amount': int(price * 100),
+                        'product_data': {
+                            'name': f"{tier.name} - One-time Purchase",
+                            'description': tier.description
+                        }
+                    },
+                    'quantity': 1
+                }]
+            )
+
+    def _create_subscription(self, user, tier, config, session_id):
+        """Create subscription record"""
+        # Deactivate existing subscriptions
+        UserSubscription.objects.filter(
+            user=user,
+            is_active=True
+        ).update(
+            is_active=False,
+            status='expired',
+            end_date=timezone.now()
+        )
+
+        # Create new subscription
+        return UserSubscription.objects.create(
+            user=user,
+            subscription_tier=tier,
+            start_date=timezone.now(),
+            end_date=timezone.now() + config['duration'] if config['duration'] else None,
+            is_active=True,
+            status='active',
+            features=config['features'],
+            meal_plan_limit=config['limit'],
+            stripe_subscription_id=session_id
+        )
+
+    def _send_subscription_email(self, user, subscription):
+        """Send subscription confirmation email"""
+        try:
+            from mailjet_rest import Client
+
+            mailjet = Client(
+                auth=(settings.MAILJET_API_KEY, settings.MAILJET_API_SECRET),
+                version='v3.1'
+            )
+
+            # Prepare email content
+            subject = f"Welcome to {subscription.subscription_tier.name}!"
+
+            # Create HTML content based on subscription type
+            html_content = self._generate_subscription_email_content(user, subscription)
+
+            data = {
+                'Messages': [{
+                    "From": {
+                        "Email": settings.DEFAULT_FROM_EMAIL,
+                        "Name": "NaijaPlate"
+                    },
+                    "To": [{
+                        "Email": user.email,
+                        "Name": user.get_full_name() or user.username
+                    }],
+                    "Subject": subject,
+                    "HTMLPart": html_content
+                }]
+            }
+
+            response = mailjet.send.create(data=data)
+            if response.status_code != 200:
+                logger.error(f"Failed to send subscription email: {response.json()}")
+
+        except Exception as e:
+            logger.error(f"Email sending error: {str(e)}")
+
+    def _generate_subscription_email_content(self, user, subscription):
+        """Generate HTML content for subscription email"""
+        features_html = {
+            'free': """
+                <li>Generate up to 3 meal plans</li>
+                <li>Basic recipe access</li>
+            """,
+            'pay_once': """
+                <li>Generate 1 detailed meal plan</li>
+                <li>Full recipe access</li>
+                <li>Detailed nutritional information</li>
+            """,
+            'weekly': """
+                <li>Unlimited meal plans</li>
+                <li>Full recipe access</li>
+                <li>Detailed nutritional information</li>
+                <li>Gemini AI chat assistance</li>
+                <li>Premium features and support</li>
+            """
+        }
+
+        return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background-color: #4CAF50; color: white; padding: 20px; text-align: center; }}
+                .content {{ padding: 20px; }}
+                .features {{ background-color: #f9f9f9; padding: 15px; margin: 15px 0; }}
+                .button {{ background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>Welcome to NaijaPlate {subscription.subscription_tier.name}!</h1>
+                </div>
+                <div class="content">
+                    <p>Dear {user.get_full_name() or user.username},</p>
+                    <p>Thank you for choosing NaijaPlate! Your {subscription.subscription_tier.name} subscription is now active.</p>
+
+                    <div class="features">
+                        <h3>Your Features Include:</h3>
+                        <ul>
+                            {features_html[subscription.subscription_tier.tier_type]}
+                        </ul>
+                    </div>
+
+                    <p>Start exploring your new features now:</p>
+                    <p><a href="{settings.SITE_URL}/meal-generator/" class="button">Generate Meal Plan</a></p>
+
+                    <p>If you have any questions, our support team is here to help!</p>
+
+                    <p>Best regards,<br>The NaijaPlate Team</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+
+class SubscriptionSuccessView(LoginRequiredMixin, TemplateView):
+    template_name = 'subscription_success.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        subscription = UserSubscription.get_active_subscription(self.request.user.id)
+        context['subscription'] = subscription
+        return context
+
+
+class MySubscriptionView(LoginRequiredMixin, DetailView):
+    template_name = 'my_subscription.html'
+
+    def get_object(self):
+        cache_key = f"user_subscription_{self.request.user.id}"
+        subscription = cache.get(cache_key)
+
+        if not subscription:
+            subscription = UserSubscription.objects.filter(
+                user=self.request.user,
+                is_active=True,
+                end_date__gt=timezone.now()
+            ).select_related('subscription_tier').first()
+            if subscription:
+                cache.set(cache_key, subscription, CACHE_TIMEOUTS['medium'])
+
+        return subscription
+
+
+@login_required
+def checkout_success(request):
+    """Handle successful checkout"""
+    # Get latest subscription
+    subscription = UserSubscription.objects.filter(
+        user=request.user,
+        is_active=True
+    ).select_related('subscription_tier').first()
+
+    return render(request, 'checkout_success.html', {
+        'title': 'Payment Successful',
+        # 'subscription': subscription
+    })
+
+
+@login_required
+def checkout_cancel(request):
+    """Handle cancelled checkout"""
+    messages.warning(request, 'Your payment was cancelled.')
+    return render(request, 'checkout_cancel.html', {
+        'title': 'Payment Cancelled',
+    })
+
+
+class SubscriptionManagementView(LoginRequiredMixin, View):
+    def get(self, request):
+        state = get_subscription_state(request)
+        payment_history = PaymentHistory.objects.filter(
+            user=request.user
+        ).order_by('-created_at')[:5]
+
+        context = {
+            'subscription': state.subscription,
+            'payment_history': payment_history,
+            'features': settings.SUBSCRIPTION_SETTINGS['FEATURES'],
+            'meal_plans_count': state.meal_plan_count
+        }
+
+        return render(request, 'subscription_management.html', context)
+
+    def post(self, request):
+        action = request.POST.get('action')
+        subscription = UserSubscription.get_active_subscription(request.user.id)
+
+        if not subscription:
+            return JsonResponse({
+                'success': False,
+                'message': 'No active subscription found.'
+            })
+
+        try:
+            if action == 'cancel':
+                return self._handle_cancellation(request, subscription)
+            elif action == 'upgrade':
+                return self._handle_upgrade(request, subscription)
+            else:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Invalid action specified.'
+                })
+
+        except Exception as e:
+            logger.error(f"Subscription management error: {str(e)}")
+            return JsonResponse({
+                'success': False,
+                'message': 'An error occurred. Please try again.'
+            })
+
+    def _handle_cancellation(self, request, subscription):
+        try:
+            if subscription.subscription_tier.tier_type == 'weekly':
+                # Cancel Stripe subscription
+                get_stripe().Subscription.delete(
+                    subscription.stripe_subscription_id
+                )
+
+            # Update subscription status
+            subscription.is_active = False
+            subscription.status = 'cancelled'
+            subscription.end_date = timezone.now()
+            subscription.save()
+
+            # Track activity
+            UserActivity.objects.create(
+                user=request.user,
+                action='cancel_subscription',
+                details={
+                    'subscription_type': subscription.subscription_tier.tier_type,
+                    'cancellation_date': timezone.now().isoformat()
+                }
+            )
+
+            # Send cancellation email
+            self._send_cancellation_email(request.user, subscription)
+
+            return JsonResponse({
+                'success': True,
+                'message': 'Your subscription has been cancelled.'
+            })
+
+        except Exception as e:
+            logger.error(f"Subscription cancellation error: {str(e)}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Failed to cancel subscription. Please try again.'
+            })
+
+    def _handle_upgrade(self, request, subscription):
+        try:
+            # Create checkout session for upgrade
+            checkout_session = get_stripe().checkout.Session.create(
+                customer=subscription.stripe_customer_id,
+                payment_method_types=['card'],
+                mode='subscription',
+                line_items=[{
+                    'price': settings.STRIPE_WEEKLY_PRICE_ID,
+                    'quantity': 1,
+                }],
+                success_url=request.build_absolute_uri(
+                    reverse('subscription_upgrade_success')
+                ),
+                cancel_url=request.build_absolute_uri(
+                    reverse('subscription_management')
+                ),
+                metadata={
+                    'user_id': str(request.user.id),
+                    'upgrade_from': subscription.subscription_tier.tier_type
+                }
+            )
+
+            return JsonResponse({
+                'success': True,
+                'session_id': checkout_session.id
+            })
+
+        except Exception as e:
+            logger.error(f"Subscription upgrade error: {str(e)}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Failed to process upgrade. Please try again.'
+            })
+
+    def _send_cancellation_email(self, user, subscription):
+        try:
+            from mailjet_rest import Client
+
+            mailjet = Client(
+                auth=(settings.MAILJET_API_KEY, settings.MAILJET_API_SECRET),
+                version='v3.1'
+            )
+
+            html_content = f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <style>
+                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                    .header {{ background-color: #4CAF50; color: white; padding: 20px; text-align: center; }}
+                    .content {{ padding: 20px; }}
+                    .button {{ background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; }}
+                </style>
+            </head>
+            <body>
+                <div class="container">
+                    <div class="header">
+                        <h1>Subscription Cancelled</h1>
+                    </div>
+                    <div class="content">
+                        <p>Dear {user.get_full_name() or user.username},</p>
+                        <p>We're sorry to see you go! Your subscription has been cancelled.</p>
+                        <p>You'll continue to have access to your current features until {subscription.end_date.strftime('%B %d, %Y')}.</p>
+                        <p>If you change your mind, you can resubscribe at any time:</p>
+                        <p><a href="{settings.SITE_URL}/pricing/" class="button">View Plans</a></p>
+                        <p>We'd love to hear your feedback on how we can improve our service.</p>
+                        <p>Best regards,<br>The NaijaPlate Team</p>
+                    </div>
+                </div>
+            </body>
+            </html>
+            """
+
+            data = {
+                'Messages': [{
+                    "From": {
+                        "Email": settings.DEFAULT_FROM_EMAIL,
+                        "Name": "NaijaPlate"
+                    },
+                    "To": [{
+                        "Email": user.email,
+                        "Name": user.get_full_name() or user.username
+                    }],
+                    "Subject": "Subscription Cancelled - NaijaPlate",
+                    "HTMLPart": html_content
+                }]
+            }
+
+            response = mailjet.send.create(data=data)
+            if response.status_code != 200:
+                logger.error(f"Failed to send cancellation email: {response.json()}")
+
+        except Exception as e:
+            logger.error(f"Error sending cancellation email: {str(e)}")
+
+
+class SubscriptionUpgradeSuccessView(LoginRequiredMixin, TemplateView):
+    template_name = 'subscription_upgrade_success.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        subscription = UserSubscription.get_active_subscription(self.request.user.id)
+        
+        context.update({
+            'subscription': subscription,
+            'features': settings.SUBSCRIPTION_SETTINGS['FEATURES'].get(
+                subscription.subscription_tier.tier_type if subscription else 'free',
+                []
+            ),
+            'next_billing_date': (
+                subscription.end_date.strftime('%B %d, %Y')
+                if subscription and subscription.end_date
+                else None
+            )
+        })
+        return context
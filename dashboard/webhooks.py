@@ -9,8 +9,8 @@ from .models import (
     PaymentHistory, SubscriptionTier,
     UserSubscription, UserActivity
 )
+from .utils.stripe_client import get_stripe
 
-import stripe
 from django.conf import settings
 import logging
 from django.contrib.auth.models import User
@@ -136,6 +136,7 @@ logger = logging.getLogger(__name__)
 @require_POST
 @csrf_exempt
 def stripe_webhook(request):
+    stripe = get_stripe()
     payload = request.body
     sig_header = request.META['HTTP_STRIPE_SIGNATURE']
 
@@ -273,6 +274,8 @@ def handle_subscription_cancelled(subscription_data):
 def send_cancellation_email(user, subscription):
     """Send subscription cancellation email"""
     try:
+        from mailjet_rest import Client
+
         mailjet = Client(
             auth=(settings.MAILJET_API_KEY, settings.MAILJET_API_SECRET),
             version='v3.1'
@@ -1,7 +1,15 @@
 #!/usr/bin/env bash
 
+# Meal generation, PDF exports and scheduled refreshes run in Celery. Start a
+# worker with an embedded beat scheduler next to Gunicorn, unless tasks run
+# eagerly or a separate worker service is deployed (CELERY_EMBEDDED_WORKER=false).
+if [ "${CELERY_TASK_ALWAYS_EAGER,,}" != "true" ] && [ "${CELERY_EMBEDDED_WORKER:-true}" != "false" ]; then
+    echo Starting Celery worker.
+    celery -A dashboard.celery worker --beat --loglevel=info --concurrency=2 &
+fi
+
 # Start Gunicorn processes
 echo Starting Gunicorn.
 exec gunicorn afrimeals_project.wsgi:application \
     --bind 0.0.0.0:$PORT \
-    --workers 2
\ No newline at end of file
+    --workers 2